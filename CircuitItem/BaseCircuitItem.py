@@ -3,49 +3,45 @@ import sympy as sp
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import numpy as np
+import heapq
+from CircuitSolver import TimeDomainResult, inverse_laplace, adaptive_time_grid
 
-SPECIAL_FUNCTIONS = {
-    'DiracDelta': lambda t: np.zeros_like(t),
-    'Heaviside': np.heaviside,
-    'Piecewise': lambda *args: np.piecewise(args[0], args[1::2], args[2::2]),
-    'Abs': np.abs,
-    'sign': np.sign,
-    'Max': np.maximum,
-    'Min': np.minimum,
-    'sin': np.sin,
-    'cos': np.cos,
-    'tan': np.tan,
-    'exp': np.exp,
-    'log': np.log,
-    'sqrt': np.sqrt
-}
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['SimHei']  # 使用黑体
 plt.rcParams['axes.unicode_minus'] = False  # 解决负号显示问题
 
 
 class ItemCounter:
+    # 分配最小的未使用编号：释放的编号放入最小堆，其余编号都不小于高水位 _next_id
     def __init__(self):
-        self._used_item_id = set()
+        self._next_id = 1
+        self._freed_heap = []
+        self._freed = set()
 
     def genItemID(cls) -> int:
-        item_id = 1
-        while item_id in cls._used_item_id:
-            item_id += 1
-        cls._used_item_id.add(item_id)
-        return item_id
+        if cls._freed_heap:
+            item_id = heapq.heappop(cls._freed_heap)
+            cls._freed.remove(item_id)
+            return item_id
+        cls._next_id += 1
+        return cls._next_id - 1
 
     def delItemID(cls, item_id: int):
-        if item_id in cls._used_item_id:
-            cls._used_item_id.remove(item_id)
+        # 忽略未分配或已释放的编号（如接地节点的编号 0）
+        if not 1 <= item_id < cls._next_id or item_id in cls._freed:
+            return
+        heapq.heappush(cls._freed_heap, item_id)
+        cls._freed.add(item_id)
 
 
 class CircuitNode:
-    potential: sp.Symbol | None = None
+    # 与 Qt 无关的节点记录，电路规模较大时数量很多，使用 __slots__ 减小内存
+    __slots__ = ('item_id', 'connect_items', 'potential', 'isGround')
     _item_counter = ItemCounter()
+    potential: sp.Symbol | None
     item_id: int
     connect_items: list['BaseCircuitItem']
-    isGround: bool = False
+    isGround: bool
 
     def getName(self):
         return 'V{}'.format(self.item_id)
@@ -53,6 +49,8 @@ class CircuitNode:
     def __init__(self):
         self.item_id = self._item_counter.genItemID()
         self.connect_items = []
+        self.potential = None
+        self.isGround = False
 
     def __del__(self):
         self._item_counter.delItemID(self.item_id)
@@ -212,10 +210,71 @@ class ModifyItemDialog(qtw.QDialog):
         if value <= 0:
             qtw.QMessageBox.warning(self, '错误', '元件值应为正数')
             return
+        self.value = value
         super().accept()
         logger.info('修改{}为{}'.format(self.item.getName(), value))
 
 
+class SweepDialog(qtw.QDialog):
+    def __init__(self, item: 'BaseCircuitItem'):
+        super().__init__()
+        self.item = item
+        self.setWindowTitle('{}参数扫描'.format(item.getName()))
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = qtw.QFormLayout()
+        self.setLayout(layout)
+
+        value = self.item.get_value()
+        self.startEdit = qtw.QLineEdit(str(value / 10))
+        self.startEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('起始值', self.startEdit)
+
+        self.stopEdit = qtw.QLineEdit(str(value * 10))
+        self.stopEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('终止值', self.stopEdit)
+
+        self.numEdit = qtw.QLineEdit('500')
+        self.numEdit.setValidator(qtg.QIntValidator(2, 1000000))
+        layout.addRow('点数', self.numEdit)
+
+        self.logCheck = qtw.QCheckBox('对数间隔')
+        self.logCheck.setChecked(True)
+        layout.addRow(self.logCheck)
+
+        self.btnBox = qtw.QHBoxLayout()
+        self.addBtn(self.btnBox, '确定', self.validate)
+        self.addBtn(self.btnBox, '取消', self.reject)
+        layout.addRow(self.btnBox)
+
+    def addBtn(self, layout: qtw.QHBoxLayout, text: str, func):
+        btn = qtw.QPushButton(text)
+        btn.clicked.connect(func)
+        layout.addWidget(btn)
+
+    def validate(self):
+        try:
+            start, stop = float(self.startEdit.text()), float(self.stopEdit.text())
+            num = int(self.numEdit.text())
+        except ValueError:
+            qtw.QMessageBox.warning(self, '错误', '请输入数值')
+            return
+        if start <= 0 or stop <= 0:
+            qtw.QMessageBox.warning(self, '错误', '元件值应为正数')
+            return
+        if num < 2:
+            qtw.QMessageBox.warning(self, '错误', '点数至少为2')
+            return
+        if self.logCheck.isChecked():
+            self.values = np.geomspace(start, stop, num)
+        else:
+            self.values = np.linspace(start, stop, num)
+        super().accept()
+        logger.info('扫描{}：{} ~ {}，{}点'.format(
+            self.item.getName(), start, stop, num))
+
+
 class ShowItemInfoDialog(qtw.QDialog):
     def __init__(self, item: 'BaseCircuitItem'):
         super().__init__()
@@ -261,6 +320,8 @@ class BaseCircuitItem(qtw.QGraphicsItem):
     mainSymbol: ItemSymbol
     _item_counter = ItemCounter()
     _has_value: bool = False
+    # 元件在网表中的类型（见 CircuitSolver/Stamps.py 中注册的印记），None 表示不进入 MNA 方程（如地、电压表）
+    element_kind: str | None = None
     item_id: int
     current: sp.Expr | float | None = None
     voltage: sp.Expr | float | None = None
@@ -292,6 +353,14 @@ class BaseCircuitItem(qtw.QGraphicsItem):
         mainWinodw = self.scene().views()[0].window()
         return mainWinodw.solved if mainWinodw else False
 
+    def get_time_domain(self, expr) -> TimeDomainResult:
+        # 优先使用本次求解的时域结果缓存
+        mainWinodw = self.scene().views()[0].window()
+        solver = mainWinodw.solver if mainWinodw else None
+        if solver is not None:
+            return solver.getTimeDomain(expr)
+        return inverse_laplace(expr, self.s, self.t)
+
     def __init__(self):
         super().__init__()
 
@@ -330,6 +399,7 @@ class BaseCircuitItem(qtw.QGraphicsItem):
         deleteAction = menu.addAction('删除')
         drawCurrentTimeAction = menu.addAction('绘制电流时域波形')
         drawVoltageTimeAction = menu.addAction('绘制电压时域波形')
+        sweepAction = menu.addAction('参数扫描')
 
         action = menu.exec(event.screenPos())
         if action == showInfoAction:
@@ -348,9 +418,30 @@ class BaseCircuitItem(qtw.QGraphicsItem):
         elif action == drawVoltageTimeAction:
             logger.info('绘制{}的电压时域波形'.format(self.getName()))
             self.drawVoltageTime()
+        elif action == sweepAction:
+            self.sweepValue()
         else:
             super().contextMenuEvent(event)
 
+    def get_waveform(self, expr, quantity: str) -> tuple[np.ndarray, np.ndarray | None]:
+        # 按主窗口的时域设置计算波形：对 s 域结果逆拉氏变换后在自适应加密的时间网格上求值，或者进行瞬态仿真
+        # 数值引擎（如直流工作点）没有 s 域表达式，总是进行瞬态仿真
+        mainWinodw = self.scene().views()[0].window()
+        solver = mainWinodw.solver
+        if mainWinodw.time_method == 'laplace' and solver.engine == 'symbolic':
+            time_domain = self.get_time_domain(expr)
+            logger.info('{}-时间波形：{}'.format(
+                '电流' if quantity == 'current' else '电压', time_domain.expr))
+            t_stop, t_fast = mainWinodw.getTimeSpan(time_domain.poles)
+            return adaptive_time_grid(time_domain, t_stop, mainWinodw.point_budget, t_fast)
+
+        t_stop, t_fast = mainWinodw.getTimeSpan()
+        method = 'trap' if mainWinodw.time_method == 'laplace' else mainWinodw.time_method
+        result = solver.simulate_transient(t_stop, mainWinodw.getTimeStep(t_stop, t_fast), method)
+        if quantity == 'current':
+            return result.times, solver.getTransientCurrent(self, result)
+        return result.times, solver.getTransientVoltage(self, result)
+
     def drawCurrentTime(self):
         if not self.get_solve_state():
             qtw.QMessageBox.warning(self.scene().views()[
@@ -368,14 +459,11 @@ class BaseCircuitItem(qtw.QGraphicsItem):
                                     0].window(), '提示', '电流未求解')
             return
 
-        current_expr = sp.inverse_laplace_transform(
-            current_expr, self.s, self.t).simplify()
-        current_func = sp.lambdify(self.t, current_expr, modules=[
-                                   SPECIAL_FUNCTIONS, 'numpy'])
-        logger.info('电流-时间波形：{}'.format(current_expr))
-
-        t_values = np.linspace(0, 100, 1000)
-        current_values = current_func(t_values)
+        t_values, current_values = self.get_waveform(current_expr, 'current')
+        if current_values is None:
+            qtw.QMessageBox.warning(self.scene().views()[
+                                    0].window(), '提示', '电流未求解')
+            return
 
         plt.plot(t_values, current_values,
                  label='{}:电流-时间波形'.format(self.getName()))
@@ -403,19 +491,7 @@ class BaseCircuitItem(qtw.QGraphicsItem):
                                     0].window(), '提示', '电压未求解')
             return
 
-        if voltage_expr != 0:
-            voltage_expr = sp.inverse_laplace_transform(
-                voltage_expr, self.s, self.t).simplify()
-            voltage_func = sp.lambdify(self.t, voltage_expr, modules=[
-                SPECIAL_FUNCTIONS, 'numpy'])
-
-            t_values = np.linspace(0, 100, 1000)
-            voltage_values = voltage_func(t_values)
-        else:
-            t_values = np.linspace(0, 100, 1000)
-            voltage_values = np.zeros_like(t_values)
-
-        logger.info('电压-时间波形：{}'.format(voltage_expr))
+        t_values, voltage_values = self.get_waveform(voltage_expr, 'voltage')
         plt.plot(t_values, voltage_values,
                  label='{}:电压-时间波形'.format(self.getName()))
         plt.xlabel('时间/s')
@@ -425,12 +501,37 @@ class BaseCircuitItem(qtw.QGraphicsItem):
         plt.grid(True)
         plt.show()
 
-    def modifyItem(self):
-        if self.get_solve_state():
+    def sweepValue(self):
+        if not self.get_solve_state():
+            qtw.QMessageBox.warning(self.scene().views()[
+                                    0].window(), '提示', '电路未求解')
+            return
+
+        if not self._has_value:
             qtw.QMessageBox.warning(self.scene().views()[
-                                    0].window(), '提示', '求解结束电路不可修改，请通过清除按钮清空电路')
+                                    0].window(), '提示', '元件无法扫描')
             return
 
+        dialog = SweepDialog(self)
+        if dialog.exec() != qtw.QDialog.DialogCode.Accepted:
+            return
+
+        # 以直流稳态节点电位随元件数值的变化绘制一族曲线
+        solver = self.scene().views()[0].window().solver
+        result = solver.sweep_item_values({self: dialog.values})
+        for node in solver.getNotGNDNodes():
+            plt.plot(dialog.values, result.getNodePotential(
+                solver.getNodesIndex(node)), label=node.getName())
+        if dialog.logCheck.isChecked():
+            plt.xscale('log')
+        plt.xlabel('{}数值'.format(self.What()))
+        plt.ylabel('稳态电位/V')
+        plt.legend()
+        plt.title('{}:参数扫描'.format(self.getName()))
+        plt.grid(True)
+        plt.show()
+
+    def modifyItem(self):
         if not self._has_value:
             qtw.QMessageBox.warning(self.scene().views()[
                                     0].window(), '提示', '元件无法修改')
@@ -439,7 +540,15 @@ class BaseCircuitItem(qtw.QGraphicsItem):
         logger.info('修改{}'.format(self.getName()))
 
         dialog = ModifyItemDialog(self)
-        dialog.exec()
+        if dialog.exec() != qtw.QDialog.DialogCode.Accepted:
+            return
+        old_value = self.get_value()
+        self.set_value(dialog.value)
+
+        # 求解后修改元件值时增量更新求解结果（符号引擎在后台重新求解），无需清空电路重新求解
+        mainWinodw = self.scene().views()[0].window()
+        if self.get_solve_state() and mainWinodw.solver is not None:
+            mainWinodw.updateItemValue(self, old_value)
 
     def deleteItem(self):
         for node in self.nodes:
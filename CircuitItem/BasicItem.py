@@ -43,8 +43,7 @@ class WireItem(qtw.QGraphicsItem):
             return
         mainWindow = scene.views()[0].window()
         if mainWindow:
-            mainWindow._linked_item_node_pairs.remove((self.start, self.end))
-            mainWindow._linked_item_node_pairs.remove((self.end, self.start))
+            mainWindow.unlinkNodes(self.start, self.end)
         scene.removeItem(self)
         scene.update()
 
@@ -128,6 +127,7 @@ class ResistorSymbol(ItemSymbol):
 class ResistorItem(BaseCircuitItem):
     _item_counter = ItemCounter()
     _has_value = True
+    element_kind = 'R'
 
     @staticmethod
     def What() -> str:
@@ -218,6 +218,7 @@ class CapacitorSymbol(ItemSymbol):
 class CapacitorItem(BaseCircuitItem):
     _item_counter = ItemCounter()
     _has_value = True
+    element_kind = 'C'
 
     @staticmethod
     def What() -> str:
@@ -318,6 +319,7 @@ class InductorSymbol(ItemSymbol):
 class InductorItem(BaseCircuitItem):
     _item_counter = ItemCounter()
     _has_value = True
+    element_kind = 'L'
 
     @ staticmethod
     def What() -> str:
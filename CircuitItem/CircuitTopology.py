@@ -1,7 +1,12 @@
 from log_config import logger
 
 import CircuitItem as CI
+import CircuitSolver as CS
 import sympy as sp
+import numpy as np
+
+# symbolic：多项式环上的符号求解（适合中小电路）；numeric：给定复频率或直流下的稀疏数值求解
+ENGINES = ('symbolic', 'numeric')
 
 
 class NoGNDNodeError(Exception):
@@ -10,13 +15,21 @@ class NoGNDNodeError(Exception):
 
 
 class CircuitTopology:
-    def __init__(self, item_nodes: set[CI.ItemNode]):
+    def __init__(self, item_nodes: set[CI.ItemNode], engine: str = 'symbolic', s_value: complex | None = None,
+                 solve: bool = True, groups: list[list[CI.ItemNode]] | None = None,
+                 waveform_store: CS.WaveformStore | None = None):
+        if engine not in ENGINES:
+            raise ValueError('未知的求解引擎：{}'.format(engine))
+        self.engine = engine
+        # 数值引擎的求解频率，None 表示直流
+        self.s_value = s_value
         self.s = sp.symbols('s', complex=True)
-        self.circuit_nodes = self.getCircuitNodes(item_nodes)
+        # groups 为已维护好的等电位节点分组（见 LiveConnectivity），给出时跳过节点合并
+        self.circuit_nodes = self.getCircuitNodes(item_nodes, groups)
 
         self.items = set(node.parentItem() for node in item_nodes)
-        self.notGNDNodes = sorted(
-            node for node in self.circuit_nodes if not node.isGround)
+        # 节点与元件按名称排序，同一电路在不同会话中得到相同的网表（磁盘上保存的波形以网表内容为键）
+        self.notGNDNodes = [node for node in self.circuit_nodes if not node.isGround]
         self.notGNDNodeToIndex = {node: i for i,
                                   node in enumerate(self.notGNDNodes)}
         self.voltageSources = sorted(
@@ -27,14 +40,46 @@ class CircuitTopology:
         self.adjacency_list = self.getAdjacencyList()
 
         self.t = sp.symbols('t', real=True)
-        self.solution = self.solve_MNA_matrix()
-        for node, pot in zip(self.notGNDNodes, self.solution):
+        # 本次求解的时域结果缓存，output() 与绘图共用
+        self.time_domain_cache = CS.TimeDomainCache()
+        self._transient_key = None
+        self._transient = None
+        # 瞬态仿真结果保存在磁盘上（按内存映射读取），重新打开相同的电路时不再仿真
+        self.waveform_store = waveform_store
+        # 电路极点给出的 (最快时间尺度, 显示时长)，首次使用时计算
+        self._time_scales = False
+        self.netlist = self.getNetlist()
+        self.incremental = None
+        # 符号引擎在后台求解时的消元记录，之后只修改电源数值时重新求解不必再消元
+        self.factorization = None
+        # solve 为 False 时只构建拓扑与网表（用于导出网表）
+        if not solve:
+            return
+        if self.engine == 'numeric':
+            self.solution = self.solve_MNA_numeric()
+        else:
+            self.solution = self.solve_MNA_matrix()
+        self.assignSolution()
+
+    def setSolution(self, solution: list, time_domain: list[CS.TimeDomainResult] | None = None,
+                    factorization: CS.PolyFactorization | None = None):
+        # 使用在其他地方（如后台求解进程）得到的解，time_domain 为与之对应的逆拉氏变换结果，factorization 为消元记录
+        self.solution = solution
+        self.factorization = factorization
+        for expr, result in zip(solution, time_domain or ()):
+            self.time_domain_cache.put(expr, self.s, self.t, result)
+        self.assignSolution()
+
+    def assignSolution(self):
+        # 数值引擎的解转为 Python 的 float（直流）或 complex，与符号表达式一样可直接参与运算
+        solution = self.solution.tolist() if isinstance(self.solution, np.ndarray) else self.solution
+        for node, pot in zip(self.notGNDNodes, solution):
             node.potential = pot
             logger.info('{}: {}'.format(node.getName(), pot))
         for gnd_node in (node for node in self.circuit_nodes if node.isGround):
             gnd_node.potential = 0
             logger.info('{}: {}'.format(gnd_node.getName(), 0))
-        for item, cur in zip(self.voltageSources, self.solution[self.getNumOfNotGND():]):
+        for item, cur in zip(self.voltageSources, solution[self.getNumOfNotGND():]):
             item.current = cur
             logger.info('{}: {}'.format(item.getName(), cur))
 
@@ -65,31 +110,44 @@ class CircuitTopology:
 
         return '电路拓扑:\n{}\n{}'.format(node_info, item_info)
 
-    def findItemNodesOfSamePotential(self, item_node: CI.ItemNode, visited: set[CI.ItemNode]) -> list[CI.ItemNode]:
-        if item_node in visited:
-            return []
-        visited.add(item_node)
-        item_nodes = [item_node]
-        for connect_node in item_node.getConnectItemNodes():
-            item_nodes += self.findItemNodesOfSamePotential(
-                connect_node, visited)
-            connect_item = connect_node.parentItem()
-            if isinstance(connect_item, CI.AmmeterItem):
-                item_nodes += self.findItemNodesOfSamePotential(
-                    connect_item.getAnotherNode(connect_node), visited)
-        return item_nodes
-
-    def getCircuitNodes(self, item_nodes: set[CI.ItemNode]) -> list[CI.CircuitNode]:
-        visited = set()
+    @staticmethod
+    def groupItemNodes(item_nodes: set[CI.ItemNode]) -> list[list[CI.ItemNode]]:
+        # 用并查集合并由导线或电流表（视为短路）相连的元件节点，每组对应一个电路节点
+        nodes = list(item_nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        dsu = CS.DisjointSet(len(nodes))
+
+        def getIndex(node: CI.ItemNode) -> int:
+            if node not in index:
+                index[node] = dsu.add()
+                nodes.append(node)
+            return index[node]
+
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            for connect_node in node.getConnectItemNodes():
+                dsu.union(i, getIndex(connect_node))
+            item = node.parentItem()
+            if isinstance(item, CI.AmmeterItem):
+                another = item.getAnotherNode(node)
+                if another is not None:
+                    dsu.union(i, getIndex(another))
+            i += 1
+        return [[nodes[k] for k in group] for group in dsu.groups()]
+
+    def getCircuitNodes(self, item_nodes: set[CI.ItemNode],
+                        groups: list[list[CI.ItemNode]] | None = None) -> list[CI.CircuitNode]:
+        if groups is None:
+            groups = self.groupItemNodes(item_nodes)
+        # 每组以其中（元件名称, 端子序号）最小者排序，与集合的遍历顺序无关
+        groups = sorted(groups, key=lambda group: min(
+            (node.parentItem().getName(), node.parentItem().nodes.index(node)) for node in group))
         circuit_nodes = []
-        for item_node in item_nodes:
-            if item_node in visited:
-                continue
+        for group in groups:
             circuit_node = CI.CircuitNode()
             circuit_nodes.append(circuit_node)
-            item_nodes_of_same_potential = self.findItemNodesOfSamePotential(
-                item_node, visited)
-            for item_node in item_nodes_of_same_potential:
+            for item_node in group:
                 circuit_node.addConnectItem(item_node.parentItem())
                 item_node.circuitNode = circuit_node
         return circuit_nodes
@@ -115,81 +173,187 @@ class CircuitTopology:
     def getVoltageSourceIndex(self, item: CI.VoltageSourceItem) -> int:
         return self.voltageSourceToIndex[item]
 
+    def checkGround(self):
+        if self.getNumOfNotGND() == len(self.circuit_nodes):
+            raise NoGNDNodeError()
+
     def get_MNA_matrix(self):
-        num_nodes = self.getNumOfNotGND()
-        num_voltage_sources = self.getVoltageSourcesNum()
+        # 与数值引擎相同的印记在符号 s 处组装（电感为导纳 1/(sL)，电源为阶跃），三元组一次性汇总为 sympy 矩阵
+        self.checkGround()
+        rows, cols, vals, size = CS.stamp_MNA_triplets(self.netlist, self.s)
+        entries = {}
+        for row, col, value in zip(rows.tolist(), cols.tolist(), vals.tolist()):
+            entries[(row, col)] = entries.get((row, col), 0) + value
+        A = sp.zeros(size, size)
+        for (row, col), value in entries.items():
+            A[row, col] = value
+        b = sp.Matrix(CS.stamp_MNA_sources(self.netlist, self.s, 1 / self.s, object).tolist())
+        return A, b
 
-        if num_nodes == len(self.circuit_nodes):
-            raise NoGNDNodeError()
+    def solve_MNA_matrix(self):
+        # 在 QQ[s] 上无分数消元求解，比直接对 get_MNA_matrix 的结果使用 sp.linsolve 快得多
+        self.checkGround()
+        return CS.solve_MNA_poly(self.netlist, self.s)
 
-        G = sp.zeros(num_nodes, num_nodes)
-        B = sp.zeros(num_nodes, num_voltage_sources)
-        D = sp.zeros(num_voltage_sources, num_voltage_sources)
-        I_s = sp.zeros(num_nodes, 1)
-        E = sp.zeros(num_voltage_sources, 1)
+    def getNetlistIndex(self, node: CI.CircuitNode) -> int:
+        return CS.GND if node.isGround else self.getNodesIndex(node)
 
-        for item in self.items:
-            if isinstance(item, CI.ResistorItem):
-                Y = 1 / item.resistance
-            elif isinstance(item, CI.CapacitorItem):
-                Y = self.s * item.capacitance
-            elif isinstance(item, CI.InductorItem):
-                Y = 1 / (self.s * item.inductance)
-            else:
-                Y = 0
-
-            if isinstance(item, (CI.ResistorItem, CI.CapacitorItem, CI.InductorItem)):
-                node1, node2 = item.getCircuitNodes()
-                n1, n2 = self.getNodesIndex(node1), self.getNodesIndex(node2)
-                if not node1.isGround:
-                    G[n1, n1] += Y
-                if not node2.isGround:
-                    G[n2, n2] += Y
-                if not node1.isGround and not node2.isGround:
-                    G[n1, n2] -= Y
-                    G[n2, n1] -= Y
-            elif isinstance(item, CI.VoltageSourceItem):
-                node1, node2 = item.getCircuitNodes()
-                n1, n2 = self.getNodesIndex(node1), self.getNodesIndex(node2)
-                voltage_index = self.getVoltageSourceIndex(item)
-                if not node1.isGround:
-                    B[n1, voltage_index] = 1
-                if not node2.isGround:
-                    B[n2, voltage_index] = -1
-                E[voltage_index] = item.voltage / self.s
-            elif isinstance(item, CI.CurrentSourceItem):
-                node1, node2 = item.getCircuitNodes()
-                n1, n2 = self.getNodesIndex(node1), self.getNodesIndex(node2)
-                if not node1.isGround:
-                    I_s[n1] += item.current / self.s
-                if not node2.isGround:
-                    I_s[n2] -= item.current / self.s
-
-        A = sp.Matrix.vstack(
-            sp.Matrix.hstack(G, B),
-            sp.Matrix.hstack(B.T, D)
-        )
-        b = sp.Matrix.vstack(I_s, E)
+    def getNetlist(self) -> CS.Netlist:
+        # 将元件转换为与 Qt 无关的网表，电压源顺序与 self.voltageSources 一致
+        # 同时记录元件在网表中的序号，用于从数值结果中取出元件的电流
+        netlist = CS.Netlist(self.getNumOfNotGND())
+        self.itemToElement = {}
 
-        return A, b
+        for item in sorted(self.items, key=lambda item: item.getName()):
+            if item.element_kind is None or isinstance(item, CI.VoltageSourceItem):
+                continue
+            node1, node2 = item.getCircuitNodes()
+            self.itemToElement[item] = netlist.add(
+                item.element_kind, self.getNetlistIndex(node1), self.getNetlistIndex(node2), item.get_value())
+        for item in self.voltageSources:
+            node1, node2 = item.getCircuitNodes()
+            self.itemToElement[item] = netlist.add(
+                item.element_kind, self.getNetlistIndex(node1), self.getNetlistIndex(node2), item.get_value())
+        return netlist
 
-    def solve_MNA_matrix(self):
-        A, b = self.get_MNA_matrix()
-        x = sp.linsolve((A, b))
-        return list(x)[0]
+    def getCircuit(self, name: str = 'circuit') -> CS.Circuit:
+        # 带节点、元件名称的网表，元件名为类型字母加编号（如 R1），可导出为 SPICE 网表
+        element_names = [None] * len(self.netlist)
+        for item, index in self.itemToElement.items():
+            element_names[index] = '{}{}'.format(self.netlist.elements[index][0], item.item_id)
+        return CS.Circuit(name, self.netlist, [node.getName() for node in self.notGNDNodes], element_names)
+
+    def get_MNA_sparse(self, s_value: complex | None = None):
+        self.checkGround()
+        return CS.stamp_MNA_sparse(self.netlist, s_value)
 
-    def output(self) -> str:
+    def solve_MNA_numeric(self):
+        # 保留分解结果，供修改元件值后增量求解
+        self.checkGround()
+        self.incremental = CS.IncrementalSolver(self.netlist, self.s_value)
+        return self.incremental.solve()
+
+    def update_item_value(self, item: CI.BaseCircuitItem):
+        # 求解后修改元件值：不重建拓扑，数值引擎对已有分解做低秩修正（电源只更新右端项）；
+        # 符号引擎只更新网表，由调用方在后台重新求解（见 MainWindow.startSolveJob），
+        # 修改的是电源时保留消元记录，重新求解只需代入新的右端项
+        index = self.itemToElement.get(item)
+        if index is None:
+            return
+        value = item.get_value()
+        if self.engine == 'numeric':
+            self.solution = self.incremental.update_value(index, value)
+            self.assignSolution()
+        else:
+            self.netlist.setValue(index, value)
+            if self.netlist.elements[index][0] not in ('V', 'I'):
+                self.factorization = None
+        self.time_domain_cache.clear()
+        self._transient_key = None
+        self._transient = None
+        self._time_scales = False
+        logger.info('更新{}为{}'.format(item.getName(), value))
+
+    def sweep_item_values(self, item_values: dict[CI.BaseCircuitItem, np.ndarray],
+                          s_value: complex | None = None) -> CS.SweepResult:
+        # 批量求解多个元件取不同数值时的节点电位与电压源电流，s_value 为 None 时为直流稳态
+        self.checkGround()
+        sweeps = {self.itemToElement[item]: values for item, values in item_values.items()}
+        return CS.sweep_values(self.netlist, sweeps, s_value)
+
+    def run_monte_carlo(self, num_samples: int, tolerance: CS.Tolerance, s_value: complex | None = None,
+                        callback=None) -> CS.MonteCarloStats:
+        # 所有电阻、电容、电感按同一容差抽样，统计各非地节点的电位（默认直流稳态）
+        self.checkGround()
+        tolerances = CS.default_tolerances(self.netlist, tolerance, s_value)
+        outputs = list(range(self.getNumOfNotGND()))
+        return CS.run_monte_carlo(self.netlist, outputs, num_samples, tolerances, s_value, callback=callback)
+
+    def monte_carlo_job(self, num_samples: int, tolerance: CS.Tolerance,
+                        s_value: complex | None = None) -> CS.MonteCarloJob:
+        # 同 run_monte_carlo，返回在后台进程中运行的任务（尚未启动）
+        self.checkGround()
+        tolerances = CS.default_tolerances(self.netlist, tolerance, s_value)
+        outputs = list(range(self.getNumOfNotGND()))
+        return CS.MonteCarloJob(self.netlist, outputs, num_samples, tolerances, s_value)
+
+    def run_ac_analysis(self, frequencies: np.ndarray) -> CS.ACResult:
+        # 各非地节点在 s = jω 处的频率响应，电源的值作为相量幅值
+        self.checkGround()
+        return CS.ac_analysis(self.netlist, frequencies, workers=None)
+
+    def reduce_order(self, order: int, s0: float = 0.0) -> CS.ReducedModel:
+        # PRIMA 降阶模型，可反复用于交流分析与瞬态仿真
+        self.checkGround()
+        return CS.reduce_order(self.netlist, order, s0)
+
+    def simulate_transient(self, t_stop: float, t_step: float, method: str = 'trap') -> CS.TransientResult:
+        # 相同设置下复用上一次的仿真结果
+        key = (t_stop, t_step, method)
+        if self._transient_key != key:
+            self.checkGround()
+            self._transient = CS.simulate_transient(
+                self.netlist, t_stop, t_step, method, store=self.waveform_store)
+            self._transient_key = key
+        return self._transient
+
+    def getTimeScales(self) -> tuple[float, float] | None:
+        # 由 det(G + sC) = 0 的根得到；电路过大或没有动态元件时为 None
+        if self._time_scales is False:
+            self._time_scales = CS.time_scales(CS.circuit_poles(self.netlist))
+        return self._time_scales
+
+    def getTransientVoltage(self, item: CI.BaseCircuitItem, result: CS.TransientResult):
+        if len(item.nodes) != 2:
+            return np.zeros_like(result.times)
+        node1, node2 = item.getCircuitNodes()
+        return result.getVoltage(self.getNetlistIndex(node1), self.getNetlistIndex(node2))
+
+    def getTransientCurrent(self, item: CI.BaseCircuitItem, result: CS.TransientResult):
+        # 电流方向与 s 域结果一致：从元件的第一个节点流向第二个节点
+        if isinstance(item, CI.ResistorItem):
+            return self.getTransientVoltage(item, result) / item.resistance
+        if isinstance(item, (CI.CapacitorItem, CI.InductorItem)):
+            return result.element_currents[self.itemToElement[item]]
+        if isinstance(item, CI.VoltageSourceItem):
+            return result.source_currents[:, self.getVoltageSourceIndex(item)]
+        if isinstance(item, CI.CurrentSourceItem):
+            return np.full_like(result.times, item.current)
+        if isinstance(item, CI.VoltmeterItem):
+            return np.zeros_like(result.times)
+        return None
+
+    def getTimeDomain(self, expr) -> CS.TimeDomainResult:
+        return self.time_domain_cache.get(expr, self.s, self.t)
+
+    def output(self, workers: int | None = None) -> str:
         x = self.solution
         logger.info('x: ' + str(x))
 
-        potiential = x[:self.getNumOfNotGND()]
-        current = x[self.getNumOfNotGND():]
+        if self.engine == 'numeric':
+            return self.output_numeric()
+
+        # 所有节点电位与电压源电流的逆拉氏变换交给进程池并行计算
+        num_nodes = self.getNumOfNotGND()
+        time_domain = self.time_domain_cache.getMany(
+            x[:num_nodes + self.getVoltageSourcesNum()], self.s, self.t, workers)
+        potiential = time_domain[:num_nodes]
+        current = time_domain[num_nodes:]
         output = '电路节点电势：\n'
         for node, pot in zip(self.getNotGNDNodes(), potiential):
-            output += '{}: {}V\n'.format(node.getName(), sp.inverse_laplace_transform(
-                pot, self.s, t=self.t).simplify())
+            output += '{}: {}V\n'.format(node.getName(), sp.N(pot.expr, 6))
         output += '电压源电流：\n'
         for item, cur in zip(self.getVoltageSources(), current):
-            output += '{}: {}A\n'.format(item.getName(), sp.inverse_laplace_transform(
-                cur, self.s, t=self.t).simplify())
+            output += '{}: {}A\n'.format(item.getName(), sp.N(cur.expr, 6))
         return '电路求解结果：\n' + output
+
+    def output_numeric(self) -> str:
+        x = self.solution
+        where = '直流' if self.s_value is None else 's={}'.format(self.s_value)
+        output = '电路节点电势：\n'
+        for node, pot in zip(self.getNotGNDNodes(), x[:self.getNumOfNotGND()]):
+            output += '{}: {}V\n'.format(node.getName(), pot)
+        output += '电压源电流：\n'
+        for item, cur in zip(self.getVoltageSources(), x[self.getNumOfNotGND():]):
+            output += '{}: {}A\n'.format(item.getName(), cur)
+        return '电路求解结果（{}）：\n'.format(where) + output
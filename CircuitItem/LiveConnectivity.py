@@ -0,0 +1,79 @@
+import CircuitItem as CI
+import CircuitSolver as CS
+
+
+class LiveConnectivity:
+    # 随着导线的添加、删除增量维护元件节点的连通关系，每个连通分量对应一个电路节点
+    # 电流表视为短路，其两个节点之间有一条内部边
+    # floating 记录已接入电路的元件上尚未连线的节点
+    def __init__(self):
+        self.graph = CS.DynamicConnectivity()
+        self.wire_degree: dict[CI.ItemNode, int] = {}
+        self.floating: set[CI.ItemNode] = set()
+
+    def isAmmeterNode(self, node: CI.ItemNode) -> bool:
+        return isinstance(node.parentItem(), CI.AmmeterItem)
+
+    def isInCircuit(self, node: CI.ItemNode) -> bool:
+        return node in self.graph
+
+    def addNode(self, node: CI.ItemNode):
+        if node in self.graph:
+            return
+        self.graph.add_vertex(node)
+        self.floating.discard(node)
+        item = node.parentItem()
+        if self.isAmmeterNode(node):
+            another = item.getAnotherNode(node)
+            self.addNode(another)
+            self.graph.add_edge(node, another)
+        for other in item.nodes:
+            if other not in self.graph:
+                self.floating.add(other)
+
+    def removeNode(self, node: CI.ItemNode):
+        self.graph.remove_vertex(node)
+        self.wire_degree.pop(node, None)
+        item = node.parentItem()
+        if any(other in self.graph for other in item.nodes):
+            self.floating.add(node)
+        else:
+            self.floating.difference_update(item.nodes)
+
+    def addWire(self, node1: CI.ItemNode, node2: CI.ItemNode):
+        self.addNode(node1)
+        self.addNode(node2)
+        self.graph.add_edge(node1, node2)
+        for node in (node1, node2):
+            self.wire_degree[node] = self.wire_degree.get(node, 0) + 1
+
+    def removeWire(self, node1: CI.ItemNode, node2: CI.ItemNode) -> list[CI.ItemNode]:
+        # 返回因此不再接入电路的元件节点
+        self.graph.remove_edge(node1, node2)
+        removed = []
+        for node in (node1, node2):
+            self.wire_degree[node] -= 1
+            if self.wire_degree[node]:
+                continue
+            if self.isAmmeterNode(node):
+                # 电流表的另一端仍有导线时，两个节点都保留在电路中
+                another = node.parentItem().getAnotherNode(node)
+                if self.wire_degree.get(another, 0):
+                    continue
+                self.removeNode(another)
+                removed.append(another)
+            self.removeNode(node)
+            removed.append(node)
+        return removed
+
+    def getGroups(self) -> list[list[CI.ItemNode]]:
+        return [list(group) for group in self.graph.getComponents()]
+
+    def getNodesNum(self) -> int:
+        return len(self.graph)
+
+    def getFloatingNodes(self) -> set[CI.ItemNode]:
+        return self.floating
+
+    def clear(self):
+        self.__init__()
@@ -30,6 +30,7 @@ class VoltageSourceSymbol(ItemSymbol):
 class VoltageSourceItem(BaseCircuitItem):
     _item_counter = ItemCounter()
     _has_value = True
+    element_kind = 'V'
 
     @staticmethod
     def What() -> str:
@@ -123,6 +124,7 @@ class CurrentSourceSymbol(ItemSymbol):
 class CurrentSourceItem(BaseCircuitItem):
     _item_counter = ItemCounter()
     _has_value = True
+    element_kind = 'I'
 
     @staticmethod
     def What() -> str:
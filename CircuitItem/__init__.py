@@ -3,8 +3,13 @@ from .SourceItem import VoltageSourceItem, GroundItem, CurrentSourceItem
 from .BasicItem import ResistorItem, WireItem, CapacitorItem, InductorItem
 from .MeterItem import VoltmeterItem, AmmeterItem
 from .CircuitTopology import CircuitTopology, NoGNDNodeError
+from .LiveConnectivity import LiveConnectivity
 
 __all__ = ['BaseCircuitItem', 'ItemNode', 'VoltageSourceItem', 'GroundItem', 'CurrentSourceItem', 'ResistorItem', 'WireItem',
-           'VoltmeterItem', 'AmmeterItem', 'CircuitNode', 'CircuitTopology', 'CapacitorItem', 'InductorItem', 'NoGNDNodeError']
+           'VoltmeterItem', 'AmmeterItem', 'CircuitNode', 'CircuitTopology', 'CapacitorItem', 'InductorItem', 'NoGNDNodeError',
+           'LiveConnectivity']
 ADD_ITEM_TYPES = [VoltageSourceItem, GroundItem, CurrentSourceItem,
                   ResistorItem, CapacitorItem, InductorItem, VoltmeterItem, AmmeterItem]
+# 网表元件类型对应的元件类，元件的第 1、2 个节点依次对应网表中的 n1、n2
+ELEMENT_ITEM_TYPES = {itemType.element_kind: itemType for itemType in ADD_ITEM_TYPES
+                      if itemType.element_kind is not None}
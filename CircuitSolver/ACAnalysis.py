@@ -0,0 +1,175 @@
+from log_config import logger
+from .Netlist import Netlist, GND, KIND_CODES
+from .NumericEngine import stamp_MNA_sparse, incidence_matrix, SingularCircuitError
+from .Ordering import get_ordering
+from .Stamps import get_branch_elements
+from .Subcircuits import flatten_netlist
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+import scipy.linalg as sla
+import scipy.sparse as sps
+import scipy.sparse.linalg as spla
+
+# 阶数不超过该值时用 QZ 分解把 G + sC 化为上三角，所有频率点批量回代；否则逐点稀疏 LU
+DENSE_MAX_SIZE = 250
+# 稠密回代时每块的频率点数，限制中间数组的内存
+DENSE_CHUNK_SIZE = 2048
+# 稀疏路径每个任务的频率点数
+SPARSE_CHUNK_SIZE = 512
+# 稀疏路径的消元顺序，只计算一次，所有频率点共用
+SPARSE_ORDERING = 'mindegree'
+
+
+class ACResult:
+    frequencies: np.ndarray
+    outputs: list[int]
+    # 每行对应一个频率点，每列对应 outputs 中的一个节点，为复数相量
+    responses: np.ndarray
+
+    def __init__(self, frequencies, outputs, responses):
+        self.frequencies = frequencies
+        self.outputs = outputs
+        self.responses = responses
+
+    def getResponse(self, node: int) -> np.ndarray:
+        if node == GND:
+            return np.zeros_like(self.frequencies, dtype=complex)
+        return self.responses[:, self.outputs.index(node)]
+
+    def getMagnitude(self, node: int) -> np.ndarray:
+        # 幅值，单位 dB
+        with np.errstate(divide='ignore'):
+            return 20 * np.log10(np.abs(self.getResponse(node)))
+
+    def getPhase(self, node: int) -> np.ndarray:
+        # 相位，单位度，沿频率展开避免 ±180° 处的跳变
+        return np.degrees(np.unwrap(np.angle(self.getResponse(node))))
+
+
+def frequency_grid(f_start: float, f_stop: float, points: int) -> np.ndarray:
+    # 对数等间隔的频率点，单位 Hz
+    if f_start <= 0 or f_stop <= f_start:
+        raise ValueError('频率范围应满足 0 < 起始频率 < 终止频率')
+    return np.logspace(np.log10(f_start), np.log10(f_stop), points)
+
+
+def stamp_MNA_pencil(netlist: Netlist) -> tuple[sps.csc_matrix, sps.csc_matrix, np.ndarray]:
+    # 把 MNA 方程写成 (G + sC) x = b，电感以支路电流为未知量（V1 - V2 - sL * I_L = 0）
+    # G 与直流方程相同，电源取原值作为相量幅值
+    # 电感支路在支路未知量中的位置由 get_branch_elements 的排列给出，注册的其他支路元件可能排在电感之后
+    G, b = stamp_MNA_sparse(netlist)
+    size = G.shape[0]
+    capacitors = netlist.getElementsOfKind('C')
+    P_C = incidence_matrix([(n1, n2) for n1, n2, _ in capacitors], size)
+    C = P_C.T @ sps.diags([value for _, _, value in capacitors]) @ P_C
+    kinds, _, _, values = netlist.getArrays()
+    branches = get_branch_elements(netlist)
+    inductors = np.flatnonzero(kinds[branches] == KIND_CODES['L'])
+    rows = netlist.num_nodes + inductors
+    C = C - sps.coo_matrix((values[branches[inductors]], (rows, rows)), shape=(size, size))
+    return G.tocsc(), sps.csc_matrix(C), b
+
+
+class PencilPattern:
+    # G 与 C 的公共稀疏结构与填充缩减排序只计算一次，每个频率点 data = G_data + s * C_data
+    def __init__(self, G: sps.csc_matrix, C: sps.csc_matrix, b: np.ndarray):
+        perm = get_ordering(abs(G) + abs(C), SPARSE_ORDERING)
+        self.perm = perm
+        G = G[perm][:, perm].tocsc()
+        C = C[perm][:, perm].tocsc()
+        pattern = (abs(G) + abs(C)).tocsc()
+        pattern.sort_indices()
+        self.indptr, self.indices = pattern.indptr, pattern.indices
+        cols = np.repeat(np.arange(G.shape[0]), np.diff(self.indptr))
+        self.G_data = np.asarray(G[self.indices, cols]).ravel()
+        self.C_data = np.asarray(C[self.indices, cols]).ravel()
+        self.b = b[perm]
+        self.size = G.shape[0]
+
+    def solve(self, s: complex, outputs: list[int]) -> np.ndarray:
+        data = self.G_data + s * self.C_data
+        A = sps.csc_matrix((data, self.indices, self.indptr), shape=(self.size, self.size))
+        try:
+            lu = spla.splu(A, permc_spec='NATURAL')
+        except RuntimeError as e:
+            raise SingularCircuitError() from e
+        x = np.empty(self.size, dtype=complex)
+        x[self.perm] = lu.solve(self.b.astype(complex))
+        return x[outputs]
+
+
+# 工作进程中的稀疏结构，由 init_worker 设置
+_worker_pattern = None
+
+
+def init_worker(G: sps.csc_matrix, C: sps.csc_matrix, b: np.ndarray):
+    global _worker_pattern
+    _worker_pattern = PencilPattern(G, C, b)
+
+
+def solve_chunk(s_values: np.ndarray, outputs: list[int]) -> np.ndarray:
+    return np.array([_worker_pattern.solve(s, outputs) for s in s_values]).reshape(len(s_values), len(outputs))
+
+
+def solve_dense(G: np.ndarray, C: np.ndarray, b: np.ndarray, s_values: np.ndarray, outputs: list[int]) -> np.ndarray:
+    # QZ 分解：Q^H G Z = AA，Q^H C Z = BB 均为上三角，则 G + sC = Q (AA + s BB) Z^H
+    # 每个频率点只需 O(n^2) 的三角回代，对所有频率点向量化进行
+    AA, BB, Q, Z = sla.qz(G.astype(complex), C.astype(complex), output='complex')
+    c = Q.conj().T @ b
+    diag_A, diag_B = np.diag(AA), np.diag(BB)
+    if np.any((np.abs(diag_A) <= 1e-14 * np.abs(AA).max(initial=1)) &
+              (np.abs(diag_B) <= 1e-14 * np.abs(BB).max(initial=1))):
+        raise SingularCircuitError()
+    Z_out = Z[outputs]
+    n = len(c)
+    result = np.empty((len(s_values), len(outputs)), dtype=complex)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, len(s_values), DENSE_CHUNK_SIZE):
+            s = s_values[start:start + DENSE_CHUNK_SIZE]
+            y = np.empty((n, len(s)), dtype=complex)
+            for i in range(n - 1, -1, -1):
+                rest = c[i] - AA[i, i + 1:] @ y[i + 1:] - s * (BB[i, i + 1:] @ y[i + 1:])
+                y[i] = rest / (diag_A[i] + s * diag_B[i])
+            result[start:start + len(s)] = (Z_out @ y).T
+    return result
+
+
+def ac_analysis(netlist: Netlist, frequencies: np.ndarray, outputs: list[int] | None = None,
+                workers: int | None = 1, dense: bool | None = None) -> ACResult:
+    # 在 s = jω 处求解各频率点的相量解，电源的值作为相量幅值，返回 outputs 中节点的复数响应
+    # dense 为 None 时按阶数选择稠密 QZ 或稀疏 LU；稀疏路径可用 workers 个进程分块并行
+    frequencies = np.asarray(frequencies, dtype=float)
+    outputs = list(range(netlist.num_nodes)) if outputs is None else list(outputs)
+    # 子电路的端口导纳不是 s 的一次式，展开后再写成 G + sC
+    G, C, b = stamp_MNA_pencil(flatten_netlist(netlist))
+    size = G.shape[0]
+    s_values = 2j * np.pi * frequencies
+    solve_outputs = [node for node in outputs if node != GND]
+    if dense is None:
+        dense = size <= DENSE_MAX_SIZE
+    workers = workers or os.cpu_count() or 1
+    logger.info('交流分析：{}个频率点，{}阶，{}'.format(
+        len(frequencies), size, '稠密QZ' if dense else '稀疏LU（{}个进程）'.format(workers)))
+
+    if size == 0:
+        responses = np.zeros((len(frequencies), len(solve_outputs)), dtype=complex)
+    elif dense:
+        responses = solve_dense(G.toarray(), C.toarray(), b, s_values, solve_outputs)
+    elif workers == 1:
+        init_worker(G, C, b)
+        responses = solve_chunk(s_values, solve_outputs)
+    else:
+        chunks = [s_values[start:start + SPARSE_CHUNK_SIZE]
+                  for start in range(0, len(s_values), SPARSE_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(G, C, b)) as executor:
+            parts = list(executor.map(solve_chunk, chunks, [solve_outputs] * len(chunks)))
+        responses = np.vstack(parts)
+
+    full = np.zeros((len(frequencies), len(outputs)), dtype=complex)
+    for j, node in enumerate(outputs):
+        if node != GND:
+            full[:, j] = responses[:, solve_outputs.index(node)]
+    return ACResult(frequencies, outputs, full)
@@ -0,0 +1,287 @@
+from log_config import logger
+from .Netlist import Netlist, GND, ELEMENT_KINDS
+from .Subcircuits import Subcircuit
+
+import json
+import os
+import re
+
+# 电路描述文件中表示地的节点名
+GND_NAMES = ('0', 'gnd', 'GND')
+# SPICE 数值后缀，不区分大小写，后缀之后的单位字母忽略（如 10kOhm）
+SPICE_SCALES = {'t': 1e12, 'g': 1e9, 'meg': 1e6, 'k': 1e3, 'mil': 25.4e-6,
+                'm': 1e-3, 'u': 1e-6, 'n': 1e-9, 'p': 1e-12, 'f': 1e-15}
+SPICE_VALUE = re.compile(r'([+-]?(?:\d+\.?\d*|\.\d+)(?:e[+-]?\d+)?)(meg|mil|[tgkmunpf])?', re.IGNORECASE)
+
+
+class CircuitFileError(Exception):
+    def __init__(self, path: str, message: str):
+        super().__init__('电路文件 {} 格式错误：{}'.format(path, message))
+
+
+class Circuit:
+    # 网表以及节点、元件、子电路实例的名称，节点名按首次出现的顺序编号
+    __slots__ = ('name', 'netlist', 'node_names', 'element_names', 'instance_names', 'nodeToIndex')
+    name: str
+    netlist: Netlist
+    node_names: list[str]
+    element_names: list[str]
+    instance_names: list[str]
+
+    def __init__(self, name: str, netlist: Netlist | None = None,
+                 node_names: list[str] | None = None, element_names: list[str] | None = None,
+                 instance_names: list[str] | None = None):
+        self.name = name
+        self.netlist = Netlist(0) if netlist is None else netlist
+        self.node_names = [] if node_names is None else node_names
+        self.element_names = [] if element_names is None else element_names
+        self.instance_names = [] if instance_names is None else instance_names
+        self.nodeToIndex = {name: i for i, name in enumerate(self.node_names)}
+
+    def getNodeName(self, index: int) -> str:
+        return '0' if index == GND else self.node_names[index]
+
+    def getNodeIndex(self, node_name) -> int:
+        node_name = str(node_name)
+        if node_name in GND_NAMES:
+            return GND
+        if node_name not in self.nodeToIndex:
+            self.nodeToIndex[node_name] = len(self.node_names)
+            self.node_names.append(node_name)
+            self.netlist.num_nodes += 1
+        return self.nodeToIndex[node_name]
+
+    def add(self, name: str, kind: str, n1, n2, value: float) -> int:
+        index = self.netlist.add(kind, self.getNodeIndex(n1), self.getNodeIndex(n2), value)
+        self.element_names.append(name)
+        return index
+
+    def addInstance(self, name: str, subcircuit: Subcircuit, nodes) -> int:
+        index = self.netlist.addInstance(subcircuit, [self.getNodeIndex(node) for node in nodes])
+        self.instance_names.append(name)
+        return index
+
+    def toSubcircuit(self, num_ports: int) -> Subcircuit:
+        # 前 num_ports 个节点为端口
+        return Subcircuit(self.name, self.netlist, range(num_ports), self.node_names, self.element_names,
+                          self.instance_names)
+
+    def getVoltageSourceNames(self) -> list[str]:
+        # 与 MNA 解中电压源电流的顺序一致
+        return [name for name, element in zip(self.element_names, self.netlist.elements) if element[0] == 'V']
+
+
+def load_circuit_json(path: str) -> Circuit:
+    # {"elements": [{"name": "R1", "type": "R", "nodes": ["in", "out"], "value": 1000}, ...]}
+    # 电源为阶跃源，电压源的 nodes 依次为正、负极
+    with open(path, encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise CircuitFileError(path, str(e)) from e
+    circuit = Circuit(os.path.splitext(os.path.basename(path))[0])
+    if not isinstance(data, dict) or not isinstance(data.get('elements'), list):
+        raise CircuitFileError(path, '缺少 elements 列表')
+    for i, element in enumerate(data['elements']):
+        try:
+            kind = element['type']
+            n1, n2 = element['nodes']
+            value = float(element['value'])
+        except (KeyError, TypeError, ValueError) as e:
+            raise CircuitFileError(path, '第{}个元件描述不完整'.format(i + 1)) from e
+        if kind not in ELEMENT_KINDS:
+            raise CircuitFileError(path, '未知的元件类型：{}'.format(kind))
+        circuit.add(element.get('name', '{}{}'.format(kind, i + 1)), kind, n1, n2, value)
+    return circuit
+
+
+def write_circuit_json(circuit: Circuit, path: str):
+    elements = [{'name': name, 'type': kind, 'nodes': [circuit.getNodeName(n1), circuit.getNodeName(n2)],
+                 'value': value}
+                for name, (kind, n1, n2, value) in zip(circuit.element_names, circuit.netlist.elements)]
+    if circuit.netlist.instances:
+        raise CircuitFileError(path, '含子电路实例的电路只能保存为 SPICE 网表')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'elements': elements}, f, ensure_ascii=False, indent=1)
+
+
+def parse_spice_value(token: str) -> float:
+    match = SPICE_VALUE.match(token)
+    if match is None:
+        raise ValueError(token)
+    number, suffix = match.groups()
+    return float(number) * (SPICE_SCALES[suffix.lower()] if suffix else 1)
+
+
+def spice_logical_lines(f):
+    # 逐行读取，合并以 + 开头的续行，去掉注释；第一行为标题，单独返回
+    title = None
+    pending, pending_number = None, 0
+    for number, line in enumerate(f, 1):
+        if title is None:
+            title = line.strip()
+            continue
+        line = line.split(';', 1)[0].strip()
+        if not line or line[0] == '*':
+            continue
+        if line[0] == '+':
+            if pending is not None:
+                pending += ' ' + line[1:]
+            continue
+        if pending is not None:
+            yield pending_number, pending
+        pending, pending_number = line, number
+    if pending is not None:
+        yield pending_number, pending
+
+
+def load_circuit_spice(path: str) -> Circuit:
+    # SPICE 子集：R/C/L/V/I 元件，节点 0 或 gnd 为地，电源取 DC 值（在本项目中为阶跃源）
+    # .subckt 名称 端口... 到 .ends 之间为子电路定义（定义内的 0、gnd 仍为地），X名称 节点... 子电路名 为实例，
+    # 子电路需先定义后使用；按行流式解析，不把整个文件读入内存
+    circuit = Circuit(os.path.splitext(os.path.basename(path))[0])
+    subcircuits = {}
+    # 正在解析的电路：顶层电路或子电路定义
+    current, num_ports = circuit, 0
+    with open(path, encoding='utf-8') as f:
+        for number, line in spice_logical_lines(f):
+            tokens = line.split(None, 5)
+            first = tokens[0]
+            if first[0] == '.':
+                command = first.lower()
+                if command == '.subckt':
+                    tokens = line.split()
+                    if current is not circuit:
+                        raise CircuitFileError(path, '第{}行：不支持嵌套定义子电路'.format(number))
+                    ports = tokens[2:]
+                    if not ports:
+                        raise CircuitFileError(path, '第{}行：子电路定义缺少名称或端口'.format(number))
+                    if len(set(ports)) != len(ports) or any(port in GND_NAMES for port in ports):
+                        raise CircuitFileError(path, '第{}行：子电路的端口应为互不相同的非地节点'.format(number))
+                    current, num_ports = Circuit(tokens[1]), len(ports)
+                    for port in ports:
+                        current.getNodeIndex(port)
+                    continue
+                if command == '.ends':
+                    if current is circuit:
+                        raise CircuitFileError(path, '第{}行：.ends 之前没有 .subckt'.format(number))
+                    subcircuits[current.name.lower()] = current.toSubcircuit(num_ports)
+                    current = circuit
+                    continue
+                if command == '.end':
+                    break
+                logger.warning('第{}行：忽略不支持的控制语句 {}'.format(number, first))
+                continue
+            kind = first[0].upper()
+            if kind == 'X':
+                tokens = line.split()
+                if len(tokens) < 3:
+                    raise CircuitFileError(path, '第{}行：元件描述不完整'.format(number))
+                subcircuit = subcircuits.get(tokens[-1].lower())
+                if subcircuit is None:
+                    raise CircuitFileError(path, '第{}行：未定义的子电路 {}'.format(number, tokens[-1]))
+                if len(tokens) - 2 != subcircuit.getNumPorts():
+                    raise CircuitFileError(path, '第{}行：子电路 {} 有{}个端口'.format(
+                        number, subcircuit.name, subcircuit.getNumPorts()))
+                current.addInstance(first, subcircuit, tokens[1:-1])
+                continue
+            if kind not in ELEMENT_KINDS:
+                raise CircuitFileError(path, '第{}行：不支持的元件 {}'.format(number, first))
+            if len(tokens) < 4:
+                raise CircuitFileError(path, '第{}行：元件描述不完整'.format(number))
+            value_token = tokens[3]
+            if kind in ('V', 'I') and value_token.lower() == 'dc':
+                if len(tokens) < 5:
+                    raise CircuitFileError(path, '第{}行：缺少电源的值'.format(number))
+                value_token = tokens[4]
+            try:
+                value = parse_spice_value(value_token)
+            except ValueError as e:
+                raise CircuitFileError(path, '第{}行：无法解析数值 {}'.format(number, value_token)) from e
+            n1, n2 = tokens[1], tokens[2]
+            if kind == 'I':
+                # SPICE 中电流从 n+ 经电源流向 n-，即注入 n-；网表中电流源注入 n1，两端对调
+                n1, n2 = n2, n1
+            current.add(first, kind, n1, n2, value)
+    if current is not circuit:
+        raise CircuitFileError(path, '子电路 {} 缺少 .ends'.format(current.name))
+    return circuit
+
+
+def collect_subcircuits(netlist: Netlist, found: dict | None = None) -> dict[int, Subcircuit]:
+    # 网表用到的子电路定义（含嵌套），被使用的定义排在使用者之前
+    found = {} if found is None else found
+    for subcircuit, _ in netlist.instances:
+        if id(subcircuit) not in found:
+            collect_subcircuits(subcircuit.netlist, found)
+            found[id(subcircuit)] = subcircuit
+    return found
+
+
+def write_spice_elements(f, netlist: Netlist, element_names: list[str], instance_names: list[str],
+                         node_name, subcircuit_names: dict[int, str]):
+    # 元件名不以类型字母开头时补上类型字母，电源写为 DC 值，电流源按 SPICE 的方向对调两端
+    for name, (kind, n1, n2, value) in zip(element_names, netlist.elements):
+        if name[:1].upper() != kind:
+            name = kind + name
+        if kind == 'I':
+            n1, n2 = n2, n1
+        f.write('{} {} {} {}{!r}\n'.format(name, node_name(n1), node_name(n2),
+                                         'DC ' if kind in ('V', 'I') else '', float(value)))
+    for name, (subcircuit, nodes) in zip(instance_names, netlist.instances):
+        if name[:1].upper() != 'X':
+            name = 'X' + name
+        f.write('{} {} {}\n'.format(name, ' '.join(map(node_name, nodes)), subcircuit_names[id(subcircuit)]))
+
+
+def write_spice(circuit: Circuit, path: str):
+    # 子电路定义写在顶层元件之前，同名的不同定义加序号区分；
+    # 定义内的元件、实例沿用读入时的名称，没有名称时（如在代码中构造的子电路）按序号命名
+    subcircuits = collect_subcircuits(circuit.netlist)
+    subcircuit_names, used = {}, set()
+    for key, subcircuit in subcircuits.items():
+        name, k = subcircuit.name, 1
+        while name.lower() in used:
+            name, k = '{}_{}'.format(subcircuit.name, k), k + 1
+        used.add(name.lower())
+        subcircuit_names[key] = name
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{}\n'.format(circuit.name))
+        for key, subcircuit in subcircuits.items():
+            netlist = subcircuit.netlist
+            names = subcircuit.node_names or ['n{}'.format(i + 1) for i in range(netlist.num_nodes)]
+
+            def node_name(index: int, names=names) -> str:
+                return '0' if index == GND else names[index]
+
+            element_names = subcircuit.element_names or [
+                '{}{}'.format(kind, i + 1) for i, (kind, *_) in enumerate(netlist.elements)]
+            instance_names = subcircuit.instance_names or [
+                'X{}'.format(i + 1) for i in range(len(netlist.instances))]
+            f.write('.subckt {} {}\n'.format(subcircuit_names[key], ' '.join(map(node_name, subcircuit.ports))))
+            write_spice_elements(f, netlist, element_names, instance_names, node_name, subcircuit_names)
+            f.write('.ends\n')
+        write_spice_elements(f, circuit.netlist, circuit.element_names, circuit.instance_names,
+                             circuit.getNodeName, subcircuit_names)
+        f.write('.end\n')
+
+
+# 扩展名到读取、写入函数的映射
+LOADERS = {'.json': load_circuit_json, '.cir': load_circuit_spice, '.sp': load_circuit_spice,
+           '.spice': load_circuit_spice, '.net': load_circuit_spice}
+WRITERS = {'.json': write_circuit_json, '.cir': write_spice, '.sp': write_spice,
+           '.spice': write_spice, '.net': write_spice}
+
+
+def load_circuit(path: str) -> Circuit:
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in LOADERS:
+        raise CircuitFileError(path, '不支持的文件类型：{}'.format(ext))
+    return LOADERS[ext](path)
+
+
+def save_circuit(circuit: Circuit, path: str):
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WRITERS:
+        raise CircuitFileError(path, '不支持的文件类型：{}'.format(ext))
+    WRITERS[ext](circuit, path)
@@ -0,0 +1,117 @@
+# 按连通分量拆分网表：地电位固定为 0，只经地相连的各部分互不影响，可以分别（并行）求解再合并
+# 符号消元与回代的代价随方程阶数超线性增长，拆开求解的总耗时小于整体求解
+from log_config import logger
+from .Netlist import Netlist, GND
+from .Stamps import get_branch_elements
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+import os
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.csgraph import connected_components
+
+
+class Component:
+    # nodes[i] 为分量中第 i 个节点在原网表中的编号，elements 为分量中元件在原网表中的序号（保持原顺序）
+    __slots__ = ('netlist', 'nodes', 'elements')
+
+    def __init__(self, netlist: Netlist, nodes: np.ndarray, elements: np.ndarray):
+        self.netlist = netlist
+        self.nodes = nodes
+        self.elements = elements
+
+
+def split_components(netlist: Netlist) -> list[Component]:
+    # 以非地节点为顶点、两端均不接地的元件为边求连通分量；元件归入其非地端所在的分量
+    # 两端均接地的元件归入第一个分量
+    # 含子电路实例时不拆分：实例的端口之间经约化后的端口方程相连
+    kinds, n1, n2, values = netlist.getArrays()
+    num_nodes = netlist.num_nodes
+    if num_nodes == 0:
+        return [Component(netlist, np.zeros(0, dtype=int), np.arange(len(netlist)))]
+    if netlist.instances:
+        return [Component(netlist, np.arange(num_nodes), np.arange(len(netlist)))]
+    both = (n1 != GND) & (n2 != GND)
+    graph = sps.coo_matrix((np.ones(both.sum()), (n1[both], n2[both])), shape=(num_nodes, num_nodes))
+    count, labels = connected_components(graph, directed=False)
+    if count == 1:
+        return [Component(netlist, np.arange(num_nodes), np.arange(len(netlist)))]
+
+    element_labels = np.zeros(len(kinds), dtype=int)
+    has1 = n1 != GND
+    only2 = ~has1 & (n2 != GND)
+    element_labels[has1] = labels[n1[has1]]
+    element_labels[only2] = labels[n2[only2]]
+
+    node_order = np.argsort(labels, kind='stable')
+    node_counts = np.bincount(labels, minlength=count)
+    node_starts = np.concatenate(([0], np.cumsum(node_counts)[:-1]))
+    # 节点在分量内的新编号；末尾追加 GND，使 local[GND] 仍为 GND
+    local = np.empty(num_nodes + 1, dtype=np.int32)
+    local[node_order] = np.arange(num_nodes) - np.repeat(node_starts, node_counts)
+    local[-1] = GND
+    element_order = np.argsort(element_labels, kind='stable')
+    element_starts = np.concatenate(([0], np.cumsum(np.bincount(element_labels, minlength=count))))
+
+    components = []
+    for c in range(count):
+        nodes = node_order[node_starts[c]:node_starts[c] + node_counts[c]]
+        elements = element_order[element_starts[c]:element_starts[c + 1]]
+        sub = Netlist(len(nodes))
+        sub.kinds.frombytes(kinds[elements].tobytes())
+        sub.n1.frombytes(local[n1[elements]].tobytes())
+        sub.n2.frombytes(local[n2[elements]].tobytes())
+        sub.values.frombytes(values[elements].tobytes())
+        components.append(Component(sub, nodes, elements))
+    return components
+
+
+def merge_solutions(netlist: Netlist, components: list[Component], solutions: list, s=None) -> list:
+    # 按原网表的未知量顺序合并各分量的解，s 决定支路未知量的排列（见 Stamps.get_branch_elements）
+    branches = get_branch_elements(netlist, s)
+    branch_position = np.zeros(len(netlist), dtype=int)
+    branch_position[branches] = netlist.num_nodes + np.arange(len(branches))
+    merged = [None] * (netlist.num_nodes + len(branches))
+    for component, solution in zip(components, solutions):
+        sub_branches = component.elements[get_branch_elements(component.netlist, s)]
+        positions = np.concatenate((component.nodes, branch_position[sub_branches]))
+        for position, value in zip(positions.tolist(), solution):
+            merged[position] = value
+    return merged
+
+
+def solve_components(netlist: Netlist, components: list[Component], solve, s=None,
+                     workers: int | None = None, progress=None) -> list:
+    # solve(sub_netlist) 求解一个分量，返回按分量未知量顺序排列的解，合并为原网表的解（见 map_components）
+    return merge_solutions(netlist, components, map_components(components, solve, s, workers, progress), s)
+
+
+def map_components(components: list[Component], solve, s=None, workers: int | None = None,
+                   progress=None) -> list:
+    # 对每个分量调用 solve(sub_netlist)，按分量顺序返回结果；多个分量时交给进程池并行
+    # 当前为守护进程（不能创建子进程）或 workers 为 1 时串行求解；progress(fraction) 按已完成的未知量比例报告
+    sizes = [len(component.nodes) + len(get_branch_elements(component.netlist, s)) for component in components]
+    total = sum(sizes) or 1
+    workers = min(workers or os.cpu_count() or 1, len(components))
+    logger.info('网表拆分为{}个连通分量，最大{}阶'.format(len(components), max(sizes)))
+    results = [None] * len(components)
+    done = 0
+    if workers > 1 and not mp.current_process().daemon:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # 大的分量先提交，减少最后只剩一个进程在工作的时间
+            futures = {executor.submit(solve, components[i].netlist): i
+                       for i in sorted(range(len(components)), key=lambda i: -sizes[i])}
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += sizes[i]
+                if progress is not None:
+                    progress(done / total)
+    else:
+        for i, component in enumerate(components):
+            results[i] = solve(component.netlist)
+            done += sizes[i]
+            if progress is not None:
+                progress(done / total)
+    return results
@@ -0,0 +1,57 @@
+# 直流工作点：直接构建 s→0 的极限电路（电容开路，电感视为 0V 支路），一次稀疏分解得到稳态解，
+# 无需符号求解与逆拉氏变换
+from log_config import logger
+from .Netlist import Netlist, GND, KIND_CODES
+from .NumericEngine import stamp_MNA_sparse, solve_MNA_sparse
+from .Stamps import STAMPS, get_branch_elements
+
+import time
+import numpy as np
+
+
+class DCResult:
+    node_voltages: np.ndarray
+    # 以支路电流为未知量的元件（电压源、电感）序号与对应的电流
+    branch_elements: np.ndarray
+    branch_currents: np.ndarray
+    # 电压源电流，按网表中电压源的顺序
+    source_currents: np.ndarray
+
+    def __init__(self, netlist: Netlist, x: np.ndarray):
+        self.netlist = netlist
+        self.node_voltages = x[:netlist.num_nodes]
+        self.branch_elements = get_branch_elements(netlist)
+        self.branch_currents = x[netlist.num_nodes:netlist.num_nodes + len(self.branch_elements)]
+        kinds = np.frombuffer(netlist.kinds, dtype=np.int8)
+        self.source_currents = self.branch_currents[kinds[self.branch_elements] == KIND_CODES['V']]
+
+    def getNodeVoltage(self, node: int) -> float:
+        if node == GND:
+            return 0.0
+        return float(self.node_voltages[node])
+
+    def getVoltage(self, n1: int, n2: int) -> float:
+        return self.getNodeVoltage(n1) - self.getNodeVoltage(n2)
+
+    def getElementCurrent(self, index: int) -> float:
+        # 从元件的第一个节点流向第二个节点的稳态电流
+        # 按元件的印记：支路电流未知量直接取解，电流源注入 n1（在元件中从 n2 流向 n1）故取其数值的相反数，
+        # 其余为直流导纳乘以两端电压（电容开路）
+        kind, n1, n2, value = self.netlist.elements[index]
+        stamp = STAMPS[kind]
+        if stamp.isBranch():
+            return float(self.branch_currents[np.flatnonzero(self.branch_elements == index)[0]])
+        if stamp.source == 'I':
+            return -value
+        Y = stamp.getAdmittance(value)
+        return 0.0 if Y is None else float(Y * self.getVoltage(n1, n2))
+
+
+def dc_operating_point(netlist: Netlist, ordering: str | None = None) -> DCResult:
+    # ordering 为 None 时由 SuperLU 按 COLAMD 排序，见 NumericEngine.factor_MNA
+    start = time.perf_counter()
+    A, b = stamp_MNA_sparse(netlist)
+    x = solve_MNA_sparse(A, b, ordering)
+    logger.info('直流工作点：{}阶，{}个非零元，耗时{:.1f} ms'.format(
+        A.shape[0], A.nnz, (time.perf_counter() - start) * 1000))
+    return DCResult(netlist, x)
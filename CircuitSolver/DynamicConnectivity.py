@@ -0,0 +1,101 @@
+# 动态连通性：支持加边、删边的无向多重图连通分量
+# 加边时把较小的分量并入较大的分量；删边时从两端交替做 BFS，先搜完的一侧即为较小的分量，只重标这一侧
+from collections import deque
+from typing import Hashable
+
+
+class DynamicConnectivity:
+    adjacency: dict[Hashable, dict[Hashable, int]]
+    component: dict[Hashable, int]
+    members: dict[int, set]
+
+    def __init__(self):
+        # 邻接表记录重边条数，删去其中一条时两端仍然相连
+        self.adjacency = {}
+        self.component = {}
+        self.members = {}
+        self._next_id = 0
+
+    def _new_component(self, vertices) -> int:
+        comp = self._next_id
+        self._next_id += 1
+        self.members[comp] = set(vertices)
+        for v in vertices:
+            self.component[v] = comp
+        return comp
+
+    def add_vertex(self, v):
+        if v not in self.adjacency:
+            self.adjacency[v] = {}
+            self._new_component((v,))
+
+    def add_edge(self, a, b):
+        self.add_vertex(a)
+        self.add_vertex(b)
+        self.adjacency[a][b] = self.adjacency[a].get(b, 0) + 1
+        self.adjacency[b][a] = self.adjacency[b].get(a, 0) + 1
+        comp_a, comp_b = self.component[a], self.component[b]
+        if comp_a == comp_b:
+            return
+        if len(self.members[comp_a]) < len(self.members[comp_b]):
+            comp_a, comp_b = comp_b, comp_a
+        moved = self.members.pop(comp_b)
+        for v in moved:
+            self.component[v] = comp_a
+        self.members[comp_a] |= moved
+
+    def remove_edge(self, a, b):
+        count = self.adjacency[a][b] - 1
+        if count:
+            self.adjacency[a][b] = self.adjacency[b][a] = count
+            return
+        del self.adjacency[a][b]
+        del self.adjacency[b][a]
+        self._split(a, b)
+
+    def remove_vertex(self, v):
+        for u in list(self.adjacency[v]):
+            self.adjacency[v][u] = self.adjacency[u][v] = 1
+            self.remove_edge(v, u)
+        del self.adjacency[v]
+        comp = self.component.pop(v)
+        self.members.pop(comp)
+
+    def _split(self, a, b):
+        # 从 a、b 两端交替扩展一个顶点，相遇则仍连通；否则先搜完的一侧分离为新的分量
+        seen = ({a}, {b})
+        queues = (deque([a]), deque([b]))
+        while True:
+            for side in (0, 1):
+                queue = queues[side]
+                if not queue:
+                    self._separate(seen[side])
+                    return
+                v = queue.popleft()
+                for u in self.adjacency[v]:
+                    if u in seen[1 - side]:
+                        return
+                    if u not in seen[side]:
+                        seen[side].add(u)
+                        queue.append(u)
+
+    def _separate(self, vertices: set):
+        comp = self.component[next(iter(vertices))]
+        self.members[comp] -= vertices
+        self._new_component(vertices)
+
+    def connected(self, a, b) -> bool:
+        return self.component[a] == self.component[b]
+
+    def getComponent(self, v) -> set:
+        return self.members[self.component[v]]
+
+    def getComponents(self) -> list[set]:
+        return list(self.members.values())
+
+    def __contains__(self, v):
+        return v in self.adjacency
+
+    def __len__(self):
+        # 连通分量数
+        return len(self.members)
@@ -0,0 +1,83 @@
+from log_config import logger
+from .Netlist import Netlist, GND
+from .NumericEngine import (stamp_MNA_sparse, stamp_MNA_rhs, element_admittance,
+                            factor_MNA, check_solution, normalize_s, SingularCircuitError)
+
+import numpy as np
+
+# 低秩修正的列数超过该值时重新分解
+DEFAULT_MAX_RANK = 16
+
+
+class IncrementalSolver:
+    # 保留 MNA 矩阵 A0 的 LU 分解，修改元件值时：
+    #   电阻、电容、电感：A = A0 + U diag(D) U^T，用 Woodbury 公式求解，不重新分解
+    #   电源：只重新构建右端项
+    netlist: Netlist
+
+    def __init__(self, netlist: Netlist, s: complex | None = None, max_rank: int = DEFAULT_MAX_RANK):
+        self.netlist = netlist
+        self.s, self.dtype = normalize_s(s)
+        self.max_rank = max_rank
+        self.refactor()
+
+    def refactor(self):
+        A, self.b = stamp_MNA_sparse(self.netlist, self.s)
+        self.size = A.shape[0]
+        self.lu = factor_MNA(A) if self.size else None
+        # 每个被修改的元件占 U 的一列：columns 为元件序号到列号的映射
+        self.columns = {}
+        self.pairs = []
+        self.D = np.zeros(0, dtype=self.dtype)
+        self.Z = np.zeros((self.size, 0), dtype=self.dtype)
+        logger.info('分解MNA矩阵：{}阶，{}个非零元'.format(self.size, A.nnz))
+
+    def getRank(self) -> int:
+        return len(self.pairs)
+
+    def project(self, x: np.ndarray) -> np.ndarray:
+        # U^T x，即各修改元件两端的电压
+        return np.array([(x[n1] if n1 != GND else 0) - (x[n2] if n2 != GND else 0)
+                         for n1, n2 in self.pairs], dtype=self.dtype).reshape((-1,) + x.shape[1:])
+
+    def update_value(self, index: int, value: float) -> np.ndarray:
+        kind, n1, n2, old_value = self.netlist.elements[index]
+        self.netlist.setValue(index, value)
+        if kind in ('V', 'I'):
+            self.b = stamp_MNA_rhs(self.netlist, self.s)
+            return self.solve()
+
+        old_Y = element_admittance(kind, old_value, self.s)
+        new_Y = element_admittance(kind, value, self.s)
+        if old_Y is None or new_Y == old_Y:
+            return self.solve()
+        if index in self.columns:
+            self.D[self.columns[index]] += new_Y - old_Y
+        elif self.getRank() >= self.max_rank:
+            self.refactor()
+        else:
+            u = np.zeros(self.size, dtype=self.dtype)
+            if n1 != GND:
+                u[n1] = 1
+            if n2 != GND:
+                u[n2] = -1
+            self.columns[index] = self.getRank()
+            self.pairs.append((n1, n2))
+            self.D = np.append(self.D, new_Y - old_Y)
+            self.Z = np.column_stack((self.Z, self.lu.solve(u)))
+        return self.solve()
+
+    def solve(self, b: np.ndarray | None = None) -> np.ndarray:
+        # x = y - Z (I + D U^T Z)^-1 D U^T y，其中 y = A0^-1 b，Z = A0^-1 U
+        b = self.b if b is None else b
+        if self.size == 0:
+            return np.zeros(0, dtype=self.dtype)
+        y = self.lu.solve(b)
+        if self.getRank() == 0:
+            return check_solution(y)
+        M = np.eye(self.getRank(), dtype=self.dtype) + self.D[:, None] * self.project(self.Z)
+        try:
+            w = np.linalg.solve(M, self.D * self.project(y))
+        except np.linalg.LinAlgError as e:
+            raise SingularCircuitError() from e
+        return check_solution(y - self.Z @ w)
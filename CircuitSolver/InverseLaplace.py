@@ -0,0 +1,229 @@
+from log_config import logger
+
+import math
+import multiprocessing as mp
+import os
+import numpy as np
+import scipy.signal as sig
+import sympy as sp
+
+# sympy.lambdify 使用的特殊函数映射
+SPECIAL_FUNCTIONS = {
+    'DiracDelta': lambda t: np.zeros_like(t),
+    'Heaviside': np.heaviside,
+    'Piecewise': lambda *args: np.piecewise(args[0], args[1::2], args[2::2]),
+    'Abs': np.abs,
+    'sign': np.sign,
+    'Max': np.maximum,
+    'Min': np.minimum,
+    'sin': np.sin,
+    'cos': np.cos,
+    'tan': np.tan,
+    'exp': np.exp,
+    'log': np.log,
+    'sqrt': np.sqrt
+}
+
+# 极点实部或虚部相对模长小于该值时视为 0
+POLE_SNAP_TOL = 1e-10
+# 留数分组时判定重极点的容差（频率归一化之后）
+REPEATED_POLE_TOL = 1e-3
+# 并行逆变换时单个表达式的默认超时/s；不同表达式少于该个数时不值得启动进程池
+INVERSE_TIMEOUT = 120.0
+PARALLEL_MIN_EXPRS = 4
+
+
+class InverseLaplaceTimeoutError(Exception):
+    def __init__(self, expr: sp.Expr, timeout: float):
+        super().__init__('逆拉氏变换超时（{} s）：{}'.format(timeout, expr))
+
+
+class TimeDomainResult:
+    expr: sp.Expr
+    # 极点以及与之对应的留数、阶数（1 表示单极点），符号回退时为 None
+    poles: np.ndarray | None
+    residues: np.ndarray | None
+    orders: np.ndarray | None
+    # 冲激项系数 direct[j] 对应 δ^(j)(t)，绘图时按 0 处理
+    direct: np.ndarray | None
+
+    def __init__(self, expr: sp.Expr, func=None, poles=None, residues=None, orders=None, direct=None):
+        self.expr = expr
+        self.poles = poles
+        self.residues = residues
+        self.orders = orders
+        self.direct = direct
+        self._func = func
+
+    def __getstate__(self):
+        # 编译好的求值函数不能序列化，在另一个进程中按需重新生成
+        state = self.__dict__.copy()
+        state['_func'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.poles is None:
+            t = next((x for x in self.expr.free_symbols if x.name == 't'), sp.Symbol('t'))
+            self._func = sp.lambdify(t, self.expr, modules=[SPECIAL_FUNCTIONS, 'numpy'])
+
+    def isRational(self) -> bool:
+        return self.poles is not None
+
+    def __call__(self, t_values) -> np.ndarray:
+        t_values = np.asarray(t_values, dtype=float)
+        if self._func is not None:
+            return np.broadcast_to(self._func(t_values), t_values.shape).astype(float)
+        if len(self.poles) == 0:
+            return np.zeros_like(t_values)
+        t_col = t_values.reshape(-1, 1)
+        # sum(r * t^(m-1)/(m-1)! * e^(p*t))，在 t < 0 时为 0
+        factorials = np.array([math.factorial(m - 1) for m in self.orders])
+        terms = self.residues * t_col ** (self.orders - 1) / factorials * np.exp(self.poles * t_col)
+        values = np.real(terms.sum(axis=1)).reshape(t_values.shape)
+        return np.where(t_values >= 0, values, 0.0)
+
+
+def snap(values: np.ndarray, tol: float = POLE_SNAP_TOL) -> np.ndarray:
+    values = np.asarray(values, dtype=complex)
+    scale = np.maximum(np.abs(values), 1)
+    real = np.where(np.abs(values.real) < tol * scale, 0, values.real)
+    imag = np.where(np.abs(values.imag) < tol * scale, 0, values.imag)
+    return real + 1j * imag
+
+
+def get_rational_coeffs(expr: sp.Expr, s: sp.Symbol) -> tuple[np.ndarray, np.ndarray] | None:
+    # 取出 expr = num(s) / den(s) 的分子、分母系数（降幂），无法化为数值系数的有理函数时返回 None
+    try:
+        num, den = sp.fraction(sp.cancel(sp.together(expr), s))
+        num_poly, den_poly = sp.Poly(num, s), sp.Poly(den, s)
+    except sp.PolynomialError:
+        return None
+    if num_poly.free_symbols - {s} or den_poly.free_symbols - {s}:
+        return None
+    try:
+        b = np.array([complex(c) for c in num_poly.all_coeffs()])
+        a = np.array([complex(c) for c in den_poly.all_coeffs()])
+    except TypeError:
+        return None
+    if np.any(np.abs(b.imag) > 0) or np.any(np.abs(a.imag) > 0):
+        return None
+    b, a = b.real, a.real
+    return b / a[0], a / a[0]
+
+
+def get_frequency_scale(a: np.ndarray) -> float:
+    # 以非零极点模长的几何平均作为特征频率
+    roots = np.abs(np.roots(a))
+    roots = roots[roots > 0]
+    if len(roots) == 0:
+        return 1.0
+    return float(np.exp(np.mean(np.log(roots))))
+
+
+def residue_expansion(b: np.ndarray, a: np.ndarray):
+    # 令 s = w0 * u 做频率归一化，使重极点判定与数值精度不依赖元件数值的量级
+    w0 = get_frequency_scale(a)
+    b_u = b * w0 ** np.arange(len(b) - 1, -1, -1)
+    a_u = a * w0 ** np.arange(len(a) - 1, -1, -1)
+    r, p, k = sig.residue(b_u / a_u[0], a_u / a_u[0], tol=REPEATED_POLE_TOL)
+    # residue 对重极点给出相同的极点值，并依次给出 1/(u-q), 1/(u-q)^2, ... 的系数
+    orders = np.ones(len(p), dtype=int)
+    for i in range(1, len(p)):
+        if p[i] == p[i - 1]:
+            orders[i] = orders[i - 1] + 1
+    # 换回 s：r / (u-q)^m = r * w0^m / (s - w0*q)^m，k_j * u^j = k_j / w0^j * s^j
+    p = snap(p * w0)
+    r = r * w0 ** orders
+    r = snap(r, tol=POLE_SNAP_TOL * max(1, np.max(np.abs(r), initial=0)))
+    keep = r != 0
+    # 直接项 k 为降幂排列，翻转后 direct[j] 对应 s^j，即 δ^(j)(t)
+    direct = np.real(k[::-1]) / w0 ** np.arange(len(k))
+    return p[keep], r[keep], orders[keep], direct
+
+
+def build_closed_form(poles, residues, orders, direct, t: sp.Symbol) -> sp.Expr:
+    expr = sp.Integer(0)
+    used = np.zeros(len(poles), dtype=bool)
+    for i, (p, r, m) in enumerate(zip(poles, residues, orders)):
+        if used[i]:
+            continue
+        used[i] = True
+        power = t ** (int(m) - 1) / math.factorial(int(m) - 1)
+        if p.imag == 0:
+            expr += sp.Float(r.real) * power * sp.exp(sp.Float(p.real) * t)
+            continue
+        # 共轭极点成对合并为 2e^(σt)(a cos ωt - b sin ωt)
+        for j in range(i + 1, len(poles)):
+            if not used[j] and orders[j] == m and np.isclose(poles[j], np.conj(p)):
+                used[j] = True
+                break
+        sigma, omega = sp.Float(p.real), sp.Float(abs(p.imag))
+        a, b = r.real, r.imag if p.imag > 0 else -r.imag
+        expr += 2 * power * sp.exp(sigma * t) * (sp.Float(a) * sp.cos(omega * t) - sp.Float(b) * sp.sin(omega * t))
+    expr *= sp.Heaviside(t)
+    for j, coeff in enumerate(direct):
+        if coeff != 0:
+            expr += sp.Float(coeff) * sp.DiracDelta(t, j) if j else sp.Float(coeff) * sp.DiracDelta(t)
+    return expr
+
+
+def inverse_laplace(expr, s: sp.Symbol, t: sp.Symbol) -> TimeDomainResult:
+    # 对有理函数求极点与留数得到闭式时域解；无法提取有理形式时回退到 sp.inverse_laplace_transform
+    expr = sp.sympify(expr)
+    if expr == 0:
+        return TimeDomainResult(sp.Integer(0), poles=np.zeros(0, dtype=complex), residues=np.zeros(0, dtype=complex),
+                                orders=np.zeros(0, dtype=int), direct=np.zeros(0))
+    coeffs = get_rational_coeffs(expr, s) if expr.has(s) else None
+    if coeffs is not None:
+        b, a = coeffs
+        poles, residues, orders, direct = residue_expansion(b, a)
+        return TimeDomainResult(build_closed_form(poles, residues, orders, direct, t),
+                                poles=poles, residues=residues, orders=orders, direct=direct)
+
+    logger.info('无法提取有理函数，使用 sympy 求逆拉氏变换：{}'.format(expr))
+    time_expr = sp.inverse_laplace_transform(expr, s, t).simplify()
+    func = sp.lambdify(t, time_expr, modules=[SPECIAL_FUNCTIONS, 'numpy'])
+    return TimeDomainResult(time_expr, func=func)
+
+
+def inverse_laplace_parallel(exprs: list[sp.Expr], s: sp.Symbol, t: sp.Symbol, workers: int,
+                             timeout: float | None, progress=None) -> list[TimeDomainResult] | None:
+    # 超时后需要终止仍在运行的工作进程，因此使用 multiprocessing.Pool（退出 with 时 terminate）
+    # 无法创建进程池时返回 None
+    try:
+        pool = mp.Pool(workers)
+    except OSError as e:
+        logger.warning('无法创建进程池，改为串行逆拉氏变换：{}'.format(e))
+        return None
+    results = []
+    with pool:
+        pending = [pool.apply_async(inverse_laplace, (expr, s, t)) for expr in exprs]
+        for expr, result in zip(exprs, pending):
+            try:
+                results.append(result.get(timeout))
+            except mp.TimeoutError as e:
+                raise InverseLaplaceTimeoutError(expr, timeout) from e
+            if progress is not None:
+                progress(len(results) / len(exprs))
+    return results
+
+
+def inverse_laplace_many(exprs, s: sp.Symbol, t: sp.Symbol, workers: int | None = None,
+                         timeout: float | None = INVERSE_TIMEOUT, progress=None) -> list[TimeDomainResult]:
+    # 各表达式的逆变换互不相关，sympy 受 GIL 限制，用进程池并行，按输入顺序返回
+    # 相同的表达式只计算一次；workers 为 1、表达式较少或当前为守护进程（不能创建子进程）时串行计算，此时不限时
+    exprs = [sp.sympify(expr) for expr in exprs]
+    unique = list(dict.fromkeys(exprs))
+    workers = min(workers or os.cpu_count() or 1, len(unique))
+    results = None
+    if workers > 1 and len(unique) >= PARALLEL_MIN_EXPRS and not mp.current_process().daemon:
+        results = inverse_laplace_parallel(unique, s, t, workers, timeout, progress)
+    if results is None:
+        results = []
+        for expr in unique:
+            results.append(inverse_laplace(expr, s, t))
+            if progress is not None:
+                progress(len(results) / len(unique))
+    by_expr = dict(zip(unique, results))
+    return [by_expr[expr] for expr in exprs]
@@ -0,0 +1,53 @@
+# 后台任务：目标函数在独立进程中运行，通过消息队列发送进度，最后发送 ('result', ...) 或 ('error', 信息)
+# 界面进程只轮询消息队列，取消时直接终止进程，不必等当前的计算结束
+from log_config import logger
+
+import multiprocessing as mp
+import queue
+
+# 取消时等待任务进程（及其创建的进程池）退出的时间/s，超时则强制结束
+CANCEL_TIMEOUT = 2.0
+
+
+def exit_on_terminate(signum, frame):
+    # 把 SIGTERM 转为 SystemExit，使任务进程中的进程池随 with 语句一起终止，不留下孤儿进程
+    raise SystemExit(1)
+
+
+class BackgroundJob:
+    # target(*args, messages) 为任务进程入口，应先调用 signal.signal(signal.SIGTERM, exit_on_terminate)
+    def __init__(self, target, *args):
+        self.messages = mp.Queue()
+        # 不设为守护进程：守护进程不能创建进程池
+        self.process = mp.Process(target=target, args=(*args, self.messages))
+        self.finished = False
+
+    def start(self):
+        self.process.start()
+
+    def poll(self) -> list[tuple]:
+        # 不阻塞地取出目前已到达的消息；进程意外退出（如被系统终止）时补一条错误消息
+        # 先检查进程是否存活再取消息：进程退出前已把消息全部写入管道
+        alive = self.process.is_alive()
+        received = []
+        while True:
+            try:
+                received.append(self.messages.get_nowait())
+            except queue.Empty:
+                break
+        if any(message[0] in ('result', 'error') for message in received):
+            self.finished = True
+        elif not self.finished and not alive:
+            self.finished = True
+            received.append(('error', '后台进程意外退出（退出码 {}）'.format(self.process.exitcode)))
+        return received
+
+    def cancel(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(CANCEL_TIMEOUT)
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.finished = True
+        logger.info('已取消后台任务')
@@ -0,0 +1,226 @@
+from log_config import logger
+from .Netlist import Netlist, GND
+from .NumericEngine import stamp_MNA_sparse, element_admittance, normalize_s, SingularCircuitError
+from .Jobs import BackgroundJob, exit_on_terminate
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing as mp
+import os
+import signal
+import numpy as np
+import scipy.sparse as sps
+import scipy.sparse.linalg as spla
+
+DISTRIBUTIONS = ('uniform', 'normal')
+DEFAULT_CHUNK_SIZE = 256
+# 阶数不超过该值时用批量稠密求解，否则逐个样本稀疏 LU
+DENSE_BATCH_MAX_SIZE = 200
+
+
+class Tolerance:
+    # uniform：在 ±tol 内均匀分布；normal：tol 视为 3σ 的正态分布
+    def __init__(self, tol: float = 0.05, distribution: str = 'uniform'):
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError('未知的分布：{}'.format(distribution))
+        self.tol = tol
+        self.distribution = distribution
+
+    def sample(self, rng: np.random.Generator, nominal: float, num: int) -> np.ndarray:
+        if self.distribution == 'uniform':
+            factor = rng.uniform(1 - self.tol, 1 + self.tol, num)
+        else:
+            factor = rng.normal(1, self.tol / 3, num)
+        return nominal * factor
+
+
+class StampMap:
+    # 把可变元件的导纳映射到 CSC 矩阵的 data 数组：data = data_fixed + S @ Y
+    def __init__(self, netlist: Netlist, element_index: list[int], s: complex | None = None):
+        self.s, self.dtype = normalize_s(s)
+        # 固定部分为去掉可变元件后的矩阵，稀疏结构取固定部分与各可变元件单位印记的并集
+        A_fixed, self.b = stamp_MNA_sparse(self.remove(netlist, element_index), self.s)
+        self.size = A_fixed.shape[0]
+        columns = [self.stamp_unit(*netlist.elements[index][1:3]) for index in element_index]
+        pattern = (A_fixed != 0).astype(float)
+        for column in columns:
+            pattern = pattern + abs(column)
+        pattern = sps.csc_matrix(pattern)
+        pattern.sort_indices()
+        self.indptr, self.indices = pattern.indptr, pattern.indices
+        self.rows = self.indices
+        self.cols = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        position = {(r, c): k for k, (r, c) in enumerate(zip(self.rows, self.cols))}
+
+        self.data_fixed = np.zeros(len(self.rows), dtype=self.dtype)
+        A_fixed = A_fixed.tocoo()
+        for r, c, v in zip(A_fixed.row, A_fixed.col, A_fixed.data):
+            self.data_fixed[position[(r, c)]] += v
+        S_rows, S_cols, S_vals = [], [], []
+        for j, column in enumerate(columns):
+            column = column.tocoo()
+            for r, c, v in zip(column.row, column.col, column.data):
+                S_rows.append(position[(r, c)])
+                S_cols.append(j)
+                S_vals.append(v)
+        self.S = sps.csr_matrix((S_vals, (S_rows, S_cols)), shape=(len(self.rows), len(columns)))
+
+    @staticmethod
+    def remove(netlist: Netlist, element_index: list[int]) -> Netlist:
+        removed = Netlist(netlist.num_nodes)
+        skip = set(element_index)
+        for k, element in enumerate(netlist.elements):
+            if k not in skip:
+                removed.add(*element)
+        removed.instances = list(netlist.instances)
+        return removed
+
+    def stamp_unit(self, n1: int, n2: int) -> sps.coo_matrix:
+        rows, cols, vals = [], [], []
+        for a, sign_a in ((n1, 1), (n2, -1)):
+            for b, sign_b in ((n1, 1), (n2, -1)):
+                if a != GND and b != GND:
+                    rows.append(a)
+                    cols.append(b)
+                    vals.append(sign_a * sign_b)
+        return sps.coo_matrix((vals, (rows, cols)), shape=(self.size, self.size))
+
+    def solve_batch(self, Y: np.ndarray) -> np.ndarray:
+        # Y: (样本数, 可变元件数) 的导纳，返回 (样本数, 阶数) 的解
+        data = self.data_fixed[None] + (self.S @ Y.T).T
+        if self.size <= DENSE_BATCH_MAX_SIZE:
+            A = np.zeros((len(Y), self.size, self.size), dtype=self.dtype)
+            A[:, self.rows, self.cols] = data
+            try:
+                return np.linalg.solve(A, np.broadcast_to(self.b, (len(Y), self.size))[:, :, None])[:, :, 0]
+            except np.linalg.LinAlgError as e:
+                raise SingularCircuitError() from e
+        x = np.empty((len(Y), self.size), dtype=self.dtype)
+        for p in range(len(Y)):
+            A = sps.csc_matrix((data[p], self.indices, self.indptr), shape=(self.size, self.size))
+            try:
+                x[p] = spla.splu(A).solve(self.b)
+            except RuntimeError as e:
+                raise SingularCircuitError() from e
+        return x
+
+
+class MonteCarloStats:
+    # 随着分块结果到达不断累积的样本统计
+    def __init__(self, num_outputs: int):
+        self.samples = np.zeros((0, num_outputs))
+
+    def add(self, samples: np.ndarray):
+        self.samples = np.vstack((self.samples, samples))
+
+    def __len__(self):
+        return len(self.samples)
+
+    def mean(self) -> np.ndarray:
+        return self.samples.mean(axis=0)
+
+    def std(self) -> np.ndarray:
+        return self.samples.std(axis=0)
+
+    def percentiles(self, q=(1, 5, 50, 95, 99)) -> np.ndarray:
+        # (len(q), 输出数)
+        return np.percentile(self.samples, q, axis=0)
+
+    def histogram(self, output: int, bins: int = 50) -> tuple[np.ndarray, np.ndarray]:
+        return np.histogram(self.samples[:, output], bins=bins)
+
+    def yield_ratio(self, low: np.ndarray, high: np.ndarray) -> float:
+        # 所有输出都落在 [low, high] 内的样本比例
+        inside = np.all((self.samples >= low) & (self.samples <= high), axis=1)
+        return float(inside.mean()) if len(inside) else 0.0
+
+
+# 工作进程中的求解上下文，由 init_worker 设置，避免每个任务重复传输网表与构建映射
+_worker_context = None
+
+
+def init_worker(netlist: Netlist, tolerances: dict[int, Tolerance], outputs: list[int], s):
+    global _worker_context
+    element_index = list(tolerances)
+    stamp_map = StampMap(netlist, element_index, s)
+    _worker_context = (netlist, tolerances, element_index, outputs, stamp_map)
+
+
+def run_chunk(seed: int, num: int) -> np.ndarray:
+    netlist, tolerances, element_index, outputs, stamp_map = _worker_context
+    rng = np.random.default_rng(seed)
+    Y = np.empty((num, len(element_index)), dtype=stamp_map.dtype)
+    for j, index in enumerate(element_index):
+        kind, _, _, nominal = netlist.elements[index]
+        Y[:, j] = element_admittance(kind, tolerances[index].sample(rng, nominal, num), stamp_map.s)
+    x = stamp_map.solve_batch(Y)
+    result = x[:, outputs]
+    return np.abs(result) if np.iscomplexobj(result) else result
+
+
+def default_tolerances(netlist: Netlist, tolerance: Tolerance, s=None) -> dict[int, Tolerance]:
+    # 对所有在该频率下有导纳的电阻、电容、电感使用同一容差
+    s, _ = normalize_s(s)
+    return {k: tolerance for k, (kind, _, _, value) in enumerate(netlist.elements)
+            if kind in ('R', 'C', 'L') and element_admittance(kind, value, s) is not None}
+
+
+def run_monte_carlo(netlist: Netlist, outputs: list[int], num_samples: int,
+                    tolerances: dict[int, Tolerance] | None = None, s: complex | None = None,
+                    workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    seed: int | None = None, callback=None) -> MonteCarloStats:
+    # 对每个元件按各自的分布抽样，分块批量求解选定节点的电位（复数结果取模）
+    # workers 为 1 时在当前进程串行计算；每完成一块调用 callback(stats) 报告部分统计
+    # 直流时电容、电感的数值不影响结果，不参与抽样
+    active = default_tolerances(netlist, Tolerance(), s)
+    tolerances = active if tolerances is None else {k: v for k, v in tolerances.items() if k in active}
+    workers = workers or os.cpu_count() or 1
+    chunks = [min(chunk_size, num_samples - start) for start in range(0, num_samples, chunk_size)]
+    seeds = np.random.SeedSequence(seed).generate_state(len(chunks))
+    stats = MonteCarloStats(len(outputs))
+    logger.info('蒙特卡洛分析：{}个样本，{}个可变元件，{}个进程'.format(
+        num_samples, len(tolerances), workers))
+
+    if workers == 1:
+        init_worker(netlist, tolerances, outputs, s)
+        for chunk_seed, num in zip(seeds, chunks):
+            stats.add(run_chunk(int(chunk_seed), num))
+            if callback is not None:
+                callback(stats)
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(netlist, tolerances, outputs, s)) as executor:
+        futures = [executor.submit(run_chunk, int(chunk_seed), num)
+                   for chunk_seed, num in zip(seeds, chunks)]
+        for future in as_completed(futures):
+            stats.add(future.result())
+            if callback is not None:
+                callback(stats)
+    return stats
+
+
+def run_monte_carlo_job(netlist: Netlist, outputs: list[int], num_samples: int,
+                        tolerances: dict[int, Tolerance] | None, s, messages: mp.Queue):
+    # 后台进程入口：每完成一块发送 ('samples', 该块的样本)，最后发送 ('result',) 或 ('error', 信息)
+    signal.signal(signal.SIGTERM, exit_on_terminate)
+    sent = 0
+
+    def report(stats: MonteCarloStats):
+        nonlocal sent
+        messages.put(('samples', stats.samples[sent:]))
+        sent = len(stats)
+
+    try:
+        run_monte_carlo(netlist, outputs, num_samples, tolerances, s, callback=report)
+    except Exception as e:
+        logger.error('蒙特卡洛分析失败：{}'.format(e))
+        messages.put(('error', str(e)))
+        return
+    messages.put(('result',))
+
+
+class MonteCarloJob(BackgroundJob):
+    # 在后台进程中运行 run_monte_carlo（其中再由进程池并行），调用方轮询各块样本自行累积统计
+    def __init__(self, netlist: Netlist, outputs: list[int], num_samples: int,
+                 tolerances: dict[int, Tolerance] | None = None, s: complex | None = None):
+        super().__init__(run_monte_carlo_job, netlist, outputs, num_samples, tolerances, s)
@@ -0,0 +1,133 @@
+# 与 Qt 无关的电路描述，供数值求解引擎使用
+# 节点编号 0..num_nodes-1 为非地节点，GND 统一编号为 -1
+from array import array
+
+import numpy as np
+
+GND = -1
+
+# 新增的元件类型由 Stamps.register_stamp 追加（见 register_kind），其他模块引用的是同一个列表与字典
+ELEMENT_KINDS = ['R', 'C', 'L', 'V', 'I']
+KIND_CODES = {kind: code for code, kind in enumerate(ELEMENT_KINDS)}
+# 类型编号存放在有符号字节数组中
+MAX_KINDS = 128
+
+
+def register_kind(kind: str) -> int:
+    # 返回元件类型的编号，未知的类型分配下一个编号
+    if kind not in KIND_CODES:
+        if not isinstance(kind, str) or not kind:
+            raise ValueError('元件类型应为非空字符串：{!r}'.format(kind))
+        if len(ELEMENT_KINDS) >= MAX_KINDS:
+            raise ValueError('元件类型不能超过{}种'.format(MAX_KINDS))
+        KIND_CODES[kind] = len(ELEMENT_KINDS)
+        ELEMENT_KINDS.append(kind)
+    return KIND_CODES[kind]
+
+
+class ElementTable:
+    # netlist.elements 的只读视图，按 (类型, 节点1, 节点2, 数值) 元组访问
+    __slots__ = ('netlist',)
+
+    def __init__(self, netlist: 'Netlist'):
+        self.netlist = netlist
+
+    def __len__(self):
+        return len(self.netlist.kinds)
+
+    def __getitem__(self, index: int) -> tuple[str, int, int, float]:
+        netlist = self.netlist
+        return ELEMENT_KINDS[netlist.kinds[index]], netlist.n1[index], netlist.n2[index], netlist.values[index]
+
+    def __iter__(self):
+        netlist = self.netlist
+        return zip(map(ELEMENT_KINDS.__getitem__, netlist.kinds), netlist.n1, netlist.n2, netlist.values)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+
+class Netlist:
+    # 元件按列存储在紧凑数组中（每个元件 17 字节）：类型编号、两端节点编号、数值
+    # instances 为子电路实例（子电路定义, 各端口连接的节点），见 Subcircuits.py
+    __slots__ = ('num_nodes', 'kinds', 'n1', 'n2', 'values', 'instances')
+    num_nodes: int
+    kinds: array
+    n1: array
+    n2: array
+    values: array
+    instances: list
+
+    def __init__(self, num_nodes: int):
+        self.num_nodes = num_nodes
+        self.kinds = array('b')
+        self.n1 = array('i')
+        self.n2 = array('i')
+        self.values = array('d')
+        self.instances = []
+
+    @property
+    def elements(self) -> ElementTable:
+        return ElementTable(self)
+
+    def add(self, kind: str, n1: int, n2: int, value: float) -> int:
+        if kind not in KIND_CODES:
+            raise ValueError('未知的元件类型：{}'.format(kind))
+        self.kinds.append(KIND_CODES[kind])
+        self.n1.append(n1)
+        self.n2.append(n2)
+        self.values.append(value)
+        return len(self.kinds) - 1
+
+    def addInstance(self, subcircuit, nodes) -> int:
+        nodes = tuple(int(node) for node in nodes)
+        if len(nodes) != len(subcircuit.ports):
+            raise ValueError('子电路 {} 有{}个端口，实例连接了{}个节点'.format(
+                subcircuit.name, len(subcircuit.ports), len(nodes)))
+        self.instances.append((subcircuit, nodes))
+        return len(self.instances) - 1
+
+    def copy(self) -> 'Netlist':
+        netlist = Netlist(self.num_nodes)
+        netlist.kinds = array('b', self.kinds)
+        netlist.n1 = array('i', self.n1)
+        netlist.n2 = array('i', self.n2)
+        netlist.values = array('d', self.values)
+        netlist.instances = list(self.instances)
+        return netlist
+
+    def setValue(self, index: int, value: float):
+        self.values[index] = value
+
+    def getArrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # 不复制数据的 numpy 视图：类型编号、节点1、节点2、数值
+        # 视图存在期间不能再添加元件（array 导出缓冲区时不能改变长度），应随用随取
+        return (np.frombuffer(self.kinds, dtype=np.int8), np.frombuffer(self.n1, dtype=np.int32),
+                np.frombuffer(self.n2, dtype=np.int32), np.frombuffer(self.values, dtype=np.float64))
+
+    def getIndexOfKind(self, kind: str) -> np.ndarray:
+        return np.flatnonzero(np.frombuffer(self.kinds, dtype=np.int8) == KIND_CODES[kind])
+
+    def getElementsOfKind(self, kind: str) -> list[tuple[int, int, float]]:
+        code = KIND_CODES[kind]
+        return [(n1, n2, value) for k, n1, n2, value in zip(self.kinds, self.n1, self.n2, self.values) if k == code]
+
+    def getVoltageSourcesNum(self) -> int:
+        return self.kinds.count(KIND_CODES['V'])
+
+    def getInductorsNum(self) -> int:
+        return self.kinds.count(KIND_CODES['L'])
+
+    def getMemorySize(self) -> int:
+        # 元件表占用的字节数
+        return sum(a.itemsize * len(a) for a in (self.kinds, self.n1, self.n2, self.values))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __str__(self):
+        lines = ['{}{} {} {} {}'.format(kind, i, n1, n2, value)
+                 for i, (kind, n1, n2, value) in enumerate(self.elements)]
+        lines += ['X{} {} {}'.format(i, ' '.join(map(str, nodes)), subcircuit.name)
+                  for i, (subcircuit, nodes) in enumerate(self.instances)]
+        return '网表（{}个节点）：\n{}'.format(self.num_nodes, '\n'.join(lines))
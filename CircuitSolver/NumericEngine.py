@@ -0,0 +1,102 @@
+from log_config import logger
+from .Netlist import Netlist, GND
+from .Ordering import get_ordering
+from .Stamps import STAMPS, get_branch_elements, stamp_MNA_triplets, stamp_MNA_sources
+
+import numpy as np
+import scipy.sparse as sps
+import scipy.sparse.linalg as spla
+
+
+class SingularCircuitError(Exception):
+    def __init__(self):
+        super().__init__('电路方程奇异，请检查是否存在悬空节点或电压源回路')
+
+
+def get_MNA_size(netlist: Netlist, s: complex | None = None) -> int:
+    # 直流时电感作为 0V 支路，需要额外的支路电流未知量
+    return netlist.num_nodes + len(get_branch_elements(netlist, s))
+
+
+def normalize_s(s: complex | None) -> tuple[complex | float | None, type]:
+    # 实数频率按实数矩阵处理
+    if s is not None and np.imag(s) == 0:
+        s = float(np.real(s))
+    dtype = np.float64 if s is None or isinstance(s, float) else np.complex128
+    return s, dtype
+
+
+def element_admittance(kind: str, value, s: complex | None = None):
+    # 二端元件在 s 处的导纳（value 可为数组）；直流时电容开路、电感为支路以及电源（均不写入 G 分块），返回 None
+    return STAMPS[kind].getAdmittance(value, s)
+
+
+def stamp_MNA_rhs(netlist: Netlist, s: complex | None = None) -> np.ndarray:
+    # I_s 与 E 分块
+    s, dtype = normalize_s(s)
+    return stamp_MNA_sources(netlist, s, 1 if s is None else 1 / s, dtype)
+
+
+def stamp_MNA_sparse(netlist: Netlist, s: complex | None = None) -> tuple[sps.csc_matrix, np.ndarray]:
+    # s 为 None 时构建直流（s→0）方程：电容开路，电感视为 0V 支路，电源取原值
+    # 否则在给定复频率 s 处构建与符号引擎相同的 G/B/D/I_s/E 分块，电源为阶跃（值/s）
+    # 各元件的贡献由 Stamps.py 中注册的印记给出，一次生成全部 COO 三元组后转换为 CSC（重复位置相加）
+    s, dtype = normalize_s(s)
+    rows, cols, vals, size = stamp_MNA_triplets(netlist, s)
+    A = sps.coo_matrix((vals.astype(dtype), (rows, cols)), shape=(size, size)).tocsc()
+    return A, stamp_MNA_rhs(netlist, s)
+
+
+def incidence_matrix(pairs: list[tuple[int, int]], size: int) -> sps.csr_matrix:
+    # 每行对应一个二端元件，P @ x 得到元件两端电压 v(n1) - v(n2)
+    rows, cols, vals = [], [], []
+    for k, (n1, n2) in enumerate(pairs):
+        for node, sign in ((n1, 1.0), (n2, -1.0)):
+            if node != GND:
+                rows.append(k)
+                cols.append(node)
+                vals.append(sign)
+    return sps.csr_matrix((vals, (rows, cols)), shape=(len(pairs), size))
+
+
+class PermutedLU:
+    # 对称置换 P A P^T 的 LU 分解，solve 接收、返回原未知量顺序的向量（或按列排列的矩阵）
+    def __init__(self, lu: spla.SuperLU, perm: np.ndarray):
+        self.lu = lu
+        self.perm = perm
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        y = self.lu.solve(np.asarray(b)[self.perm])
+        x = np.empty_like(y)
+        x[self.perm] = y
+        return x
+
+
+def factor_MNA(A: sps.csc_matrix, ordering: str | None = None) -> spla.SuperLU | PermutedLU:
+    # ordering 为 None 时由 SuperLU 自行按 COLAMD 排序；否则先按 Ordering.py 的消元顺序对称置换再分解
+    # 排序本身有开销，适合一次分解、多次回代的场合
+    try:
+        if ordering is None:
+            return spla.splu(A)
+        perm = get_ordering(A, ordering)
+        return PermutedLU(spla.splu(A[perm][:, perm].tocsc(), permc_spec='NATURAL'), perm)
+    except RuntimeError as e:
+        raise SingularCircuitError() from e
+
+
+def check_solution(x: np.ndarray) -> np.ndarray:
+    if not np.all(np.isfinite(x)):
+        raise SingularCircuitError()
+    return x
+
+
+def solve_MNA_sparse(A: sps.csc_matrix, b: np.ndarray, ordering: str | None = None) -> np.ndarray:
+    if A.shape[0] == 0:
+        return np.zeros(0, dtype=b.dtype)
+    return check_solution(factor_MNA(A, ordering).solve(b))
+
+
+def solve_numeric(netlist: Netlist, s: complex | None = None, ordering: str | None = None) -> np.ndarray:
+    A, b = stamp_MNA_sparse(netlist, s)
+    logger.info('数值MNA矩阵：{}阶，{}个非零元'.format(A.shape[0], A.nnz))
+    return solve_MNA_sparse(A, b, ordering)
@@ -0,0 +1,75 @@
+# MNA 方程的填充缩减排序：在 A + A^T 的非零模式上求消元顺序
+# 未知量按元件编号排列，与电路结构无关，直接按该顺序消元会产生大量填充
+import heapq
+
+import numpy as np
+import scipy.sparse as sps
+from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+ORDERINGS = ('natural', 'rcm', 'mindegree')
+
+
+def symmetric_pattern(A: sps.spmatrix) -> sps.csr_matrix:
+    pattern = sps.csr_matrix(A, dtype=bool)
+    return (pattern + pattern.T).tocsr()
+
+
+def pattern_from_rows(rows: dict[int, dict], n: int) -> sps.csr_matrix:
+    # 由 {行: {列: 值}} 形式的稀疏矩阵（如 DomainMatrix.to_sdm()）得到非零模式
+    row_index = [i for i, row in rows.items() for j in row if j < n]
+    col_index = [j for row in rows.values() for j in row if j < n]
+    return symmetric_pattern(sps.coo_matrix((np.ones(len(row_index), dtype=bool), (row_index, col_index)),
+                                            shape=(n, n)))
+
+
+def elimination_graph(pattern: sps.csr_matrix) -> list[set]:
+    n = pattern.shape[0]
+    return [set(pattern.indices[pattern.indptr[i]:pattern.indptr[i + 1]].tolist()) - {i} for i in range(n)]
+
+
+def eliminate(adjacency: list[set], v: int) -> set:
+    # 消去 v：v 的邻居两两相连（填充），返回这些邻居
+    neighbors = adjacency[v]
+    for u in neighbors:
+        adjacency[u] |= neighbors
+        adjacency[u].discard(u)
+        adjacency[u].discard(v)
+    adjacency[v] = set()
+    return neighbors
+
+
+def minimum_degree_order(pattern: sps.csr_matrix) -> np.ndarray:
+    # 每次消去当前度数最小的顶点（度数相同时取编号小的），堆中过期的度数延迟丢弃
+    adjacency = elimination_graph(pattern)
+    heap = [(len(adj), v) for v, adj in enumerate(adjacency)]
+    heapq.heapify(heap)
+    eliminated = np.zeros(len(adjacency), dtype=bool)
+    order = []
+    while heap:
+        degree, v = heapq.heappop(heap)
+        if eliminated[v] or degree != len(adjacency[v]):
+            continue
+        eliminated[v] = True
+        order.append(v)
+        for u in eliminate(adjacency, v):
+            heapq.heappush(heap, (len(adjacency[u]), u))
+    return np.array(order, dtype=int)
+
+
+def get_ordering(pattern: sps.spmatrix, method: str = 'mindegree') -> np.ndarray:
+    # 返回消元顺序 order，order[k] 为第 k 个消去的未知量
+    if method not in ORDERINGS:
+        raise ValueError('未知的排序方法：{}'.format(method))
+    n = pattern.shape[0]
+    if method == 'natural' or n == 0:
+        return np.arange(n)
+    pattern = symmetric_pattern(pattern)
+    if method == 'rcm':
+        return np.asarray(reverse_cuthill_mckee(pattern, symmetric_mode=True), dtype=int)
+    return minimum_degree_order(pattern)
+
+
+def count_factor_nonzeros(pattern: sps.spmatrix, order: np.ndarray) -> int:
+    # 按 order 做符号消元，返回 Cholesky 因子 L 的非零元数（含对角），用于比较不同排序的填充量
+    adjacency = elimination_graph(symmetric_pattern(pattern))
+    return sum(len(eliminate(adjacency, v)) + 1 for v in order)
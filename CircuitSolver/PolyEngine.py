@@ -0,0 +1,410 @@
+from .Netlist import Netlist, GND
+from .NumericEngine import SingularCircuitError
+from .Ordering import get_ordering, pattern_from_rows
+from .Components import Component, split_components, solve_components, map_components, merge_solutions
+from .Subcircuits import get_port_model, count_instance_ports
+from .Stamps import STAMPS
+
+from array import array
+from functools import partial
+import numpy as np
+import sympy as sp
+from sympy.polys.matrices import DomainMatrix
+
+
+# 符号消元的默认顺序。符号求解的耗时主要在回代时有理函数的约分（多项式 gcd），
+# 与填充量关系不大：最小度、RCM 排序对网格电路有利，对梯形电路反而更慢（见 benchmarks/bench_ordering.py）
+SYMBOLIC_ORDERING = 'natural'
+
+
+def to_rational(value) -> sp.Rational:
+    # 用十进制字符串转换，避免 0.1 之类的浮点数产生巨大的二进制分母
+    return sp.Rational(str(value))
+
+
+def stamp_MNA_poly(netlist: Netlist, s: sp.Symbol) -> tuple[DomainMatrix, DomainMatrix]:
+    # 在多项式环 QQ[s] 上构建 MNA 方程 A(s) x = b0 / s
+    # 电感以支路电流为未知量（V1 - V2 - sL * I_L = 0），使 A 的元素均为多项式
+    # 电源均为阶跃，统一提出 1/s 因子，b0 为多项式（没有子电路实例时为常数），见 stamp_MNA_poly_rhs
+    R = sp.QQ[s]
+    num_nodes = netlist.num_nodes
+    num_branches = netlist.getVoltageSourcesNum() + netlist.getInductorsNum() + count_instance_ports(netlist)
+    size = num_nodes + num_branches
+    s_elem = R.gens[0]
+
+    A = {}
+
+    def add(row: int, col: int, value):
+        row_dict = A.setdefault(row, {})
+        value = row_dict.get(col, R.zero) + value
+        if value:
+            row_dict[col] = value
+        else:
+            row_dict.pop(col, None)
+
+    def stamp_admittance(n1: int, n2: int, Y):
+        if n1 != GND:
+            add(n1, n1, Y)
+        if n2 != GND:
+            add(n2, n2, Y)
+        if n1 != GND and n2 != GND:
+            add(n1, n2, -Y)
+            add(n2, n1, -Y)
+
+    def stamp_branch(n1: int, n2: int, k: int):
+        if n1 != GND:
+            add(n1, k, R.one)
+            add(k, n1, R.one)
+        if n2 != GND:
+            add(n2, k, -R.one)
+            add(k, n2, -R.one)
+
+    for kind, n1, n2, value in netlist.elements:
+        value = R.convert(to_rational(value))
+        if kind == 'R':
+            stamp_admittance(n1, n2, 1 / value)
+        elif kind == 'C':
+            stamp_admittance(n1, n2, s_elem * value)
+        elif kind not in ('V', 'L', 'I'):
+            # 注册的其他元件类型按其印记的导纳写入
+            stamp = STAMPS[kind]
+            if stamp.branch is not None:
+                raise ValueError('符号引擎不支持以支路电流为未知量的元件类型：{}'.format(kind))
+            Y = stamp.getAdmittance(value, s_elem)
+            if Y is not None:
+                stamp_admittance(n1, n2, R.convert(Y))
+
+    # 支路顺序与数值引擎一致：电压源在前，电感在后
+    k = num_nodes
+    for n1, n2, value in netlist.getElementsOfKind('V'):
+        stamp_branch(n1, n2, k)
+        k += 1
+    for n1, n2, value in netlist.getElementsOfKind('L'):
+        stamp_branch(n1, n2, k)
+        add(k, k, -s_elem * R.convert(to_rational(value)))
+        k += 1
+    # 子电路实例以流入各端口的电流为未知量，端口方程两边乘以公分母：den * I - Y V = -J
+    for subcircuit, nodes in netlist.instances:
+        model = get_port_model(subcircuit, s)
+        for i, node in enumerate(nodes):
+            if node != GND:
+                add(node, k + i, R.one)
+            add(k + i, k + i, model.den)
+            for j, other in enumerate(nodes):
+                if other != GND and model.Y[i][j]:
+                    add(k + i, other, -model.Y[i][j])
+        k += len(nodes)
+
+    A = DomainMatrix({row: cols for row, cols in A.items() if cols}, (size, size), R)
+    return A, stamp_MNA_poly_rhs(netlist, s)
+
+
+def stamp_MNA_poly_rhs(netlist: Netlist, s: sp.Symbol) -> DomainMatrix:
+    # 只构建右端项 b0：电流源写入节点行，电压源写入对应的支路行，子电路实例的内部电源写入端口行
+    # 电源数值改变后重新求解时只需重建这一部分（见 PolyFactorization）
+    R = sp.QQ[s]
+    num_nodes = netlist.num_nodes
+    size = num_nodes + netlist.getVoltageSourcesNum() + netlist.getInductorsNum() + count_instance_ports(netlist)
+    b0 = {}
+
+    def add_rhs(row: int, value):
+        value = b0.get(row, {}).get(0, R.zero) + value
+        b0[row] = {0: value} if value else {}
+
+    for kind in [kind for kind, stamp in STAMPS.items() if stamp.source == 'I']:
+        for n1, n2, value in netlist.getElementsOfKind(kind):
+            value = R.convert(to_rational(value))
+            if n1 != GND:
+                add_rhs(n1, value)
+            if n2 != GND:
+                add_rhs(n2, -value)
+    k = num_nodes
+    for n1, n2, value in netlist.getElementsOfKind('V'):
+        add_rhs(k, R.convert(to_rational(value)))
+        k += 1
+    k += netlist.getInductorsNum()
+    for subcircuit, nodes in netlist.instances:
+        model = get_port_model(subcircuit, s)
+        for i in range(len(nodes)):
+            add_rhs(k + i, -model.J[i])
+        k += len(nodes)
+    return DomainMatrix({row: cols for row, cols in b0.items() if cols}, (size, 1), R)
+
+
+def clear_row_denoms(A: DomainMatrix, b: DomainMatrix) -> tuple[list[dict], object, list[int]]:
+    # 逐行乘以分母的最小公倍数，把 QQ[s] 上的增广矩阵转换到 ZZ[s] 上（b 的各列依次排在第 n 列之后）
+    # 同时返回各行所乘的数
+    n = A.shape[0]
+    R = sp.ZZ[A.domain.symbols]
+    A_rows, b_rows = A.to_sdm(), b.to_sdm()
+    rows = []
+    dens = []
+    for i in range(n):
+        row = dict(A_rows.get(i, {}))
+        for c, rhs in b_rows.get(i, {}).items():
+            if rhs:
+                row[n + c] = rhs
+        den = 1
+        for value in row.values():
+            value_den, _ = value.clear_denoms()
+            den = sp.ilcm(den, int(value_den))
+        rows.append({j: R.convert_from(value * den, A.domain) for j, value in row.items()})
+        dens.append(int(den))
+    return rows, R, dens
+
+
+def row_content(row: dict, R):
+    # 整行的公因式（首项系数为正），空行为 1
+    g = R.zero
+    for value in row.values():
+        g = R.gcd(g, value)
+        if g == R.one:
+            return g
+    if not g:
+        return R.one
+    return -g if R.domain.is_negative(g.LC) else g
+
+
+def divide_row(row: dict, g, R) -> dict:
+    if g == R.one:
+        return row
+    return {j: R.exquo(value, g) for j, value in row.items()}
+
+
+def make_primitive(row: dict, R) -> dict:
+    # 除去整行的公因式，控制消元过程中系数与次数的增长
+    return divide_row(row, row_content(row, R), R)
+
+
+def eliminate(rows: dict[int, dict], R, n: int, order, progress=None, ops: list | None = None) -> list[tuple]:
+    # 对 rows 做无分数消元（见 fraction_free_solve），返回按消元顺序排列的 (列, 主元行号, 主元行)
+    # ops 不为 None 时依次记录每次行运算 (行号, 主元行号, p, a, 公因式)：row_i = (p * row_i - a * row_k) / 公因式
+    col_rows = {}
+    for i, row in rows.items():
+        for j in row:
+            col_rows.setdefault(j, set()).add(i)
+
+    pivots = []
+    for k in order:
+        candidates = col_rows.get(k)
+        if not candidates:
+            raise SingularCircuitError()
+        pivot = min(candidates, key=lambda i: (len(rows[i]), rows[i][k].degree(), i))
+        pivot_row = rows.pop(pivot)
+        for j in pivot_row:
+            col_rows[j].discard(pivot)
+        p = pivot_row[k]
+        for i in list(col_rows[k]):
+            row = rows[i]
+            g = R.gcd(p, row[k])
+            p_scale, a_scale = R.exquo(p, g), R.exquo(row[k], g)
+            new_row = {j: p_scale * value for j, value in row.items()}
+            for j, value in pivot_row.items():
+                new_value = new_row.get(j, R.zero) - a_scale * value
+                if new_value:
+                    if j not in new_row:
+                        col_rows[j].add(i)
+                    new_row[j] = new_value
+                elif j in new_row:
+                    del new_row[j]
+                    col_rows[j].discard(i)
+            content = row_content(new_row, R)
+            rows[i] = divide_row(new_row, content, R)
+            if ops is not None:
+                ops.append((i, pivot, p_scale, a_scale, content))
+        pivots.append((k, pivot, pivot_row))
+        if progress is not None:
+            progress(len(pivots) / n)
+    return pivots
+
+
+def fraction_free_solve(A: DomainMatrix, b: DomainMatrix, progress=None, order=None) -> list:
+    # 稀疏无分数消元：行运算只在 ZZ[s] 中进行（row_i = p * row_i - a * row_k 再取本原部分），
+    # 按 order 给出的顺序消去各列（默认自然顺序），每列选取非零元最少、次数最低的行作主元，
+    # 最后在分式域 ZZ(s) 中回代，解仍按原未知量顺序返回
+    # progress(fraction) 在每消去一列后报告进度
+    return fraction_free_solve_many(A, b, progress, order)[0]
+
+
+def fraction_free_solve_many(A: DomainMatrix, b: DomainMatrix, progress=None, order=None) -> list[list]:
+    # 同 fraction_free_solve，b 的每一列为一个右端项，只消元一次，返回各列的解
+    n = A.shape[0]
+    order = range(n) if order is None else order
+    rows, R, _ = clear_row_denoms(A, b)
+    rows = {i: make_primitive(row, R) for i, row in enumerate(rows)}
+    pivots = eliminate(rows, R, n, order, progress)
+
+    K = R.get_field()
+    solutions = []
+    for c in range(b.shape[1]):
+        x = [K.zero] * n
+        for k, _, pivot_row in reversed(pivots):
+            acc = K.convert(pivot_row.get(n + c, R.zero))
+            for j, value in pivot_row.items():
+                if j != k and j < n:
+                    acc -= K.convert(value) * x[j]
+            x[k] = acc / K.convert(pivot_row[k])
+        solutions.append(x)
+    return solutions
+
+
+class EliminationRecord:
+    # A 的无分数消元过程：各行的初始缩放 (所乘的数, 除去的公因式)、依次的行运算与各主元行
+    # 换一个右端项时对它重放同样的行运算再回代，不必重新消元
+    __slots__ = ('size', 'ring', 'scales', 'ops', 'pivots')
+
+    def __init__(self, size: int, ring, scales: list[tuple], ops: list[tuple], pivots: list[tuple]):
+        self.size = size
+        self.ring = ring
+        self.scales = scales
+        self.ops = ops
+        self.pivots = pivots
+
+    def solve(self, b: DomainMatrix) -> list:
+        # 返回分式域 ZZ(s) 中的解；消元时的公因式不一定整除右端项，右端项的行运算在分式域中进行
+        R = self.ring
+        K = R.get_field()
+        rhs = {}
+        for i, cols in b.to_sdm().items():
+            if cols.get(0):
+                den, content = self.scales[i]
+                rhs[i] = K.convert_from(cols[0] * den, b.domain) / K.convert(content)
+        for i, pivot, p_scale, a_scale, content in self.ops:
+            if i not in rhs and pivot not in rhs:
+                continue
+            value = K.convert(p_scale) * rhs.get(i, K.zero) - K.convert(a_scale) * rhs.get(pivot, K.zero)
+            if value:
+                rhs[i] = value / K.convert(content)
+            else:
+                rhs.pop(i, None)
+        x = [K.zero] * self.size
+        for k, pivot, pivot_row in reversed(self.pivots):
+            acc = rhs.get(pivot, K.zero)
+            for j, value in pivot_row.items():
+                if j != k:
+                    acc -= K.convert(value) * x[j]
+            x[k] = acc / K.convert(pivot_row[k])
+        return x
+
+    def __getstate__(self):
+        # ZZ[s] 中的多项式不能直接序列化（送回界面进程时），转换为 {指数: 系数} 字典
+        return (self.size, self.ring.symbols, [(den, dict(content)) for den, content in self.scales],
+                [(i, pivot, dict(p), dict(a), dict(g)) for i, pivot, p, a, g in self.ops],
+                [(k, pivot, {j: dict(value) for j, value in row.items()}) for k, pivot, row in self.pivots])
+
+    def __setstate__(self, state):
+        self.size, symbols, scales, ops, pivots = state
+        self.ring = sp.ZZ[symbols]
+        poly = self.ring.ring.from_dict
+        self.scales = [(den, poly(content)) for den, content in scales]
+        self.ops = [(i, pivot, poly(p), poly(a), poly(g)) for i, pivot, p, a, g in ops]
+        self.pivots = [(k, pivot, {j: poly(value) for j, value in row.items()}) for k, pivot, row in pivots]
+
+
+def fraction_free_factor(A: DomainMatrix, progress=None, order=None) -> EliminationRecord:
+    # 同 fraction_free_solve 的消元，不带右端项，记录行运算供之后求解
+    n = A.shape[0]
+    order = range(n) if order is None else order
+    rows, R, dens = clear_row_denoms(A, DomainMatrix({}, (n, 0), A.domain))
+    contents = [row_content(row, R) for row in rows]
+    rows = {i: divide_row(row, content, R) for i, (row, content) in enumerate(zip(rows, contents))}
+    ops = []
+    pivots = eliminate(rows, R, n, order, progress, ops)
+    return EliminationRecord(n, R, list(zip(dens, contents)), ops, pivots)
+
+
+def divide_by_s(values: list) -> list[sp.Expr]:
+    # 分式域中的解除以 s（阶跃电源的 1/s 因子）并约分，转换为 sympy 表达式
+    solution = []
+    for value in values:
+        num, den = value.numer, value.denom * value.field.ring.gens[0]
+        num, den = num.cancel(den)
+        solution.append(num.as_expr() / den.as_expr())
+    return solution
+
+
+def solve_MNA_poly_whole(netlist: Netlist, s: sp.Symbol, progress=None,
+                         ordering: str = SYMBOLIC_ORDERING) -> list[sp.Expr]:
+    # 不拆分连通分量，整体构建并求解一个方程
+    # progress(stage, fraction) 报告 'stamping'、'solve' 两个阶段的进度
+    # ordering 为消元顺序（见 Ordering.py），在 A 的非零模式上计算
+    if progress is not None:
+        progress('stamping', 0.0)
+    A, b0 = stamp_MNA_poly(netlist, s)
+    if A.shape[0] == 0:
+        return []
+    order = get_ordering(pattern_from_rows(A.to_sdm(), A.shape[0]), ordering)
+    solve_progress = None if progress is None else lambda fraction: progress('solve', fraction)
+    if solve_progress is not None:
+        solve_progress(0.0)
+    return divide_by_s(fraction_free_solve(A, b0, solve_progress, order.tolist()))
+
+
+def solve_MNA_poly(netlist: Netlist, s: sp.Symbol, progress=None,
+                   ordering: str = SYMBOLIC_ORDERING, workers: int | None = None) -> list[sp.Expr]:
+    # 返回节点电位、电压源电流、电感电流（以及子电路实例的端口电流）的有理函数（s 域）
+    # 只经地相连的多个连通分量分别求解，workers 为并行的进程数（None 为 CPU 核数）
+    components = split_components(netlist)
+    if len(components) == 1:
+        return solve_MNA_poly_whole(netlist, s, progress, ordering)
+    if progress is not None:
+        progress('stamping', 0.0)
+    solve = partial(solve_MNA_poly_whole, s=s, ordering=ordering)
+    return solve_components(netlist, components, solve, None, workers,
+                            None if progress is None else lambda fraction: progress('solve', fraction))
+
+
+class PolyFactorization:
+    # 整个网表的消元记录，各连通分量分别记录；电源数值改变后只需重建右端项再求解（见 factor_MNA_poly）
+    __slots__ = ('components', 'records')
+
+    def __init__(self, components: list[Component], records: list[EliminationRecord]):
+        self.components = components
+        self.records = records
+
+    def solve(self, netlist: Netlist, s: sp.Symbol, progress=None) -> list[sp.Expr]:
+        # netlist 与消元时只能有电源数值的不同；progress(fraction) 按已求解的分量报告进度
+        values = np.frombuffer(netlist.values, dtype=np.float64)
+        solutions = []
+        for component, record in zip(self.components, self.records):
+            if len(self.components) == 1:
+                sub = netlist
+            else:
+                sub = component.netlist.copy()
+                sub.values = array('d', values[component.elements].tolist())
+            solutions.append(divide_by_s(record.solve(stamp_MNA_poly_rhs(sub, s))))
+            if progress is not None:
+                progress(len(solutions) / len(self.components))
+        if len(self.components) == 1:
+            return solutions[0]
+        return merge_solutions(netlist, self.components, solutions)
+
+
+def factor_MNA_poly_whole(netlist: Netlist, s: sp.Symbol, progress=None,
+                          ordering: str = SYMBOLIC_ORDERING) -> tuple[list[sp.Expr], EliminationRecord]:
+    # 同 solve_MNA_poly_whole，消元时不带右端项并保留消元记录
+    if progress is not None:
+        progress('stamping', 0.0)
+    A, b0 = stamp_MNA_poly(netlist, s)
+    order = get_ordering(pattern_from_rows(A.to_sdm(), A.shape[0]), ordering) if A.shape[0] else None
+    solve_progress = None if progress is None else lambda fraction: progress('solve', fraction)
+    if solve_progress is not None:
+        solve_progress(0.0)
+    record = fraction_free_factor(A, solve_progress, None if order is None else order.tolist())
+    return divide_by_s(record.solve(b0)), record
+
+
+def factor_MNA_poly(netlist: Netlist, s: sp.Symbol, progress=None, ordering: str = SYMBOLIC_ORDERING,
+                    workers: int | None = None) -> tuple[list[sp.Expr], PolyFactorization]:
+    # 同 solve_MNA_poly，并返回消元记录，之后修改电源数值时用 PolyFactorization.solve 只代入新的右端项
+    components = split_components(netlist)
+    if len(components) == 1:
+        solution, record = factor_MNA_poly_whole(netlist, s, progress, ordering)
+        return solution, PolyFactorization(components, [record])
+    if progress is not None:
+        progress('stamping', 0.0)
+    factor = partial(factor_MNA_poly_whole, s=s, ordering=ordering)
+    results = map_components(components, factor, None, workers,
+                             None if progress is None else lambda fraction: progress('solve', fraction))
+    solution = merge_solutions(netlist, components, [result[0] for result in results])
+    return solution, PolyFactorization(components, [result[1] for result in results])
@@ -0,0 +1,184 @@
+# 大规模 RLC 网络的模型降阶（PRIMA）：在展开点 s0 处构造 Krylov 子空间
+# span{M^-1 b, (M^-1 C) M^-1 b, ...}（M = G + s0 C），以其正交基 V 对 (G + sC) x = b 做合同变换，
+# 得到 q 阶模型 (V^T G V + s V^T C V) z = V^T b，x ≈ V z，匹配传递函数在 s0 处的前 q 阶矩
+# 支路方程（电压源、电感）整行取负后 C 半正定、G + G^T 半正定，合同变换保持无源性
+from log_config import logger
+from .Netlist import Netlist, GND
+from .NumericEngine import factor_MNA
+from .ACAnalysis import stamp_MNA_pencil, solve_dense, ac_analysis, ACResult
+from .TransientEngine import METHODS, TransientResult, initial_state, simulate_transient
+from .Subcircuits import flatten_netlist
+
+import time
+import numpy as np
+import scipy.linalg as sla
+import scipy.sparse as sps
+
+# 新方向正交化后的范数低于原范数的该比例时视为线性相关，不加入基
+DEFLATION_TOL = 1e-10
+
+
+class ReducedModel:
+    # V 为 (原阶数, q) 的正交基；G、C、b 为降阶后的稠密矩阵与右端项
+    # num_nodes、num_sources 为原网表的节点数与电压源数，用于从 x 中取出节点电位、电压源电流
+    def __init__(self, V: np.ndarray, G: np.ndarray, C: np.ndarray, b: np.ndarray, z0: np.ndarray,
+                 num_nodes: int, num_sources: int, s0: float):
+        self.V = V
+        self.G = G
+        self.C = C
+        self.b = b
+        # t=0+ 时刻的初始状态（零状态下电源阶跃后的瞬间）
+        self.z0 = z0
+        self.num_nodes = num_nodes
+        self.num_sources = num_sources
+        self.s0 = s0
+
+    def getOrder(self) -> int:
+        return self.V.shape[1]
+
+    def ac_analysis(self, frequencies: np.ndarray, outputs: list[int] | None = None) -> ACResult:
+        # 与 ACAnalysis.ac_analysis 相同的相量解，在降阶模型上对所有频率点向量化求解
+        frequencies = np.asarray(frequencies, dtype=float)
+        outputs = list(range(self.num_nodes)) if outputs is None else list(outputs)
+        z = solve_dense(self.G, self.C, self.b, 2j * np.pi * frequencies, list(range(self.getOrder())))
+        W = np.zeros((len(outputs), self.getOrder()))
+        for j, node in enumerate(outputs):
+            if node != GND:
+                W[j] = self.V[node]
+        return ACResult(frequencies, outputs, z @ W.T)
+
+    def simulate_transient(self, t_stop: float, t_step: float, method: str = 'trap') -> TransientResult:
+        # C z' + G z = b（电源在 t=0 阶跃），从 t=0+ 的状态开始以固定步长积分，只分解一次 q 阶稠密矩阵
+        # 原网表的元件已被消去，不给出电容、电感电流
+        if method not in METHODS:
+            raise ValueError('未知的积分方法：{}'.format(method))
+        if t_step <= 0 or t_stop <= 0:
+            raise ValueError('仿真时间与步长应为正数')
+        num_steps = int(round(t_stop / t_step))
+        times = np.arange(num_steps + 1) * t_step
+        if method == 'trap':
+            lu = sla.lu_factor(self.C / t_step + self.G / 2)
+            M = self.C / t_step - self.G / 2
+        else:
+            lu = sla.lu_factor(self.C / t_step + self.G)
+            M = self.C / t_step
+        z = np.empty((num_steps + 1, self.getOrder()))
+        z[0] = self.z0
+        for n in range(1, num_steps + 1):
+            z[n] = sla.lu_solve(lu, M @ z[n - 1] + self.b)
+        x = z @ self.V[:self.num_nodes + self.num_sources].T
+        return TransientResult(times, x[:, :self.num_nodes], x[:, self.num_nodes:], {})
+
+
+def reduce_order(netlist: Netlist, order: int, s0: float = 0.0) -> ReducedModel:
+    # 在实数展开点 s0 处做 PRIMA 降阶，得到至多 order 阶的模型；s0 = 0 匹配低频（直流附近）的响应
+    # 初始状态也加入基中，使降阶模型的瞬态仿真从准确的 t=0+ 状态开始
+    if order <= 0:
+        raise ValueError('降阶模型的阶数应为正数')
+    netlist = flatten_netlist(netlist)
+    G, C, b = stamp_MNA_pencil(netlist)
+    size = G.shape[0]
+    num_nodes, num_sources = netlist.num_nodes, netlist.getVoltageSourcesNum()
+    sign = np.ones(size)
+    sign[num_nodes:] = -1
+    D = sps.diags(sign)
+    G, C, b = (D @ G).tocsc(), (D @ C).tocsc(), sign * b
+    lu = factor_MNA((G + s0 * C).tocsc())
+
+    capacitor_index = netlist.getIndexOfKind('C').tolist()
+    x0 = np.zeros(size)
+    x0[:num_nodes + num_sources], _ = initial_state(netlist, capacitor_index)
+
+    order = min(order, size)
+    basis = np.zeros((size, order))
+    q = 0
+
+    def append(v: np.ndarray) -> bool:
+        # 两次 Gram-Schmidt 正交化，相关的方向丢弃
+        nonlocal q
+        norm = np.linalg.norm(v)
+        if q == order or norm == 0:
+            return False
+        for _ in range(2):
+            v = v - basis[:, :q] @ (basis[:, :q].T @ v)
+        new_norm = np.linalg.norm(v)
+        if new_norm <= DEFLATION_TOL * norm:
+            return False
+        basis[:, q] = v / new_norm
+        q += 1
+        return True
+
+    append(lu.solve(b))
+    append(x0)
+    j = 0
+    while q < order and j < q:
+        append(lu.solve(C @ basis[:, j]))
+        j += 1
+    V = basis[:, :q]
+    if q < order:
+        logger.info('Krylov 子空间在{}阶处耗尽'.format(q))
+    logger.info('模型降阶：{}阶降为{}阶，展开点s0={}'.format(size, q, s0))
+    GV, CV = G @ V, C @ V
+    return ReducedModel(V, V.T @ GV, V.T @ CV, V.T @ b, V.T @ x0, num_nodes, num_sources, s0)
+
+
+class ReductionReport:
+    # 降阶模型与完整模型在各输出上的最大绝对误差、相对误差（除以所有输出完整响应的最大幅值）与耗时
+    def __init__(self, order: int, size: int, outputs: list[int]):
+        self.order = order
+        self.size = size
+        self.outputs = outputs
+        self.ac_error = None
+        self.ac_abs_error = None
+        self.ac_times = None
+        self.transient_error = None
+        self.transient_abs_error = None
+        self.transient_times = None
+
+    def __str__(self):
+        lines = ['模型降阶：{}阶降为{}阶'.format(self.size, self.order)]
+        if self.ac_error is not None:
+            lines.append('交流分析最大误差：{:.3e}（相对{:.3e}），耗时 完整{:.3f} s / 降阶{:.3f} s'.format(
+                self.ac_abs_error.max(initial=0), self.ac_error.max(initial=0), *self.ac_times))
+        if self.transient_error is not None:
+            lines.append('瞬态仿真最大误差：{:.3e}V（相对{:.3e}），耗时 完整{:.3f} s / 降阶{:.3f} s'.format(
+                self.transient_abs_error.max(initial=0), self.transient_error.max(initial=0), *self.transient_times))
+        return '\n'.join(lines)
+
+
+def absolute_error(full: np.ndarray, reduced: np.ndarray) -> np.ndarray:
+    # 每列（输出）的最大误差
+    return np.abs(reduced - full).max(axis=0, initial=0)
+
+
+def relative_error(full: np.ndarray, reduced: np.ndarray) -> np.ndarray:
+    # 每列的最大误差除以所有输出、所有频率点（时刻）上完整结果的最大幅值；
+    # 不按各列自身的幅值归一化，否则响应接近零的输出会报告巨大的“相对”误差
+    scale = np.abs(full).max(initial=0)
+    return absolute_error(full, reduced) / (scale if scale > 0 else 1)
+
+
+def compare_reduced(netlist: Netlist, model: ReducedModel, frequencies: np.ndarray | None = None,
+                    t_stop: float | None = None, t_step: float | None = None, method: str = 'trap',
+                    outputs: list[int] | None = None) -> ReductionReport:
+    # 在给定频率点和（或）时间范围上分别用完整模型与降阶模型求解，比较各输出节点的电位
+    outputs = list(range(model.num_nodes)) if outputs is None else list(outputs)
+    report = ReductionReport(model.getOrder(), model.V.shape[0], outputs)
+    if frequencies is not None:
+        start = time.perf_counter()
+        full = ac_analysis(netlist, frequencies, outputs)
+        middle = time.perf_counter()
+        reduced = model.ac_analysis(frequencies, outputs)
+        report.ac_times = (middle - start, time.perf_counter() - middle)
+        report.ac_abs_error = absolute_error(full.responses, reduced.responses)
+        report.ac_error = relative_error(full.responses, reduced.responses)
+    if t_stop is not None and t_step is not None:
+        start = time.perf_counter()
+        full = simulate_transient(netlist, t_stop, t_step, method)
+        middle = time.perf_counter()
+        reduced = model.simulate_transient(t_stop, t_step, method)
+        report.transient_times = (middle - start, time.perf_counter() - middle)
+        full, reduced = full.node_voltages[:, outputs], reduced.node_voltages[:, outputs]
+        report.transient_abs_error = absolute_error(full, reduced)
+        report.transient_error = relative_error(full, reduced)
+    return report
@@ -0,0 +1,82 @@
+# 符号求解任务：在独立进程中依次完成 MNA 方程构建、无分数消元与逆拉氏变换，按阶段报告进度
+# 界面进程只轮询消息队列，取消时直接终止进程，不必等当前的消元或逆变换结束
+from log_config import logger
+from .Netlist import Netlist
+from .PolyEngine import solve_MNA_poly, factor_MNA_poly, PolyFactorization
+from .InverseLaplace import inverse_laplace_many, TimeDomainResult
+from .Jobs import BackgroundJob, exit_on_terminate
+
+import multiprocessing as mp
+import signal
+import sympy as sp
+
+# 各阶段的名称及其在总进度中所占的区间
+STAGES = {
+    'topology': ('构建电路拓扑', 0.0, 0.05),
+    'stamping': ('构建 MNA 方程', 0.05, 0.1),
+    'solve': ('求解 MNA 方程', 0.1, 0.7),
+    'inverse': ('逆拉氏变换', 0.7, 1.0),
+}
+# 同一阶段内进度变化小于该值时不发送消息，避免大电路的每一列消元都写一次队列
+PROGRESS_STEP = 0.01
+
+
+def overall_progress(stage: str, fraction: float) -> float:
+    _, start, end = STAGES[stage]
+    return start + (end - start) * fraction
+
+
+def solve_symbolic(netlist: Netlist, s: sp.Symbol, t: sp.Symbol,
+                   progress=None) -> tuple[list[sp.Expr], list[TimeDomainResult]]:
+    # 返回 s 域解以及每个未知量的时域结果，progress(stage, fraction) 报告进度
+    solution = solve_MNA_poly(netlist, s, progress)
+    return solution, inverse_with_progress(solution, s, t, progress)
+
+
+def solve_symbolic_factored(netlist: Netlist, s: sp.Symbol, t: sp.Symbol, factorization: PolyFactorization | None = None,
+                            progress=None) -> tuple[list[sp.Expr], list[TimeDomainResult], PolyFactorization]:
+    # 同 solve_symbolic，并返回消元记录；给出 factorization 时（之后只修改了电源数值）只代入新的右端项，不再消元
+    if factorization is None:
+        solution, factorization = factor_MNA_poly(netlist, s, progress)
+    elif progress is None:
+        solution = factorization.solve(netlist, s)
+    else:
+        progress('solve', 0.0)
+        solution = factorization.solve(netlist, s, lambda fraction: progress('solve', fraction))
+    return solution, inverse_with_progress(solution, s, t, progress), factorization
+
+
+def inverse_with_progress(solution: list[sp.Expr], s: sp.Symbol, t: sp.Symbol, progress=None) -> list[TimeDomainResult]:
+    if progress is None:
+        return inverse_laplace_many(solution, s, t)
+    progress('inverse', 0.0)
+    results = inverse_laplace_many(solution, s, t, progress=lambda fraction: progress('inverse', fraction))
+    progress('inverse', 1.0)
+    return results
+
+
+def run_solve_job(netlist: Netlist, s: sp.Symbol, t: sp.Symbol, factorization: PolyFactorization | None,
+                  messages: mp.Queue):
+    # 后台进程入口：发送 ('progress', 阶段, 比例)，最后发送 ('result', 解, 时域结果, 消元记录) 或 ('error', 信息)
+    signal.signal(signal.SIGTERM, exit_on_terminate)
+    last = {}
+
+    def progress(stage: str, fraction: float):
+        if stage in last and fraction < 1 and fraction - last[stage] < PROGRESS_STEP:
+            return
+        last[stage] = fraction
+        messages.put(('progress', stage, fraction))
+
+    try:
+        solution, results, factorization = solve_symbolic_factored(netlist, s, t, factorization, progress)
+    except Exception as e:
+        logger.error('后台求解失败：{}'.format(e))
+        messages.put(('error', str(e)))
+        return
+    messages.put(('result', solution, results, factorization))
+
+
+class SolveJob(BackgroundJob):
+    # factorization 为同一电路之前求解时的消元记录（之后只修改了电源数值），见 solve_symbolic_factored
+    def __init__(self, netlist: Netlist, s: sp.Symbol, t: sp.Symbol, factorization: PolyFactorization | None = None):
+        super().__init__(run_solve_job, netlist, s, t, factorization)
@@ -0,0 +1,137 @@
+# 元件印记注册表：每种元件声明自己对 MNA 方程的贡献（导纳、支路电流未知量、右端源），
+# 组装时按元件类型一次性生成所有 COO 三元组，新增元件类型只需注册印记，不必修改组装代码
+from .Netlist import Netlist, GND, KIND_CODES, register_kind
+
+import numpy as np
+
+
+class Stamp:
+    # admittance(values, s)：s 处的导纳（values 可为数组），返回 None 表示不写入 G 分块
+    # branch(s)：是否以支路电流为未知量（B、B^T 分块）
+    # source：'I' 写入 I_s 分块，'V' 写入对应支路的 E 分块
+    # 符号引擎以 QQ[s] 中的元素调用 admittance（s 为多项式环的生成元），结果须为多项式，且不支持支路电流未知量
+    __slots__ = ('kind', 'admittance', 'branch', 'source')
+
+    def __init__(self, kind: str, admittance=None, branch=None, source: str | None = None):
+        self.kind = kind
+        self.admittance = admittance
+        self.branch = branch
+        self.source = source
+
+    def getAdmittance(self, values, s: complex | None = None):
+        return None if self.admittance is None else self.admittance(values, s)
+
+    def isBranch(self, s: complex | None = None) -> bool:
+        return self.branch is not None and self.branch(s)
+
+
+# 支路未知量按注册顺序分组排列（电压源在前，直流时电感在后），组内按网表顺序
+STAMPS: dict[str, Stamp] = {}
+
+
+def register_stamp(stamp: Stamp):
+    # 未知的元件类型同时加入网表的类型表，新增元件类型不需要修改 Netlist
+    register_kind(stamp.kind)
+    STAMPS[stamp.kind] = stamp
+
+
+def resistor_admittance(values, s):
+    return 1 / values
+
+
+def capacitor_admittance(values, s):
+    # 直流时电容开路
+    return None if s is None else s * values
+
+
+def inductor_admittance(values, s):
+    # 直流时电感为 0V 支路
+    return None if s is None else 1 / (s * values)
+
+
+def is_dc(s) -> bool:
+    return s is None
+
+
+def always(s) -> bool:
+    return True
+
+
+register_stamp(Stamp('R', admittance=resistor_admittance))
+register_stamp(Stamp('C', admittance=capacitor_admittance))
+register_stamp(Stamp('V', branch=always, source='V'))
+register_stamp(Stamp('L', admittance=inductor_admittance, branch=is_dc))
+register_stamp(Stamp('I', source='I'))
+
+
+def get_branch_elements(netlist: Netlist, s: complex | None = None) -> np.ndarray:
+    # 以支路电流为未知量的元件序号，第 k 个对应未知量 num_nodes + k
+    kinds = np.frombuffer(netlist.kinds, dtype=np.int8)
+    groups = [np.flatnonzero(kinds == KIND_CODES[kind]) for kind, stamp in STAMPS.items() if stamp.isBranch(s)]
+    return np.concatenate(groups) if groups else np.zeros(0, dtype=int)
+
+
+def admittance_triplets(n1: np.ndarray, n2: np.ndarray, Y: np.ndarray):
+    # (n1, n1, Y) (n2, n2, Y) (n1, n2, -Y) (n2, n1, -Y)，略去接地端
+    has1, has2 = n1 != GND, n2 != GND
+    both = has1 & has2
+    rows = np.concatenate((n1[has1], n2[has2], n1[both], n2[both]))
+    cols = np.concatenate((n1[has1], n2[has2], n2[both], n1[both]))
+    vals = np.concatenate((Y[has1], Y[has2], -Y[both], -Y[both]))
+    return rows, cols, vals
+
+
+def branch_triplets(n1: np.ndarray, n2: np.ndarray, k: np.ndarray):
+    # B 与 B^T 分块：(n1, k, 1) (k, n1, 1) (n2, k, -1) (k, n2, -1)
+    has1, has2 = n1 != GND, n2 != GND
+    rows = np.concatenate((n1[has1], k[has1], n2[has2], k[has2]))
+    cols = np.concatenate((k[has1], n1[has1], k[has2], n2[has2]))
+    vals = np.concatenate((np.ones(2 * has1.sum(), dtype=int), -np.ones(2 * has2.sum(), dtype=int)))
+    return rows, cols, vals
+
+
+def stamp_MNA_triplets(netlist: Netlist, s=None) -> tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    # 返回 A 的 COO 三元组（重复位置相加）与阶数；s 可为数值或 sympy 符号（此时数值为 object 数组）
+    kinds, n1, n2, values = netlist.getArrays()
+    branches = get_branch_elements(netlist, s)
+    size = netlist.num_nodes + len(branches)
+    parts = []
+    for kind, stamp in STAMPS.items():
+        index = np.flatnonzero(kinds == KIND_CODES[kind])
+        if len(index) == 0 or stamp.admittance is None:
+            continue
+        Y = stamp.getAdmittance(values[index], s)
+        if Y is not None:
+            parts.append(admittance_triplets(n1[index], n2[index], np.asarray(Y)))
+    if len(branches):
+        parts.append(branch_triplets(n1[branches], n2[branches], netlist.num_nodes + np.arange(len(branches))))
+    if netlist.instances:
+        # 子电路实例按约化后的端口导纳写入节点分块（Subcircuit 依赖本模块，在函数内导入）
+        from .Subcircuits import instance_triplets
+        parts.extend(instance_triplets(netlist, s))
+    if not parts:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0), size
+    rows, cols, vals = (np.concatenate(column) for column in zip(*parts))
+    return rows, cols, vals, size
+
+
+def stamp_MNA_sources(netlist: Netlist, s=None, scale=1, dtype=np.float64) -> np.ndarray:
+    # I_s 与 E 分块，电源值乘以 scale（s 域阶跃时为 1/s）；s 只决定支路未知量的个数
+    kinds, n1, n2, values = netlist.getArrays()
+    branches = get_branch_elements(netlist, s)
+    b = np.zeros(netlist.num_nodes + len(branches), dtype=dtype)
+    for kind, stamp in STAMPS.items():
+        if stamp.source != 'I':
+            continue
+        index = np.flatnonzero(kinds == KIND_CODES[kind])
+        contribution = values[index] * scale
+        has1, has2 = n1[index] != GND, n2[index] != GND
+        np.add.at(b, n1[index][has1], contribution[has1])
+        np.subtract.at(b, n2[index][has2], contribution[has2])
+    voltage_codes = [KIND_CODES[kind] for kind, stamp in STAMPS.items() if stamp.source == 'V']
+    sources = np.flatnonzero(np.isin(kinds[branches], voltage_codes))
+    b[netlist.num_nodes + sources] = values[branches[sources]] * scale
+    if netlist.instances:
+        from .Subcircuits import stamp_instance_sources
+        stamp_instance_sources(netlist, b, s, scale)
+    return b
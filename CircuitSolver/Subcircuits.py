@@ -0,0 +1,227 @@
+# 层次化子电路：子电路定义一次，多个实例只连接各自的端口
+# 定义内部的节点与支路经 Kron 约化（Schur 补）消去，得到端口方程 I = Y V - J
+# （I 为从外部流入各端口的电流，V 为端口电位，J 为内部电源折算到端口的等效注入电流），
+# 约化结果按（定义内容, 元件数值, s）缓存，各实例只把端口方程写入 MNA 方程，方程阶数随端口数而非内部节点数增长
+from .Netlist import Netlist, GND
+from .NumericEngine import factor_MNA, check_solution, SingularCircuitError
+from .Stamps import stamp_MNA_triplets, stamp_MNA_sources
+
+from collections import OrderedDict
+import numbers
+import numpy as np
+import scipy.sparse as sps
+
+DEFAULT_CACHE_SIZE = 128
+
+
+class PortAdmittanceError(SingularCircuitError):
+    def __init__(self, name: str):
+        Exception.__init__(self, '子电路 {} 无法约化为端口导纳：内部存在悬空节点，'
+                                 '或端口之间直接由电压源、电感（直流时）相连'.format(name))
+
+
+class Subcircuit:
+    # ports[i] 为第 i 个端口在定义网表中的节点编号；定义网表中的 GND 即全局的地
+    # node_names、element_names、instance_names 为定义内的节点、元件、实例名（可选，写出网表时使用）
+    __slots__ = ('name', 'netlist', 'ports', 'node_names', 'element_names', 'instance_names')
+
+    def __init__(self, name: str, netlist: Netlist, ports, node_names: list[str] | None = None,
+                 element_names: list[str] | None = None, instance_names: list[str] | None = None):
+        ports = tuple(int(port) for port in ports)
+        if len(set(ports)) != len(ports) or any(port < 0 or port >= netlist.num_nodes for port in ports):
+            raise ValueError('子电路 {} 的端口应为互不相同的非地节点'.format(name))
+        self.name = name
+        self.netlist = netlist
+        self.ports = ports
+        self.node_names = node_names
+        self.element_names = element_names
+        self.instance_names = instance_names
+
+    def getNumPorts(self) -> int:
+        return len(self.ports)
+
+    def getKey(self) -> tuple:
+        # 定义内容与元件数值，内容相同的定义共用约化结果，修改数值后得到新的键
+        netlist = self.netlist
+        return (netlist.num_nodes, self.ports, netlist.kinds.tobytes(), netlist.n1.tobytes(),
+                netlist.n2.tobytes(), netlist.values.tobytes(),
+                tuple((subcircuit.getKey(), nodes) for subcircuit, nodes in netlist.instances))
+
+
+class PortModel:
+    # 数值形式：Y 为 (端口数, 端口数) 数组，J 为长度为端口数的数组，den 为 None
+    # 符号形式：Y、J 为 QQ[s] 中的分子多项式，den 为公分母，即 Y = Y / den、J = J / den
+    __slots__ = ('Y', 'J', 'den', '_exprs')
+
+    def __init__(self, Y, J, den=None):
+        self.Y = Y
+        self.J = J
+        self.den = den
+        self._exprs = None
+
+    def getArrays(self) -> tuple[np.ndarray, np.ndarray]:
+        # 数值形式直接返回；符号形式返回 sympy 表达式的 object 数组
+        if self.den is None:
+            return self.Y, self.J
+        if self._exprs is None:
+            den = self.den.as_expr()
+            Y = np.empty((len(self.J), len(self.J)), dtype=object)
+            for i, row in enumerate(self.Y):
+                for j, value in enumerate(row):
+                    Y[i, j] = value.as_expr() / den
+            J = np.empty(len(self.J), dtype=object)
+            J[:] = [value.as_expr() / den for value in self.J]
+            self._exprs = Y, J
+        return self._exprs
+
+
+def is_numeric(s) -> bool:
+    return s is None or isinstance(s, numbers.Number)
+
+
+def reduce_numeric(subcircuit: Subcircuit, s: complex | None = None) -> PortModel:
+    # 在各端口与地之间接入电压源：端口电压全为 0 时电压源电流即 J，
+    # 内部电源置零、第 j 个端口电压为 1 时电压源电流取负即 Y 的第 j 列；一次分解，端口数 + 1 个右端项
+    netlist = subcircuit.netlist
+    dtype = np.float64 if s is None or isinstance(s, float) else np.complex128
+    rows, cols, vals, size = stamp_MNA_triplets(netlist, s)
+    ports = np.asarray(subcircuit.ports)
+    m = len(ports)
+    k = size + np.arange(m)
+    A = sps.coo_matrix((np.concatenate((vals.astype(dtype), np.ones(2 * m))),
+                        (np.concatenate((rows, ports, k)), np.concatenate((cols, k, ports)))),
+                       shape=(size + m, size + m)).tocsc()
+    B = np.zeros((size + m, m + 1), dtype=dtype)
+    B[:size, 0] = stamp_MNA_sources(netlist, s, 1, dtype)
+    B[k, 1 + np.arange(m)] = 1
+    X = check_solution(factor_MNA(A).solve(B))
+    return PortModel(-X[size:, 1:], X[size:, 0])
+
+
+def reduce_poly(subcircuit: Subcircuit, s) -> PortModel:
+    # 与 reduce_numeric 相同的加边方程，在 QQ[s] 上无分数消元一次求出所有右端项的解
+    import sympy as sp
+    from sympy.polys.matrices import DomainMatrix
+    from .PolyEngine import stamp_MNA_poly, fraction_free_solve_many
+
+    A, b0 = stamp_MNA_poly(subcircuit.netlist, s)
+    R = A.domain
+    size, m = A.shape[0], len(subcircuit.ports)
+    rows = {i: dict(row) for i, row in A.to_sdm().items()}
+    rhs = {i: dict(row) for i, row in b0.to_sdm().items() if row}
+    for j, port in enumerate(subcircuit.ports):
+        rows.setdefault(port, {})[size + j] = R.one
+        rows[size + j] = {port: R.one}
+        rhs[size + j] = {1 + j: R.one}
+    solutions = fraction_free_solve_many(DomainMatrix(rows, (size + m, size + m), R),
+                                         DomainMatrix(rhs, (size + m, m + 1), R))
+    currents = [solution[size:] for solution in solutions]
+    den = currents[0][0].denom.ring.one
+    for column in currents:
+        for value in column:
+            den = den.lcm(value.denom)
+    Z = sp.ZZ[s]
+
+    def numerator(value):
+        return R.convert_from(value.numer * den.exquo(value.denom), Z)
+
+    Y = [[-numerator(currents[1 + j][i]) for j in range(m)] for i in range(m)]
+    J = [numerator(value) for value in currents[0]]
+    return PortModel(Y, J, R.convert_from(den, Z))
+
+
+class PortModelCache:
+    # 以（定义内容与数值, s）为键的 LRU 缓存；s 为数值或 None 时为数值形式，为 sympy 符号时为符号形式
+    _models: OrderedDict[tuple, PortModel]
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._models = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subcircuit: Subcircuit, s=None) -> PortModel:
+        key = (subcircuit.getKey(), s)
+        model = self._models.get(key)
+        if model is not None:
+            self.hits += 1
+            self._models.move_to_end(key)
+            return model
+        self.misses += 1
+        try:
+            model = reduce_numeric(subcircuit, s) if is_numeric(s) else reduce_poly(subcircuit, s)
+        except SingularCircuitError as e:
+            raise PortAdmittanceError(subcircuit.name) from e
+        self._models[key] = model
+        if len(self._models) > self.maxsize:
+            self._models.popitem(last=False)
+        return model
+
+    def clear(self):
+        self._models.clear()
+
+
+# 进程内共用的约化结果缓存
+port_models = PortModelCache()
+
+
+def get_port_model(subcircuit: Subcircuit, s=None) -> PortModel:
+    return port_models.get(subcircuit, s)
+
+
+def group_instances(netlist: Netlist) -> list[tuple[Subcircuit, np.ndarray]]:
+    # 按子电路定义分组，每组的端口节点为 (实例数, 端口数) 数组
+    groups = {}
+    for subcircuit, nodes in netlist.instances:
+        groups.setdefault(id(subcircuit), (subcircuit, []))[1].append(nodes)
+    return [(subcircuit, np.array(nodes, dtype=np.int32).reshape(len(nodes), subcircuit.getNumPorts()))
+            for subcircuit, nodes in groups.values()]
+
+
+def instance_triplets(netlist: Netlist, s=None) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    # 每个实例把 Y 写入端口节点对应的行列，略去接地的端口
+    parts = []
+    for subcircuit, nodes in group_instances(netlist):
+        Y, _ = get_port_model(subcircuit, s).getArrays()
+        shape = (len(nodes), len(subcircuit.ports), len(subcircuit.ports))
+        rows = np.broadcast_to(nodes[:, :, None], shape)
+        cols = np.broadcast_to(nodes[:, None, :], shape)
+        mask = (rows != GND) & (cols != GND)
+        parts.append((rows[mask], cols[mask], np.broadcast_to(Y, shape)[mask]))
+    return parts
+
+
+def stamp_instance_sources(netlist: Netlist, b: np.ndarray, s=None, scale=1):
+    # J 写入端口节点的右端项，与其他电源一样乘以 scale
+    for subcircuit, nodes in group_instances(netlist):
+        _, J = get_port_model(subcircuit, s).getArrays()
+        mask = nodes != GND
+        np.add.at(b, nodes[mask], np.broadcast_to(J * scale, nodes.shape)[mask])
+
+
+def count_instance_ports(netlist: Netlist) -> int:
+    return sum(subcircuit.getNumPorts() for subcircuit, _ in netlist.instances)
+
+
+def flatten_netlist(netlist: Netlist) -> Netlist:
+    # 把子电路实例展开为普通元件，供不能使用端口方程的分析（瞬态、交流的 G + sC 形式）使用
+    # 原网表的节点与元件编号不变，各实例的内部节点、元件依次排在后面；没有实例时返回原网表
+    if not netlist.instances:
+        return netlist
+    flat = netlist.copy()
+    flat.instances = []
+    for subcircuit, nodes in netlist.instances:
+        inner = flatten_netlist(subcircuit.netlist)
+        kinds, n1, n2, values = inner.getArrays()
+        # 端口接到实例连接的节点，其余节点编为新的节点；末尾追加 GND，使 local[GND] 仍为 GND
+        local = np.full(inner.num_nodes + 1, GND, dtype=np.int32)
+        internal = np.ones(inner.num_nodes, dtype=bool)
+        internal[list(subcircuit.ports)] = False
+        local[np.flatnonzero(internal)] = flat.num_nodes + np.arange(internal.sum())
+        local[list(subcircuit.ports)] = nodes
+        flat.num_nodes += int(internal.sum())
+        flat.kinds.frombytes(kinds.tobytes())
+        flat.n1.frombytes(local[n1].tobytes())
+        flat.n2.frombytes(local[n2].tobytes())
+        flat.values.frombytes(values.tobytes())
+    return flat
@@ -0,0 +1,80 @@
+from log_config import logger
+from .Netlist import Netlist, GND
+from .NumericEngine import (stamp_MNA_sparse, stamp_MNA_rhs, element_admittance, incidence_matrix,
+                            factor_MNA, check_solution, normalize_s, SingularCircuitError)
+
+import numpy as np
+
+
+class SweepResult:
+    # 第 p 行对应第 p 个扫描点
+    values: dict[int, np.ndarray]
+    node_potentials: np.ndarray
+    source_currents: np.ndarray
+
+    def __init__(self, values, node_potentials, source_currents):
+        self.values = values
+        self.node_potentials = node_potentials
+        self.source_currents = source_currents
+
+    def __len__(self):
+        return self.node_potentials.shape[0]
+
+    def getNodePotential(self, node: int) -> np.ndarray:
+        if node == GND:
+            return np.zeros(len(self), dtype=self.node_potentials.dtype)
+        return self.node_potentials[:, node]
+
+
+def sweep_values(netlist: Netlist, sweeps: dict[int, np.ndarray], s: complex | None = None) -> SweepResult:
+    # 同时扫描多个元件的数值（各数组长度相同，逐点对应），系统只构建、分解一次：
+    #   电阻、电容、电感的变化作为低秩修正 A = A0 + U diag(D_p) U^T，对所有扫描点批量求解 r×r 的小方程组
+    #   电源的变化只影响右端项，由各电源的单位响应线性叠加
+    sweeps = {index: np.atleast_1d(np.asarray(values, dtype=float)) for index, values in sweeps.items()}
+    lengths = {len(values) for values in sweeps.values()}
+    if len(lengths) != 1:
+        raise ValueError('各扫描参数的点数应相同')
+    num_points = lengths.pop()
+
+    s, dtype = normalize_s(s)
+    A, b = stamp_MNA_sparse(netlist, s)
+    size = A.shape[0]
+    lu = factor_MNA(A)
+    y = np.tile(lu.solve(b), (num_points, 1))
+
+    pairs, deltas = [], []
+    for index, values in sweeps.items():
+        kind, n1, n2, value = netlist.elements[index]
+        if kind in ('V', 'I'):
+            # 电源的单位响应 A0^-1 e_j
+            unit = netlist.copy()
+            for k, element in enumerate(unit.elements):
+                if element[0] in ('V', 'I'):
+                    unit.setValue(k, 1.0 if k == index else 0.0)
+            y += np.outer(values - value, lu.solve(stamp_MNA_rhs(unit, s)))
+            continue
+        nominal = element_admittance(kind, value, s)
+        if nominal is None:
+            continue
+        pairs.append((n1, n2))
+        deltas.append(np.array([element_admittance(kind, v, s) for v in values], dtype=dtype) - nominal)
+
+    if pairs:
+        # x_p = y_p - Z (I + D_p U^T Z)^-1 D_p U^T y_p，其中 Z = A0^-1 U
+        U = incidence_matrix(pairs, size).astype(dtype)
+        Z = lu.solve(U.T.toarray())
+        D = np.column_stack(deltas)
+        UZ = U @ Z
+        M = np.eye(len(pairs), dtype=dtype)[None] + D[:, :, None] * UZ[None]
+        rhs = D * (U @ y.T).T
+        try:
+            w = np.linalg.solve(M, rhs[:, :, None])[:, :, 0]
+        except np.linalg.LinAlgError as e:
+            raise SingularCircuitError() from e
+        y = y - w @ Z.T
+    check_solution(y)
+    logger.info('参数扫描：{}个参数，{}个点，{}阶'.format(len(sweeps), num_points, size))
+
+    num_nodes = netlist.num_nodes
+    num_sources = netlist.getVoltageSourcesNum()
+    return SweepResult(sweeps, y[:, :num_nodes], y[:, num_nodes:num_nodes + num_sources])
@@ -0,0 +1,60 @@
+from .InverseLaplace import TimeDomainResult, inverse_laplace, inverse_laplace_many
+
+from collections import OrderedDict
+import sympy as sp
+
+DEFAULT_CACHE_SIZE = 256
+
+
+class TimeDomainCache:
+    # 以 s 域表达式为键缓存逆拉氏变换结果（时域表达式以及编译好的求值函数），按 LRU 淘汰
+    _results: OrderedDict[tuple[sp.Expr, sp.Symbol, sp.Symbol], TimeDomainResult]
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, expr, s: sp.Symbol, t: sp.Symbol) -> TimeDomainResult:
+        key = (sp.sympify(expr), s, t)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return result
+        self.misses += 1
+        result = inverse_laplace(key[0], s, t)
+        self.put(key[0], s, t, result)
+        return result
+
+    def getMany(self, exprs, s: sp.Symbol, t: sp.Symbol, workers: int | None = None) -> list[TimeDomainResult]:
+        # 未命中的表达式一起交给 inverse_laplace_many 并行计算
+        exprs = [sp.sympify(expr) for expr in exprs]
+        found = {}
+        for expr in dict.fromkeys(exprs):
+            key = (expr, s, t)
+            if key in self._results:
+                self._results.move_to_end(key)
+                found[expr] = self._results[key]
+        missing = [expr for expr in dict.fromkeys(exprs) if expr not in found]
+        self.hits += len(exprs) - len(missing)
+        self.misses += len(missing)
+        for expr, result in zip(missing, inverse_laplace_many(missing, s, t, workers)):
+            found[expr] = result
+            self.put(expr, s, t, result)
+        return [found[expr] for expr in exprs]
+
+    def put(self, expr, s: sp.Symbol, t: sp.Symbol, result: TimeDomainResult):
+        # 放入在其他地方（如后台求解进程）算好的结果
+        self._results[(sp.sympify(expr), s, t)] = result
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._results)
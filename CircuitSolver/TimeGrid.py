@@ -0,0 +1,101 @@
+# 时域波形的自动时间网格：由极点（时间常数、振荡周期）确定显示时长与最快的时间尺度，
+# 在初始网格上按区间中点的线性插值误差（即曲率）逐次加密，用较少的求值点得到准确的波形
+from log_config import logger
+from .Netlist import Netlist
+from .ACAnalysis import stamp_MNA_pencil, DENSE_MAX_SIZE
+from .Subcircuits import flatten_netlist
+
+import numpy as np
+import scipy.linalg as sla
+
+# 显示时长取最慢的衰减极点下降到 e^-SETTLING_TAUS 的时间（约 0.1%）
+SETTLING_TAUS = 7
+# 无阻尼振荡时显示的周期数
+OSCILLATION_PERIODS = 5
+# 模小于最大极点模的该比例时视为 s = 0（阶跃电源引入的极点）
+ZERO_POLE_TOL = 1e-9
+# 每个最快时间尺度内的点数（初始网格与自动步长）
+POINTS_PER_SCALE = 10
+# 默认的求值点数上限
+DEFAULT_POINT_BUDGET = 1000
+# 区间中点处线性插值误差超过波形幅度的该比例时继续加密
+REFINE_TOL = 1e-3
+MIN_POINTS = 16
+
+
+def time_scales(poles: np.ndarray | None) -> tuple[float, float] | None:
+    # 返回 (最快的时间尺度 1/|p|, 显示时长)；没有非零极点时返回 None
+    if poles is None or len(poles) == 0:
+        return None
+    poles = np.asarray(poles, dtype=complex)
+    poles = poles[np.abs(poles) > ZERO_POLE_TOL * np.abs(poles).max()]
+    if len(poles) == 0:
+        return None
+    sigma, omega = np.abs(poles.real), np.abs(poles.imag)
+    # 衰减（或增长）极点取若干倍时间常数，实部可忽略的振荡极点取若干个周期
+    damped = sigma > ZERO_POLE_TOL * np.abs(poles)
+    spans = np.where(damped, SETTLING_TAUS / np.where(damped, sigma, 1),
+                     OSCILLATION_PERIODS * 2 * np.pi / np.where(damped, 1, omega))
+    return float(1 / np.abs(poles).max()), float(spans.max())
+
+
+def circuit_poles(netlist: Netlist) -> np.ndarray | None:
+    # det(G + sC) = 0 的有限根，即电路的自然频率；阶数超过 DENSE_MAX_SIZE 时不计算，返回 None
+    G, C, _ = stamp_MNA_pencil(flatten_netlist(netlist))
+    size = G.shape[0]
+    if size == 0 or size > DENSE_MAX_SIZE:
+        return None
+    # 广义特征值以 (alpha, beta) 给出，beta 接近 0 的为无穷远处的特征值（C 奇异）
+    w, _ = sla.eig(-G.toarray(), C.toarray(), homogeneous_eigvals=True)
+    alpha, beta = w
+    finite = np.abs(beta) > 1e-12 * np.maximum(np.abs(alpha), 1)
+    return alpha[finite] / beta[finite]
+
+
+def initial_time_grid(t_stop: float, points: int, t_fast: float | None = None) -> np.ndarray:
+    # 均匀网格；给出最快时间尺度时再加一半点数按对数分布在 [t_fast / POINTS_PER_SCALE, t_stop]，覆盖起始处的快速变化
+    if t_fast is None or t_fast / POINTS_PER_SCALE >= t_stop:
+        return np.linspace(0, t_stop, points)
+    uniform = np.linspace(0, t_stop, points - points // 2)
+    geometric = np.geomspace(t_fast / POINTS_PER_SCALE, t_stop, points // 2)
+    return np.unique(np.concatenate((uniform, geometric)))
+
+
+def adaptive_time_grid(func, t_stop: float, budget: int = DEFAULT_POINT_BUDGET, t_fast: float | None = None,
+                       tol: float = REFINE_TOL) -> tuple[np.ndarray, np.ndarray]:
+    # func 对时间数组求值；初始网格用去四分之一的点数，之后每轮在待加密区间的中点求值，
+    # 中点与两端线性插值相差超过 tol 倍波形幅度的区间，其两半进入下一轮，直到没有待加密区间或用完 budget
+    if t_stop <= 0:
+        raise ValueError('仿真时长应为正数')
+    if budget < MIN_POINTS:
+        raise ValueError('求值点数至少为{}'.format(MIN_POINTS))
+    t = initial_time_grid(t_stop, budget // 4, t_fast)
+    y = np.asarray(func(t), dtype=float)
+    candidates = np.arange(len(t) - 1)
+    priority = np.zeros(len(candidates))
+    min_width = t_stop * 1e-12
+    while len(candidates) and len(t) < budget:
+        # 点数不够时优先加密上一轮误差最大的区间
+        if len(candidates) > budget - len(t):
+            candidates = np.sort(candidates[np.argsort(-priority)[:budget - len(t)]])
+        mid = (t[candidates] + t[candidates + 1]) / 2
+        y_mid = np.asarray(func(mid), dtype=float)
+        scale = max(np.ptp(y), np.abs(y).max(initial=0), np.finfo(float).tiny)
+        error = np.abs(y_mid - (y[candidates] + y[candidates + 1]) / 2) / scale
+        refine = (error > tol) & (t[candidates + 1] - t[candidates] > 2 * min_width)
+        # 中点插入在区间左端之后，插入后第 k 个中点的位置为 candidates[k] + k + 1
+        t = np.insert(t, candidates + 1, mid)
+        y = np.insert(y, candidates + 1, y_mid)
+        left = candidates[refine] + np.flatnonzero(refine)
+        candidates = np.concatenate((left, left + 1))
+        priority = np.concatenate((error[refine], error[refine]))
+        order = np.argsort(candidates)
+        candidates, priority = candidates[order], priority[order]
+    logger.info('自适应时间网格：时长{:.4g}s，{}个点'.format(t_stop, len(t)))
+    return t, y
+
+
+def auto_time_step(t_stop: float, t_fast: float | None, budget: int = DEFAULT_POINT_BUDGET) -> float:
+    # 瞬态仿真的固定步长：每个最快时间尺度 POINTS_PER_SCALE 步，总步数不超过 budget
+    steps = budget if t_fast is None else int(np.ceil(t_stop * POINTS_PER_SCALE / t_fast))
+    return t_stop / max(1, min(steps, budget))
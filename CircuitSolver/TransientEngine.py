@@ -0,0 +1,163 @@
+from log_config import logger
+from .Netlist import Netlist, GND
+from .NumericEngine import SingularCircuitError, stamp_MNA_sparse, solve_MNA_sparse, incidence_matrix, factor_MNA
+from .Subcircuits import flatten_netlist
+from .Waveforms import WaveformStore, ColumnStack, run_key, CHUNK_ROWS
+
+import numpy as np
+import scipy.sparse as sps
+
+# be：后向欧拉；trap：梯形法
+METHODS = ('be', 'trap')
+
+
+class TransientResult:
+    times: np.ndarray
+    # 每行对应一个时刻：节点电位 (N+1, num_nodes)、电压源电流 (N+1, num_V)
+    node_voltages: np.ndarray
+    source_currents: np.ndarray
+    # 电容、电感电流，键为网表中的元件序号
+    element_currents: dict[int, np.ndarray]
+
+    def __init__(self, times, node_voltages, source_currents, element_currents):
+        self.times = times
+        self.node_voltages = node_voltages
+        self.source_currents = source_currents
+        self.element_currents = element_currents
+
+    def getNodeVoltage(self, node: int) -> np.ndarray:
+        if node == GND:
+            return np.zeros_like(self.times)
+        return self.node_voltages[:, node]
+
+    def getVoltage(self, n1: int, n2: int) -> np.ndarray:
+        return self.getNodeVoltage(n1) - self.getNodeVoltage(n2)
+
+
+def initial_state(netlist: Netlist, capacitor_index: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    # 零初始状态下 t=0+ 的解：电容电压为 0（视为 0V 电压源），电感电流为 0（开路）
+    initial = Netlist(netlist.num_nodes)
+    for kind, n1, n2, value in netlist.elements:
+        if kind not in ('C', 'L'):
+            initial.add(kind, n1, n2, value)
+    for i in capacitor_index:
+        _, n1, n2, _ = netlist.elements[i]
+        initial.add('V', n1, n2, 0.0)
+    try:
+        x = solve_MNA_sparse(*stamp_MNA_sparse(initial))
+    except SingularCircuitError:
+        logger.warning('无法求解 t=0+ 时刻的电路，初始值取 0')
+        x = np.zeros(netlist.num_nodes + initial.getVoltageSourcesNum())
+    num_main = netlist.num_nodes + netlist.getVoltageSourcesNum()
+    return x[:num_main], x[num_main:]
+
+
+def load_transient(store: WaveformStore, key: str) -> TransientResult | None:
+    # 以内存映射读取已保存的仿真结果，node_voltages、source_currents 按列访问（见 ColumnStack）
+    stored = store.load(key)
+    if stored is None:
+        return None
+    index, columns = stored
+    rows = index['rows']
+    node_voltages = ColumnStack([columns['v{}'.format(i)] for i in range(index['num_nodes'])], rows)
+    source_currents = ColumnStack([columns['iV{}'.format(k)] for k in range(index['num_sources'])], rows)
+    element_currents = {i: columns['i{}'.format(i)] for i in index['elements']}
+    return TransientResult(columns['t'], node_voltages, source_currents, element_currents)
+
+
+def simulate_transient(netlist: Netlist, t_stop: float, t_step: float, method: str = 'trap',
+                       store: WaveformStore | None = None) -> TransientResult:
+    # 电容、电感以伴随模型（等效电导 + 历史电流源）代替，固定步长下系数矩阵不变，
+    # 只分解一次，每一步只更新右端项
+    # 给出 store 时结果按 CHUNK_ROWS 行分块写入磁盘并以内存映射返回；相同网表与设置的运行直接读取，不再仿真
+    if method not in METHODS:
+        raise ValueError('未知的积分方法：{}'.format(method))
+    if t_step <= 0 or t_stop <= 0:
+        raise ValueError('仿真时间与步长应为正数')
+    # 子电路实例展开为普通元件，内部节点与电压源的结果排在原网表的节点、电压源之后
+    netlist = flatten_netlist(netlist)
+    if store is not None:
+        key = run_key(netlist, t_stop, t_step, method)
+        result = load_transient(store, key)
+        if result is not None:
+            return result
+
+    num_steps = int(round(t_stop / t_step))
+    rows = num_steps + 1
+    h = t_step
+
+    # 只含电阻与电源的部分，电容开路、电感以伴随电导代替
+    static = Netlist(netlist.num_nodes)
+    capacitor_index, inductor_index = [], []
+    for i, (kind, n1, n2, value) in enumerate(netlist.elements):
+        if kind == 'C':
+            capacitor_index.append(i)
+        elif kind == 'L':
+            inductor_index.append(i)
+        else:
+            static.add(kind, n1, n2, value)
+    G, b = stamp_MNA_sparse(static)
+    size = G.shape[0]
+
+    C = np.array([netlist.elements[i][3] for i in capacitor_index], dtype=float)
+    L = np.array([netlist.elements[i][3] for i in inductor_index], dtype=float)
+    P_C = incidence_matrix([netlist.elements[i][1:3] for i in capacitor_index], size)
+    P_L = incidence_matrix([netlist.elements[i][1:3] for i in inductor_index], size)
+    factor = 2.0 if method == 'trap' else 1.0
+    G_C = factor * C / h
+    G_L = h / (factor * L)
+
+    A = (G + P_C.T @ sps.diags(G_C) @ P_C + P_L.T @ sps.diags(G_L) @ P_L).tocsc()
+    lu = factor_MNA(A)
+
+    # 写入磁盘时只保留 CHUNK_ROWS 行的缓冲区，第 n 步存放在第 n % buffer_rows 行，缓冲区写满后整块写出
+    num_nodes = netlist.num_nodes
+    elements = capacitor_index + inductor_index
+    writer = None
+    if store is not None:
+        columns = (['t'] + ['v{}'.format(i) for i in range(num_nodes)] +
+                   ['iV{}'.format(k) for k in range(size - num_nodes)] + ['i{}'.format(i) for i in elements])
+        writer = store.create(key, columns, rows)
+    buffer_rows = min(rows, CHUNK_ROWS) if writer is not None else rows
+
+    def flush(start: int, count: int):
+        times = (start + np.arange(count)) * h
+        writer.write(start, times[:, None], x[:count], i_C[:count], i_L[:count])
+
+    x = np.zeros((buffer_rows, size))
+    i_C = np.zeros((buffer_rows, len(C)))
+    i_L = np.zeros((buffer_rows, len(L)))
+    x[0], i_C[0] = initial_state(netlist, capacitor_index)
+    v_C, v_L = P_C @ x[0], P_L @ x[0]
+    logger.info('瞬态仿真：{}步，{}阶，方法{}'.format(num_steps, size, method))
+
+    prev = 0
+    for n in range(1, rows):
+        k = n % buffer_rows
+        if k == 0:
+            flush(n - buffer_rows, buffer_rows)
+        # 电容：i = G_C * v - I_C；电感：i = G_L * v + I_L
+        if method == 'trap':
+            I_C = G_C * v_C + i_C[prev]
+            I_L = i_L[prev] + G_L * v_L
+        else:
+            I_C = G_C * v_C
+            I_L = i_L[prev]
+        rhs = b + P_C.T @ I_C - P_L.T @ I_L
+        x[k] = lu.solve(rhs)
+        v_C, v_L = P_C @ x[k], P_L @ x[k]
+        i_C[k] = G_C * v_C - I_C
+        i_L[k] = G_L * v_L + I_L
+        prev = k
+
+    if writer is not None:
+        start = (rows - 1) // buffer_rows * buffer_rows
+        flush(start, rows - start)
+        writer.close({'num_nodes': num_nodes, 'num_sources': size - num_nodes, 'elements': elements,
+                      't_stop': t_stop, 't_step': t_step, 'method': method})
+        return load_transient(store, key)
+
+    times = np.arange(rows) * h
+    element_currents = {i: i_C[:, k] for k, i in enumerate(capacitor_index)}
+    element_currents.update({i: i_L[:, k] for k, i in enumerate(inductor_index)})
+    return TransientResult(times, x[:, :num_nodes], x[:, num_nodes:], element_currents)
@@ -0,0 +1,159 @@
+# 瞬态仿真结果的磁盘存储：每次运行一个目录，index.json 记录各列名称与行数，
+# 每列（时间、节点电位、电压源电流、电容与电感电流）为一个 .npy 文件；仿真时按块写入，不在内存中保留完整结果，
+# 读取时以内存映射打开，按列切片不复制数据。目录名由网表内容与仿真设置决定，相同的运行直接读取已有结果；
+# 默认保存在用户缓存目录下，总大小超过上限时删除最久未使用的运行
+from log_config import logger
+from .Netlist import Netlist
+
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+
+# 磁盘上所有运行的总大小上限，超过时删除最久未使用的运行
+DEFAULT_MAX_BYTES = 2 * 2 ** 30
+# 仿真时每写入一次磁盘的行数（时刻数）
+CHUNK_ROWS = 1024
+INDEX_FILE = 'index.json'
+STORE_VERSION = 1
+
+
+class ColumnStack:
+    # 若干等长的列按 (行, 列) 二维数组的方式访问：[:, j] 返回该列的切片（内存映射的视图），
+    # 列下标为列表或切片时复制为二维数组
+    def __init__(self, columns: list[np.ndarray], rows: int):
+        self.columns = columns
+        self.shape = (rows, len(columns))
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, key):
+        rows, cols = key if isinstance(key, tuple) else (key, slice(None))
+        if isinstance(cols, (int, np.integer)):
+            return self.columns[cols][rows]
+        selected = np.arange(self.shape[1])[cols]
+        if len(selected) == 0:
+            return np.zeros((len(np.arange(self.shape[0])[rows]), 0))
+        return np.column_stack([self.columns[j][rows] for j in selected])
+
+    def __array__(self, dtype=None, copy=None):
+        array = self[:, :]
+        return array if dtype is None else array.astype(dtype)
+
+
+def default_store_dir() -> str:
+    # 用户缓存目录下的 SimpleEDA/waveforms（Windows 为 %LOCALAPPDATA%，其他系统为 $XDG_CACHE_HOME 或 ~/.cache）
+    base = os.environ.get('LOCALAPPDATA') if os.name == 'nt' else os.environ.get('XDG_CACHE_HOME')
+    base = base or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'SimpleEDA', 'waveforms')
+
+
+def directory_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def run_key(netlist: Netlist, *settings) -> str:
+    # 网表内容（含子电路实例）与仿真设置的摘要；节点、元件的编号应与会话无关（如按名称排序，见 CircuitTopology）
+    instances = tuple((subcircuit.getKey(), nodes) for subcircuit, nodes in netlist.instances)
+    content = (netlist.num_nodes, netlist.kinds.tobytes(), netlist.n1.tobytes(), netlist.n2.tobytes(),
+               netlist.values.tobytes(), instances, settings)
+    return hashlib.sha1(repr(content).encode()).hexdigest()
+
+
+class WaveformWriter:
+    # 先写入临时目录，close 时写入索引并改名，未完成的运行不会被当作已有结果读取
+    def __init__(self, path: str, columns: list[str], rows: int, store: 'WaveformStore'):
+        self.path = path
+        self.store = store
+        self.tmp_path = path + '.tmp'
+        shutil.rmtree(self.tmp_path, ignore_errors=True)
+        os.makedirs(self.tmp_path)
+        self.names = columns
+        self.rows = rows
+        self.columns = [np.lib.format.open_memmap(os.path.join(self.tmp_path, '{}.npy'.format(j)), mode='w+',
+                                                  dtype=np.float64, shape=(rows,))
+                        for j in range(len(columns))]
+
+    def write(self, start: int, *blocks: np.ndarray):
+        # 每个块的每行为一个时刻，各块的列依次对应 columns，写入前不拼接
+        j = 0
+        for block in blocks:
+            for k in range(block.shape[1]):
+                self.columns[j][start:start + len(block)] = block[:, k]
+                j += 1
+
+    def close(self, meta: dict):
+        for column in self.columns:
+            column.flush()
+        self.columns = []
+        index = {'version': STORE_VERSION, 'rows': self.rows, 'columns': self.names, **meta}
+        with open(os.path.join(self.tmp_path, INDEX_FILE), 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.tmp_path, self.path)
+        self.store.evict(keep=os.path.basename(self.path))
+
+
+class WaveformStore:
+    # root 为 None 时使用 default_store_dir()；每写完一次运行按 max_bytes 淘汰最久未使用的运行
+    def __init__(self, root: str | None = None, max_bytes: int | None = DEFAULT_MAX_BYTES):
+        self.root = root or default_store_dir()
+        self.max_bytes = max_bytes
+
+    def getPath(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def create(self, key: str, columns: list[str], rows: int) -> WaveformWriter:
+        os.makedirs(self.root, exist_ok=True)
+        return WaveformWriter(self.getPath(key), columns, rows, self)
+
+    def load(self, key: str) -> tuple[dict, dict[str, np.ndarray]] | None:
+        # 返回索引与列名到只读内存映射数组的映射；没有该运行（或版本不符）时返回 None
+        path = self.getPath(key)
+        try:
+            with open(os.path.join(path, INDEX_FILE), encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get('version') != STORE_VERSION:
+            return None
+        columns = {name: np.load(os.path.join(path, '{}.npy'.format(j)), mmap_mode='r')
+                   for j, name in enumerate(index['columns'])}
+        # 索引文件的修改时间记录最近一次使用，供淘汰时排序
+        os.utime(os.path.join(path, INDEX_FILE))
+        logger.info('读取波形：{}，{}行，{}列'.format(path, index['rows'], len(columns)))
+        return index, columns
+
+    def getRuns(self) -> list[tuple[float, int, str]]:
+        # 已完成的运行：(最近使用时间, 字节数, 键)，按使用时间从早到晚排列
+        if not os.path.isdir(self.root):
+            return []
+        runs = []
+        for entry in os.scandir(self.root):
+            index_path = os.path.join(entry.path, INDEX_FILE)
+            if entry.is_dir() and os.path.exists(index_path):
+                runs.append((os.path.getmtime(index_path), directory_size(entry.path), entry.name))
+        return sorted(runs)
+
+    def evict(self, keep: str | None = None):
+        # 总大小超过 max_bytes 时从最久未使用的运行开始删除，keep 为刚写入的运行，不删除
+        if self.max_bytes is None:
+            return
+        runs = self.getRuns()
+        total = sum(size for _, size, _ in runs)
+        for _, size, key in runs:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.remove(key)
+            total -= size
+            logger.info('删除波形：{}'.format(self.getPath(key)))
+
+    def remove(self, key: str):
+        shutil.rmtree(self.getPath(key), ignore_errors=True)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
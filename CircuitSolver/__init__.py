@@ -0,0 +1,54 @@
+# 子模块按需导入：只用数值引擎时不加载 sympy、scipy.signal 等较重的依赖，缩短命令行工具的启动时间
+import importlib
+import sys
+
+# 先完成日志配置，避免之后按需导入子模块时把调用方设置的日志级别重置为 INFO
+from log_config import logger  # noqa: F401
+from .Netlist import Netlist, GND
+
+_EXPORTS = {
+    'stamp_MNA_sparse': 'NumericEngine', 'solve_MNA_sparse': 'NumericEngine',
+    'solve_numeric': 'NumericEngine', 'SingularCircuitError': 'NumericEngine',
+    'stamp_MNA_poly': 'PolyEngine', 'solve_MNA_poly': 'PolyEngine',
+    'factor_MNA_poly': 'PolyEngine', 'PolyFactorization': 'PolyEngine',
+    'inverse_laplace': 'InverseLaplace', 'TimeDomainResult': 'InverseLaplace',
+    'inverse_laplace_many': 'InverseLaplace', 'InverseLaplaceTimeoutError': 'InverseLaplace',
+    'TimeDomainCache': 'TimeDomainCache',
+    'simulate_transient': 'TransientEngine', 'TransientResult': 'TransientEngine',
+    'load_transient': 'TransientEngine', 'WaveformStore': 'Waveforms',
+    'IncrementalSolver': 'IncrementalSolver',
+    'sweep_values': 'Sweep', 'SweepResult': 'Sweep',
+    'run_monte_carlo': 'MonteCarlo', 'default_tolerances': 'MonteCarlo',
+    'Tolerance': 'MonteCarlo', 'MonteCarloStats': 'MonteCarlo', 'MonteCarloJob': 'MonteCarlo',
+    'circuit_poles': 'TimeGrid', 'time_scales': 'TimeGrid', 'adaptive_time_grid': 'TimeGrid',
+    'auto_time_step': 'TimeGrid',
+    'dc_operating_point': 'DCAnalysis', 'DCResult': 'DCAnalysis',
+    'ac_analysis': 'ACAnalysis', 'frequency_grid': 'ACAnalysis', 'ACResult': 'ACAnalysis',
+    'Circuit': 'CircuitFile', 'load_circuit': 'CircuitFile', 'save_circuit': 'CircuitFile',
+    'CircuitFileError': 'CircuitFile',
+    'DisjointSet': 'DisjointSet', 'DynamicConnectivity': 'DynamicConnectivity',
+    'SolveJob': 'SolveJob', 'solve_symbolic': 'SolveJob', 'solve_symbolic_factored': 'SolveJob',
+    'split_components': 'Components', 'solve_components': 'Components',
+    'reduce_order': 'Reduction', 'compare_reduced': 'Reduction', 'ReducedModel': 'Reduction',
+    'ReductionReport': 'Reduction',
+    'Subcircuit': 'Subcircuits', 'flatten_netlist': 'Subcircuits', 'get_port_model': 'Subcircuits',
+    'Stamp': 'Stamps', 'register_stamp': 'Stamps', 'stamp_MNA_triplets': 'Stamps', 'stamp_MNA_sources': 'Stamps',
+}
+
+__all__ = ['Netlist', 'GND', *_EXPORTS]
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+    importlib.import_module('.' + _EXPORTS[name], __name__)
+    # 导入子模块会把同名的子模块对象绑定到包上（如 TimeDomainCache），这里统一改回导出的对象
+    for export, module_name in _EXPORTS.items():
+        module = sys.modules.get('{}.{}'.format(__name__, module_name))
+        if module is not None:
+            globals()[export] = getattr(module, export)
+    return globals()[name]
+
+
+def __dir__():
+    return __all__
@@ -1,5 +1,26 @@
 from common_import import *
 import CircuitItem as CI
+import CircuitSolver as CS
+from CircuitSolver.SolveJob import STAGES, overall_progress
+from CircuitSolver.TimeGrid import DEFAULT_POINT_BUDGET, MIN_POINTS
+import os
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+
+# 时域波形的计算方式：逆拉氏变换或瞬态仿真（梯形法、后向欧拉）
+TIME_METHODS = {
+    'laplace': '逆拉氏变换',
+    'trap': '瞬态仿真（梯形法）',
+    'be': '瞬态仿真（后向欧拉）',
+}
+
+NETLIST_FILTER = 'SPICE 网表 (*.cir *.sp *.spice *.net);;JSON (*.json)'
+# 导入网表时元件在网格上的间距
+IMPORT_SPACING = 120
+# 求解进度对话框的刻度数，轮询后台求解进程的间隔/ms
+PROGRESS_RANGE = 1000
+POLL_INTERVAL = 50
 
 main_QSS = """
     QMainWindow { 
@@ -116,6 +137,239 @@ class GridScene(qtw.QGraphicsScene):
             y += grid_size
 
 
+class TimeSettingsDialog(qtw.QDialog):
+    def __init__(self, mainWindow: 'MainWindow'):
+        super().__init__()
+        self.mainWindow = mainWindow
+        self.setWindowTitle('时域设置')
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = qtw.QFormLayout()
+        self.setLayout(layout)
+
+        # 自动时由电路的极点确定时长与步长（逆拉氏变换时为自适应加密的时间网格），否则使用下面的设置
+        self.autoCheck = qtw.QCheckBox('由电路极点自动选择')
+        self.autoCheck.setChecked(self.mainWindow.auto_span)
+        layout.addRow('时长与步长', self.autoCheck)
+
+        self.tStopEdit = qtw.QLineEdit(str(self.mainWindow.t_stop))
+        self.tStopEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('仿真时长/s', self.tStopEdit)
+
+        self.tStepEdit = qtw.QLineEdit(str(self.mainWindow.t_step))
+        self.tStepEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('时间步长/s', self.tStepEdit)
+        self.autoCheck.toggled.connect(self.tStopEdit.setDisabled)
+        self.autoCheck.toggled.connect(self.tStepEdit.setDisabled)
+        self.tStopEdit.setDisabled(self.mainWindow.auto_span)
+        self.tStepEdit.setDisabled(self.mainWindow.auto_span)
+
+        self.budgetEdit = qtw.QLineEdit(str(self.mainWindow.point_budget))
+        self.budgetEdit.setValidator(qtg.QIntValidator(MIN_POINTS, 10000000))
+        layout.addRow('求值点数上限', self.budgetEdit)
+
+        self.methodBox = qtw.QComboBox()
+        for method, text in TIME_METHODS.items():
+            self.methodBox.addItem(text, method)
+        self.methodBox.setCurrentIndex(
+            list(TIME_METHODS).index(self.mainWindow.time_method))
+        layout.addRow('计算方式', self.methodBox)
+
+        self.btnBox = qtw.QHBoxLayout()
+        self.addBtn(self.btnBox, '确定', self.validate)
+        self.addBtn(self.btnBox, '取消', self.reject)
+        layout.addRow(self.btnBox)
+
+    def addBtn(self, layout: qtw.QHBoxLayout, text: str, func):
+        btn = qtw.QPushButton(text)
+        btn.clicked.connect(func)
+        layout.addWidget(btn)
+
+    def validate(self):
+        try:
+            t_stop = float(self.tStopEdit.text())
+            t_step = float(self.tStepEdit.text())
+            point_budget = int(self.budgetEdit.text())
+        except ValueError:
+            qtw.QMessageBox.warning(self, '错误', '请输入数值')
+            return
+        if t_stop <= 0 or t_step <= 0 or t_step > t_stop:
+            qtw.QMessageBox.warning(self, '错误', '仿真时长与步长应为正数，且步长不大于时长')
+            return
+        if point_budget < MIN_POINTS:
+            qtw.QMessageBox.warning(self, '错误', '求值点数至少为{}'.format(MIN_POINTS))
+            return
+        self.mainWindow.auto_span = self.autoCheck.isChecked()
+        self.mainWindow.t_stop = t_stop
+        self.mainWindow.t_step = t_step
+        self.mainWindow.point_budget = point_budget
+        self.mainWindow.time_method = self.methodBox.currentData()
+        logger.info('时域设置：{}，点数上限{}，{}'.format(
+            '自动' if self.mainWindow.auto_span else '时长{}s，步长{}s'.format(t_stop, t_step),
+            point_budget, TIME_METHODS[self.mainWindow.time_method]))
+        super().accept()
+
+
+class MonteCarloDialog(qtw.QDialog):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle('蒙特卡洛分析')
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = qtw.QFormLayout()
+        self.setLayout(layout)
+
+        self.numEdit = qtw.QLineEdit('10000')
+        self.numEdit.setValidator(qtg.QIntValidator(1, 100000000))
+        layout.addRow('样本数', self.numEdit)
+
+        self.tolEdit = qtw.QLineEdit('5')
+        self.tolEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('容差/%', self.tolEdit)
+
+        self.distributionBox = qtw.QComboBox()
+        self.distributionBox.addItem('均匀分布', 'uniform')
+        self.distributionBox.addItem('正态分布（容差为3σ）', 'normal')
+        layout.addRow('分布', self.distributionBox)
+
+        self.btnBox = qtw.QHBoxLayout()
+        self.addBtn(self.btnBox, '确定', self.validate)
+        self.addBtn(self.btnBox, '取消', self.reject)
+        layout.addRow(self.btnBox)
+
+    def addBtn(self, layout: qtw.QHBoxLayout, text: str, func):
+        btn = qtw.QPushButton(text)
+        btn.clicked.connect(func)
+        layout.addWidget(btn)
+
+    def validate(self):
+        tol = float(self.tolEdit.text())
+        if tol < 0 or tol >= 100:
+            qtw.QMessageBox.warning(self, '错误', '容差应在 0 ~ 100% 之间')
+            return
+        self.num_samples = int(self.numEdit.text())
+        self.tolerance = CS.Tolerance(
+            tol / 100, self.distributionBox.currentData())
+        super().accept()
+
+
+class ACDialog(qtw.QDialog):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle('交流分析')
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = qtw.QFormLayout()
+        self.setLayout(layout)
+
+        self.startEdit = qtw.QLineEdit('0.001')
+        self.startEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('起始频率/Hz', self.startEdit)
+
+        self.stopEdit = qtw.QLineEdit('1000')
+        self.stopEdit.setValidator(qtg.QDoubleValidator())
+        layout.addRow('终止频率/Hz', self.stopEdit)
+
+        self.pointsEdit = qtw.QLineEdit('1000')
+        self.pointsEdit.setValidator(qtg.QIntValidator(2, 1000000))
+        layout.addRow('频率点数', self.pointsEdit)
+
+        self.btnBox = qtw.QHBoxLayout()
+        self.addBtn(self.btnBox, '确定', self.validate)
+        self.addBtn(self.btnBox, '取消', self.reject)
+        layout.addRow(self.btnBox)
+
+    def addBtn(self, layout: qtw.QHBoxLayout, text: str, func):
+        btn = qtw.QPushButton(text)
+        btn.clicked.connect(func)
+        layout.addWidget(btn)
+
+    def validate(self):
+        try:
+            self.frequencies = CS.frequency_grid(float(self.startEdit.text()), float(self.stopEdit.text()),
+                                                 int(self.pointsEdit.text()))
+        except ValueError as e:
+            qtw.QMessageBox.warning(self, '错误', str(e))
+            return
+        super().accept()
+
+
+class SolveWorker(qtc.QObject):
+    # 在后台进程中进行符号求解，界面线程定时轮询进度，通过信号送出结果
+    progress = qtc.pyqtSignal(str, float)
+    finished = qtc.pyqtSignal(object, object, object)
+    failed = qtc.pyqtSignal(str)
+
+    def __init__(self, solver: CI.CircuitTopology, parent: qtc.QObject = None):
+        super().__init__(parent)
+        # 已有消元记录（修改元件值后只改变了电源数值）时后台只代入新的右端项
+        self.job = CS.SolveJob(solver.netlist, solver.s, solver.t, solver.factorization)
+        self.timer = qtc.QTimer(self)
+        self.timer.setInterval(POLL_INTERVAL)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.job.start()
+        self.timer.start()
+
+    def poll(self):
+        for message in self.job.poll():
+            if message[0] == 'progress':
+                _, stage, fraction = message
+                self.progress.emit(STAGES[stage][0], overall_progress(stage, fraction))
+            elif message[0] == 'result':
+                self.timer.stop()
+                self.finished.emit(message[1], message[2], message[3])
+            else:
+                self.timer.stop()
+                self.failed.emit(message[1])
+
+    def cancel(self):
+        # 终止求解进程，正在进行的消元或逆变换立即停止
+        self.timer.stop()
+        self.job.cancel()
+
+
+class MonteCarloWorker(qtc.QObject):
+    # 在后台进程中进行蒙特卡洛分析，界面线程定时轮询，每收到新的样本送出累积的统计
+    progress = qtc.pyqtSignal(object)
+    finished = qtc.pyqtSignal(object)
+    failed = qtc.pyqtSignal(str)
+
+    def __init__(self, job: CS.MonteCarloJob, num_outputs: int, parent: qtc.QObject = None):
+        super().__init__(parent)
+        self.job = job
+        self.stats = CS.MonteCarloStats(num_outputs)
+        self.timer = qtc.QTimer(self)
+        self.timer.setInterval(POLL_INTERVAL)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.job.start()
+        self.timer.start()
+
+    def poll(self):
+        messages = self.job.poll()
+        samples = [message[1] for message in messages if message[0] == 'samples']
+        if samples:
+            self.stats.add(np.vstack(samples))
+            self.progress.emit(self.stats)
+        for message in messages:
+            if message[0] == 'result':
+                self.timer.stop()
+                self.finished.emit(self.stats)
+            elif message[0] == 'error':
+                self.timer.stop()
+                self.failed.emit(message[1])
+
+    def cancel(self):
+        self.timer.stop()
+        self.job.cancel()
+
+
 class MainBtn(qtw.QPushButton):
     def __init__(self, text: str, parent: qtw.QWidget = None):
         super().__init__(text, parent)
@@ -127,6 +381,14 @@ class MainWindow(qtw.QMainWindow):
     _linked_item_node_pairs: set[tuple[CI.ItemNode, CI.ItemNode]]
     item_nodes: set[CI.ItemNode]
     solved = False
+    solver: CI.CircuitTopology | None = None
+    solveWorker: SolveWorker | None = None
+    monteCarloWorker: MonteCarloWorker | None = None
+    t_stop = 100.0
+    t_step = 0.1
+    time_method = 'laplace'
+    auto_span = True
+    point_budget = DEFAULT_POINT_BUDGET
 
     def __init__(self):
         super().__init__()
@@ -137,6 +399,9 @@ class MainWindow(qtw.QMainWindow):
 
         self.item_nodes = set()
         self._linked_item_node_pairs = set()
+        self.connectivity = CI.LiveConnectivity()
+        self.updateConnectivityStatus()
+        self.waveform_store = CS.WaveformStore()
 
     def setup_ui(self):
         self.scene = GridScene()
@@ -160,12 +425,33 @@ class MainWindow(qtw.QMainWindow):
             clearBtn = MainBtn('清空')
             clearBtn.clicked.connect(self.clearItems)
             btnLayout.addWidget(clearBtn)
+            timeSettingsBtn = MainBtn('时域设置')
+            timeSettingsBtn.clicked.connect(self.showTimeSettings)
+            btnLayout.addWidget(timeSettingsBtn)
+            monteCarloBtn = MainBtn('蒙特卡洛分析')
+            monteCarloBtn.clicked.connect(self.monteCarlo)
+            btnLayout.addWidget(monteCarloBtn)
+            acBtn = MainBtn('交流分析')
+            acBtn.clicked.connect(self.acAnalysis)
+            btnLayout.addWidget(acBtn)
+            exportBtn = MainBtn('导出网表')
+            exportBtn.clicked.connect(self.exportNetlist)
+            btnLayout.addWidget(exportBtn)
             return btnLayout
         for itemType in CI.ADD_ITEM_TYPES:
             self.addItemBtn(btnLayout, itemType)
+        importBtn = MainBtn('导入网表')
+        importBtn.clicked.connect(self.importNetlist)
+        btnLayout.addWidget(importBtn)
+        exportBtn = MainBtn('导出网表')
+        exportBtn.clicked.connect(self.exportNetlist)
+        btnLayout.addWidget(exportBtn)
         solveBtn = MainBtn('求解')
         solveBtn.clicked.connect(self.solve)
         btnLayout.addWidget(solveBtn)
+        dcBtn = MainBtn('直流工作点')
+        dcBtn.clicked.connect(self.dcOperatingPoint)
+        btnLayout.addWidget(dcBtn)
         return btnLayout
 
     def onAfterSolve(self, solved: bool):
@@ -207,34 +493,348 @@ class MainWindow(qtw.QMainWindow):
             if (node1, node2) in self._linked_item_node_pairs:
                 logger.info('连接已存在，取消连接')
                 return
+            self.linkNodes(node1, node2)
+            self.scene.update()
 
-            self._linked_item_node_pairs.add((node1, node2))
-            self._linked_item_node_pairs.add((node2, node1))
+    def linkNodes(self, node1: CI.ItemNode, node2: CI.ItemNode):
+        self._linked_item_node_pairs.add((node1, node2))
+        self._linked_item_node_pairs.add((node2, node1))
 
-            wire = CI.WireItem(node1, node2)
-            self.scene.addItem(wire)
-            self.scene.update()
-            self.item_nodes.add(node1)
-            self.item_nodes.add(node2)
+        wire = CI.WireItem(node1, node2)
+        self.scene.addItem(wire)
+        self.item_nodes.add(node1)
+        self.item_nodes.add(node2)
+        self.connectivity.addWire(node1, node2)
+        self.updateConnectivityStatus()
+
+    def unlinkNodes(self, node1: CI.ItemNode, node2: CI.ItemNode):
+        # 删除导线后，不再连有导线的元件节点移出电路
+        self._linked_item_node_pairs.remove((node1, node2))
+        self._linked_item_node_pairs.remove((node2, node1))
+        for node in self.connectivity.removeWire(node1, node2):
+            self.item_nodes.discard(node)
+        self.updateConnectivityStatus()
+
+    def updateConnectivityStatus(self):
+        floating = self.connectivity.getFloatingNodes()
+        message = '电路节点：{}'.format(self.connectivity.getNodesNum())
+        if floating:
+            message += '，悬空的元件节点：{}'.format(len(floating))
+        self.statusBar().showMessage(message)
 
     def solve(self):
+        if self.solveWorker is not None:
+            return
+        progress = self.solveProgressDialog()
         try:
-            solver = CI.CircuitTopology(self.item_nodes)
-            martrix = solver.get_MNA_matrix()
-            self.onAfterSolve(True)
+            floating = self.connectivity.getFloatingNodes()
+            if floating:
+                logger.warning('存在悬空的元件节点：{}'.format(
+                    ','.join(sorted('{}({})'.format(node.getName(), node.parentItem().getName()) for node in floating))))
+            # 拓扑与网表在界面线程中构建，耗时的方程求解与逆拉氏变换放到后台进程
+            solver = CI.CircuitTopology(self.item_nodes, solve=False, groups=self.connectivity.getGroups(),
+                                        waveform_store=self.waveform_store)
+            solver.checkGround()
         except Exception as e:
+            progress.close()
             logger.error(e)
             qtw.QMessageBox.critical(self, '错误', str(e))
             return
 
-        logger.info('求解')
-        logger.info(solver)
-        logger.info('MNA矩阵：' + str(martrix))
+        self.startSolveJob(solver, progress)
+
+    def startSolveJob(self, solver: CI.CircuitTopology, progress: qtw.QProgressDialog | None = None, abort=None):
+        # 在后台进程中求解 solver 的网表，完成后作为当前的解；求解失败或取消时调用 abort
+        if progress is None:
+            progress = self.solveProgressDialog()
+        worker = SolveWorker(solver, self)
+        self.solveWorker = worker
+
+        def report(stage: str, value: float):
+            progress.setLabelText(stage)
+            progress.setValue(int(value * PROGRESS_RANGE))
+
+        def finish(solution: list, time_domain: list[CS.TimeDomainResult], factorization: CS.PolyFactorization):
+            self.solveWorker = None
+            progress.close()
+            try:
+                solver.setSolution(solution, time_domain, factorization)
+            except Exception as e:
+                logger.error(e)
+                qtw.QMessageBox.critical(self, '错误', str(e))
+                if abort is not None:
+                    abort()
+                return
+            self.solver = solver
+            self.onAfterSolve(True)
+            logger.info('求解')
+            logger.info(solver)
+            logger.info(solver.netlist)
+            logger.info(solver.output())
+
+        def fail(message: str):
+            self.solveWorker = None
+            progress.close()
+            if abort is not None:
+                abort()
+            qtw.QMessageBox.critical(self, '错误', message)
+
+        def cancel():
+            if self.solveWorker is not worker:
+                return
+            self.solveWorker = None
+            worker.cancel()
+            progress.close()
+            if abort is not None:
+                abort()
+            self.statusBar().showMessage('已取消求解')
+
+        worker.progress.connect(report)
+        worker.finished.connect(finish)
+        worker.failed.connect(fail)
+        progress.canceled.connect(cancel)
+        report(STAGES['stamping'][0], overall_progress('stamping', 0))
+        worker.start()
+
+    def solveProgressDialog(self) -> qtw.QProgressDialog:
+        progress = qtw.QProgressDialog(STAGES['topology'][0], '取消', 0, PROGRESS_RANGE, self)
+        progress.setWindowTitle('求解')
+        progress.setWindowModality(qtc.Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(500)
+        progress.setAutoReset(False)
+        progress.setAutoClose(False)
+        return progress
+
+    def updateItemValue(self, item: CI.BaseCircuitItem, old_value: float):
+        # 求解后修改元件值：数值引擎增量更新，立即完成；符号引擎在后台重新求解（修改电源时不重新消元），
+        # 取消或求解失败时恢复原来的元件值，当前的解保持不变
+        solver = self.solver
+        if self.solveWorker is not None:
+            item.set_value(old_value)
+            return
+        solver.update_item_value(item)
+        if solver.engine == 'numeric':
+            logger.info(solver.output())
+            return
+
+        def restore():
+            item.set_value(old_value)
+            solver.update_item_value(item)
+
+        self.startSolveJob(solver, abort=restore)
+
+    def dcOperatingPoint(self):
+        # 只求直流稳态：数值引擎在 s→0 处一次稀疏分解，节点电位为浮点数，直接在界面线程中完成
+        if self.solveWorker is not None:
+            return
+        start = time.perf_counter()
+        try:
+            solver = CI.CircuitTopology(self.item_nodes, engine='numeric', groups=self.connectivity.getGroups(),
+                                        waveform_store=self.waveform_store)
+        except Exception as e:
+            logger.error(e)
+            qtw.QMessageBox.critical(self, '错误', str(e))
+            return
+        self.solver = solver
+        self.onAfterSolve(True)
+        self.statusBar().showMessage('直流工作点求解完成，耗时{:.1f} ms'.format((time.perf_counter() - start) * 1000))
+        logger.info('直流工作点')
+        logger.info(solver.netlist)
         logger.info(solver.output())
 
+    def closeEvent(self, event: qtg.QCloseEvent):
+        # 求解进程不是守护进程，退出前先终止，避免程序退出时等待求解结束
+        if self.solveWorker is not None:
+            self.solveWorker.cancel()
+            self.solveWorker = None
+        if self.monteCarloWorker is not None:
+            self.monteCarloWorker.cancel()
+            self.monteCarloWorker = None
+        super().closeEvent(event)
+
+    def showTimeSettings(self):
+        dialog = TimeSettingsDialog(self)
+        dialog.exec()
+
+    def monteCarlo(self):
+        # 抽样求解在后台进程中进行（其中再按 CPU 核数并行），进度对话框随新到达的样本更新统计，可随时取消
+        if self.monteCarloWorker is not None:
+            return
+        dialog = MonteCarloDialog()
+        if dialog.exec() != qtw.QDialog.DialogCode.Accepted:
+            return
+
+        nodes = self.solver.getNotGNDNodes()
+        try:
+            job = self.solver.monte_carlo_job(dialog.num_samples, dialog.tolerance)
+        except Exception as e:
+            logger.error(e)
+            qtw.QMessageBox.critical(self, '错误', str(e))
+            return
+        progress = qtw.QProgressDialog(
+            '蒙特卡洛分析', '取消', 0, dialog.num_samples, self)
+        progress.setWindowTitle('蒙特卡洛分析')
+        progress.setWindowModality(qtc.Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setAutoReset(False)
+        progress.setAutoClose(False)
+        worker = MonteCarloWorker(job, len(nodes), self)
+        self.monteCarloWorker = worker
+
+        def report(stats: CS.MonteCarloStats):
+            # 显示已完成样本的中位数与 5%/95% 分位数
+            low, median, high = stats.percentiles((5, 50, 95))
+            progress.setValue(len(stats))
+            progress.setLabelText('\n'.join('{}: {:.4g}V [{:.4g}, {:.4g}]'.format(
+                node.getName(), median[i], low[i], high[i]) for i, node in enumerate(nodes)))
+
+        def finish(stats: CS.MonteCarloStats):
+            self.monteCarloWorker = None
+            progress.close()
+            self.showMonteCarlo(nodes, stats)
+
+        def fail(message: str):
+            self.monteCarloWorker = None
+            progress.close()
+            qtw.QMessageBox.critical(self, '错误', message)
+
+        def cancel():
+            if self.monteCarloWorker is not worker:
+                return
+            self.monteCarloWorker = None
+            worker.cancel()
+            progress.close()
+            self.statusBar().showMessage('已取消蒙特卡洛分析')
+
+        worker.progress.connect(report)
+        worker.finished.connect(finish)
+        worker.failed.connect(fail)
+        progress.canceled.connect(cancel)
+        worker.start()
+
+    def showMonteCarlo(self, nodes: list[CI.CircuitNode], stats: CS.MonteCarloStats):
+        percentiles = stats.percentiles()
+        for i, node in enumerate(nodes):
+            logger.info('{}: 均值{:.6g}V，标准差{:.6g}V，分位数(1/5/50/95/99%) {}'.format(
+                node.getName(), stats.mean()[i], stats.std()[i], percentiles[:, i]))
+
+        fig, axes = plt.subplots(len(nodes), 1, squeeze=False)
+        for ax, i, node in zip(axes[:, 0], range(len(nodes)), nodes):
+            ax.hist(stats.samples[:, i], bins=50)
+            ax.set_title('{}: 5%={:.4g}V, 50%={:.4g}V, 95%={:.4g}V'.format(
+                node.getName(), percentiles[1, i], percentiles[2, i], percentiles[3, i]))
+            ax.set_xlabel('稳态电位/V')
+            ax.grid(True)
+        fig.suptitle('蒙特卡洛分析（{}个样本）'.format(len(stats)))
+        fig.tight_layout()
+        plt.show()
+
+    def acAnalysis(self):
+        dialog = ACDialog()
+        if dialog.exec() != qtw.QDialog.DialogCode.Accepted:
+            return
+
+        try:
+            result = self.solver.run_ac_analysis(dialog.frequencies)
+        except Exception as e:
+            logger.error(e)
+            qtw.QMessageBox.critical(self, '错误', str(e))
+            return
+
+        fig, (ax_mag, ax_phase) = plt.subplots(2, 1, sharex=True)
+        for i, node in enumerate(self.solver.getNotGNDNodes()):
+            ax_mag.semilogx(result.frequencies, result.getMagnitude(i), label=node.getName())
+            ax_phase.semilogx(result.frequencies, result.getPhase(i), label=node.getName())
+        ax_mag.set_ylabel('幅值/dB')
+        ax_phase.set_ylabel('相位/°')
+        ax_phase.set_xlabel('频率/Hz')
+        for ax in (ax_mag, ax_phase):
+            ax.grid(True, which='both')
+            ax.legend()
+        fig.suptitle('交流分析（波特图）')
+        plt.show()
+
+    def importNetlist(self):
+        path, _ = qtw.QFileDialog.getOpenFileName(self, '导入网表', '', NETLIST_FILTER)
+        if not path:
+            return
+        try:
+            circuit = CS.load_circuit(path)
+        except Exception as e:
+            logger.error(e)
+            qtw.QMessageBox.critical(self, '错误', str(e))
+            return
+        if not self.buildCircuit(circuit):
+            return
+        logger.info('导入网表 {}：{}个元件'.format(path, len(circuit.netlist)))
+
+    def buildCircuit(self, circuit: CS.Circuit) -> bool:
+        # 元件按网格排列，同一网络上的元件节点依次用导线相连，地网络连接到一个接地元件
+        # 画布上没有子电路元件，子电路实例展开为普通元件；
+        # 含界面上没有对应图元的元件类型（如经 register_stamp 注册的类型）时不导入，返回 False
+        netlist = CS.flatten_netlist(circuit.netlist)
+        unsupported = sorted({kind for kind, *_ in netlist.elements if kind not in CI.ELEMENT_ITEM_TYPES})
+        if unsupported:
+            message = '界面不支持元件类型：{}'.format('、'.join(unsupported))
+            logger.warning(message)
+            qtw.QMessageBox.warning(self, '错误', message)
+            return False
+        columns = max(1, int(np.ceil(np.sqrt(len(netlist)))))
+        nets: dict[int, list[CI.ItemNode]] = {}
+        for i, (kind, n1, n2, value) in enumerate(netlist.elements):
+            item = CI.ELEMENT_ITEM_TYPES[kind](value)
+            item.setPos(IMPORT_SPACING * (i % columns), IMPORT_SPACING * (i // columns))
+            self.scene.addItem(item)
+            nets.setdefault(n1, []).append(item.nodes[0])
+            nets.setdefault(n2, []).append(item.nodes[1])
+        if CS.GND in nets:
+            ground = CI.GroundItem()
+            ground.setPos(-IMPORT_SPACING, 0)
+            self.scene.addItem(ground)
+            nets[CS.GND].insert(0, ground.nodes[0])
+        for nodes in nets.values():
+            for node1, node2 in zip(nodes, nodes[1:]):
+                self.linkNodes(node1, node2)
+        self.scene.update()
+        return True
+
+    def exportNetlist(self):
+        path, _ = qtw.QFileDialog.getSaveFileName(self, '导出网表', 'circuit.cir', NETLIST_FILTER)
+        if not path:
+            return
+        try:
+            solver = self.solver if self.solver is not None else CI.CircuitTopology(
+                self.item_nodes, solve=False, groups=self.connectivity.getGroups())
+            circuit = solver.getCircuit(os.path.splitext(os.path.basename(path))[0])
+            CS.save_circuit(circuit, path)
+        except Exception as e:
+            logger.error(e)
+            qtw.QMessageBox.critical(self, '错误', str(e))
+            return
+        logger.info('导出网表 {}：{}个元件'.format(path, len(circuit.netlist)))
+
+    def getTimeSpan(self, poles: np.ndarray | None = None) -> tuple[float, float | None]:
+        # (显示时长, 最快时间尺度)：优先使用电路的极点，无法计算时使用波形自身的极点（poles）；
+        # 关闭自动选择或没有可用的极点时，时长取时域设置中的值
+        scales = self.solver.getTimeScales() or CS.time_scales(poles)
+        t_fast = scales[0] if scales is not None else None
+        if self.auto_span and scales is not None:
+            return scales[1], t_fast
+        return self.t_stop, t_fast
+
+    def getTimeStep(self, t_stop: float, t_fast: float | None) -> float:
+        if self.auto_span:
+            return CS.auto_time_step(t_stop, t_fast, self.point_budget)
+        return self.t_step
+
     def clearItems(self):
+        if self.solver is not None:
+            self.solver.time_domain_cache.clear()
+            self.solver = None
         self.item_nodes.clear()
         self._linked_item_node_pairs.clear()
+        self.connectivity.clear()
+        self.updateConnectivityStatus()
         self._selected_node = None
         self.scene.clear()
         self.scene.update()
@@ -0,0 +1,40 @@
+# 比较逐点调用数值引擎与交流分析（稠密 QZ / 稀疏 LU）在 10^4 个频率点上的耗时
+# 运行：python -m benchmarks.bench_ac（在项目根目录下）
+import logging
+import time
+
+import numpy as np
+
+import CircuitSolver as CS
+from benchmarks.bench_incremental import build_rc_ladder_netlist
+
+NUM_POINTS = 10000
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    frequencies = CS.frequency_grid(1e-3, 1e3, NUM_POINTS)
+    print('{:>8} {:>12} {:>12} {:>12} {:>12}'.format(
+        'nodes', 'pointwise/s', 'dense/s', 'sparse/s', 'max error'))
+    for sections in (50, 200, 500):
+        netlist = build_rc_ladder_netlist(sections)
+        output = [netlist.num_nodes - 1]
+
+        # 逐点调用阶跃响应的数值引擎，乘以 s 还原为相量幅值
+        start = time.perf_counter()
+        pointwise = np.array([CS.solve_numeric(netlist, s)[output] * s for s in 2j * np.pi * frequencies])
+        pointwise_time = time.perf_counter() - start
+
+        times, errors = [], []
+        for dense in (True, False):
+            start = time.perf_counter()
+            result = CS.ac_analysis(netlist, frequencies, output, dense=dense)
+            times.append(time.perf_counter() - start)
+            errors.append(np.max(np.abs(result.responses - pointwise)))
+
+        print('{:>8} {:12.4f} {:12.4f} {:12.4f} {:12.2e}'.format(
+            sections + 1, pointwise_time, *times, max(errors)))
+
+
+if __name__ == '__main__':
+    main()
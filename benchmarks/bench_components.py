@@ -0,0 +1,50 @@
+# 比较多个独立电路整体符号求解与按连通分量拆分（串行、进程池并行）求解的耗时
+# 运行：python -m benchmarks.bench_components（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import sympy as sp  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+from CircuitSolver.PolyEngine import solve_MNA_poly_whole  # noqa: E402
+
+
+def build_ladders(circuits: int, sections: int) -> CS.Netlist:
+    # circuits 个互不相连的 RC 梯形电路，节点编号打乱，模拟同一画布上的多个电路
+    total = circuits * (sections + 1)
+    index = np.random.default_rng(0).permutation(total)
+    netlist = CS.Netlist(total)
+    for c in range(circuits):
+        nodes = [int(index[c * (sections + 1) + k]) for k in range(sections + 1)]
+        netlist.add('V', nodes[0], CS.GND, 1.0 + c)
+        for k in range(sections):
+            netlist.add('R', nodes[k], nodes[k + 1], 1 + 0.1 * k + 0.01 * c)
+            netlist.add('C', nodes[k + 1], CS.GND, 0.5 + 0.05 * k)
+    return netlist
+
+
+def timeit(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    s = sp.symbols('s', complex=True)
+    workers = os.cpu_count() or 1
+    print('{} 个 CPU'.format(workers))
+    print('{:>10} {:>10} {:>10} {:>12} {:>12}'.format('circuits', 'sections', 'whole/s', 'split/s', 'parallel/s'))
+    for circuits, sections in ((4, 6), (8, 8), (8, 12)):
+        netlist = build_ladders(circuits, sections)
+        print('{:>10} {:>10} {:10.3f} {:12.3f} {:12.3f}'.format(
+            circuits, sections, timeit(solve_MNA_poly_whole, netlist, s),
+            timeit(CS.solve_MNA_poly, netlist, s, workers=1), timeit(CS.solve_MNA_poly, netlist, s, workers=workers)))
+
+
+if __name__ == '__main__':
+    main()
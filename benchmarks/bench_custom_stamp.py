@@ -0,0 +1,63 @@
+# 在 CircuitSolver 包外注册新的元件类型（电导 G，数值为西门子），不修改 Netlist 与组装代码，
+# 与等效的电阻网络比较直流、交流与符号求解的结果，以及组装 MNA 矩阵的耗时
+# 运行：python -m benchmarks.bench_custom_stamp（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import sympy as sp  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+
+
+def conductance_admittance(values, s):
+    return values
+
+
+CS.register_stamp(CS.Stamp('G', admittance=conductance_admittance))
+
+
+def build_ladder(sections: int, kind: str) -> CS.Netlist:
+    # RC 梯形网络，串联支路为电阻（kind 为 'R'）或与之等效的电导（kind 为 'G'），阻值取 2 的幂使倒数是精确的
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        resistance = 2.0 ** (k % 4 - 1)
+        netlist.add(kind, k, k + 1, resistance if kind == 'R' else 1 / resistance)
+        netlist.add('C', k + 1, CS.GND, 0.5)
+    netlist.add('I', CS.GND, sections, 1e-3)
+    return netlist
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('{:>10} {:>10} {:>10} {:>12} {:>12}'.format('elements', 'R/ms', 'G/ms', 'dc diff', 'ac diff'))
+    frequencies = CS.frequency_grid(1e-2, 1e2, 50)
+    for sections in (1000, 10000, 100000):
+        resistors, conductances = build_ladder(sections, 'R'), build_ladder(sections, 'G')
+        dc = np.abs(CS.dc_operating_point(resistors).node_voltages -
+                    CS.dc_operating_point(conductances).node_voltages).max()
+        ac = np.abs(CS.ac_analysis(resistors, frequencies).responses -
+                    CS.ac_analysis(conductances, frequencies).responses).max()
+        print('{:>10} {:10.2f} {:10.2f} {:12.2e} {:12.2e}'.format(
+            len(resistors), timeit(CS.stamp_MNA_sparse, resistors) * 1000,
+            timeit(CS.stamp_MNA_sparse, conductances) * 1000, dc, ac))
+
+    # 符号引擎按印记的导纳写入注册的元件类型
+    s = sp.symbols('s', complex=True)
+    resistors, conductances = build_ladder(4, 'R'), build_ladder(4, 'G')
+    diff = [sp.simplify(a - b) for a, b in zip(CS.solve_MNA_poly(resistors, s), CS.solve_MNA_poly(conductances, s))]
+    print('符号解一致：{}'.format(all(d == 0 for d in diff)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# 比较只需要稳态节点电位时，符号求解加逆拉氏变换与直流工作点（s→0 处一次稀疏分解）的耗时
+# 运行：python -m benchmarks.bench_dc（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import sympy as sp  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+
+
+def build_grid(k: int) -> CS.Netlist:
+    # k x k 电阻网格，左上角接电压源、右下角接电流源，部分节点对地接电容，每行首段为电感
+    netlist = CS.Netlist(k * k)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('I', CS.GND, k * k - 1, 1e-3)
+    for i in range(k):
+        for j in range(k):
+            node = i * k + j
+            if i + 1 < k:
+                netlist.add('R', node, node + k, 1.0 + 0.1 * ((i + j) % 5))
+            if j + 1 < k:
+                netlist.add('L' if j == 0 else 'R', node, node + 1, 1.0 + 0.1 * (i * j % 3))
+            if (i + j) % 7 == 0:
+                netlist.add('C', node, CS.GND, 1e-3)
+    netlist.add('R', k * k - 1, CS.GND, 10.0)
+    return netlist
+
+
+def build_ladder(sections: int) -> CS.Netlist:
+    # 电压源驱动的电阻梯形网络，每节一个串联电阻、一个对地电阻
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 1.0)
+        netlist.add('R', k + 1, CS.GND, 100.0 + k % 7)
+    return netlist
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    s, t = sp.symbols('s', complex=True), sp.symbols('t', real=True)
+    print('{:>8} {:>10} {:>12} {:>10} {:>12}'.format('grid', 'elements', 'symbolic/s', 'dc/ms', 'max diff'))
+    for k in (3, 4, 5):
+        netlist = build_grid(k)
+        start = time.perf_counter()
+        _, time_domain = CS.solve_symbolic(netlist, s, t)
+        symbolic = time.perf_counter() - start
+        start = time.perf_counter()
+        result = CS.dc_operating_point(netlist)
+        dc = time.perf_counter() - start
+        # 符号解在 t→∞ 的极限即直流稳态
+        steady = np.array([float(sp.limit(r.expr, t, sp.oo)) for r in time_domain[:netlist.num_nodes]])
+        print('{:>8} {:>10} {:12.3f} {:10.3f} {:12.2e}'.format(
+            '{}x{}'.format(k, k), len(netlist), symbolic, dc * 1000,
+            np.abs(steady - result.node_voltages).max()))
+    # 网格的分解填充随规模超线性增长，梯形（树状）网络的分解几乎没有填充
+    for name, netlist in [('{}x{}'.format(k, k), build_grid(k)) for k in (30, 100, 300)] + \
+            [('ladder', build_ladder(sections)) for sections in (10 ** 4, 10 ** 5, 10 ** 6)]:
+        start = time.perf_counter()
+        CS.dc_operating_point(netlist)
+        print('{:>8} {:>10} {:>12} {:10.3f}'.format(name, len(netlist), '-', (time.perf_counter() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# 比较逐个修改元件值时完整重新求解与低秩增量求解的耗时
+# 运行：python -m benchmarks.bench_incremental（在项目根目录下）
+import copy
+import logging
+import time
+
+import numpy as np
+
+import CircuitSolver as CS
+
+NUM_UPDATES = 200
+
+
+def build_rc_ladder_netlist(sections: int) -> CS.Netlist:
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 1 + 0.1 * k)
+        netlist.add('C', k + 1, CS.GND, 0.5 + 0.05 * k)
+    return netlist
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = np.random.default_rng(0)
+    print('{:>8} {:>14} {:>16} {:>12}'.format(
+        'nodes', 'full/update', 'incremental/update', 'max error'))
+    for sections in (100, 1000, 10000):
+        netlist = build_rc_ladder_netlist(sections)
+        updates = [(int(rng.integers(len(netlist))), float(rng.uniform(0.5, 2)))
+                   for _ in range(NUM_UPDATES)]
+
+        full_netlist = copy.deepcopy(netlist)
+        start = time.perf_counter()
+        full = []
+        for index, value in updates:
+            full_netlist.setValue(index, value)
+            full.append(CS.solve_numeric(full_netlist, 1j))
+        full_time = (time.perf_counter() - start) / NUM_UPDATES
+
+        solver = CS.IncrementalSolver(copy.deepcopy(netlist), 1j)
+        start = time.perf_counter()
+        incremental = [solver.update_value(index, value) for index, value in updates]
+        incremental_time = (time.perf_counter() - start) / NUM_UPDATES
+
+        error = max(np.max(np.abs(x - y)) for x, y in zip(full, incremental))
+        print('{:>8} {:14.6f} {:16.6f} {:12.2e}'.format(
+            sections + 1, full_time, incremental_time, error))
+
+
+if __name__ == '__main__':
+    main()
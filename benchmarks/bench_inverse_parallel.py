@@ -0,0 +1,37 @@
+# 比较 CircuitTopology.output() 中串行与进程池并行逆拉氏变换的耗时
+# 运行：python -m benchmarks.bench_inverse_parallel（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CircuitItem as CI  # noqa: E402
+from benchmarks.bench_mna_engines import build_rc_ladder  # noqa: E402
+
+
+def time_output(solver: CI.CircuitTopology, workers: int | None) -> float:
+    solver.time_domain_cache.clear()
+    start = time.perf_counter()
+    solver.output(workers)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    workers = os.cpu_count() or 1
+    print('{} 个 CPU'.format(workers))
+    print('{:>8} {:>12} {:>12} {:>8}'.format('nodes', 'serial/s', 'parallel/s', 'speedup'))
+    for sections in (10, 20, 30):
+        item_nodes, keep = build_rc_ladder(sections)
+        solver = CI.CircuitTopology(item_nodes)
+        serial = time_output(solver, 1)
+        parallel = time_output(solver, workers)
+        print('{:>8} {:12.3f} {:12.3f} {:8.2f}'.format(
+            solver.getNumOfNotGND(), serial, parallel, serial / parallel))
+
+
+if __name__ == '__main__':
+    main()
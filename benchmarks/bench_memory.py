@@ -0,0 +1,63 @@
+# 比较不同电路表示下每个元件占用的内存
+# 运行：python -m benchmarks.bench_memory（在项目根目录下）
+import gc
+import logging
+import tracemalloc
+
+import CircuitSolver as CS
+from benchmarks.bench_incremental import build_rc_ladder_netlist
+
+NUM_ELEMENTS = 50000
+# 图形元件较慢，只构建较少的元件后按比例估算
+NUM_GUI_SECTIONS = 1000
+
+
+def traced_bytes(build) -> tuple[int, object]:
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def rss_bytes() -> int | None:
+    # 常驻内存（只在 Linux 上可用），用于统计 Qt 在 C++ 侧分配的内存
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * 4096
+    except OSError:
+        return None
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    sections = NUM_ELEMENTS // 2
+    print('{:>24} {:>12} {:>14}'.format('representation', 'elements', 'bytes/element'))
+
+    size, netlist = traced_bytes(lambda: build_rc_ladder_netlist(sections))
+    print('{:>24} {:>12} {:14.1f}'.format('Netlist (arrays)', len(netlist), size / len(netlist)))
+
+    # 原先的表示：每个元件一个 (类型, 节点1, 节点2, 数值) 元组
+    size, elements = traced_bytes(lambda: [(kind, n1, n2, float(value)) for kind, n1, n2, value in netlist.elements])
+    print('{:>24} {:>12} {:14.1f}'.format('list of tuples', len(elements), size / len(elements)))
+    del elements
+
+    size, circuit = traced_bytes(lambda: CS.Circuit('ladder', netlist.copy(), [str(i) for i in range(netlist.num_nodes)],
+                                                    ['E{}'.format(i) for i in range(len(netlist))]))
+    print('{:>24} {:>12} {:14.1f}'.format('Circuit (with names)', len(circuit.netlist), size / len(circuit.netlist)))
+    del circuit
+
+    before = rss_bytes()
+    if before is None:
+        return
+    from benchmarks.bench_mna_engines import build_rc_ladder
+    import PyQt6.QtWidgets as qtw
+    app = qtw.QApplication.instance() or qtw.QApplication([])  # noqa: F841
+    item_nodes, keep = build_rc_ladder(NUM_GUI_SECTIONS)
+    num_items = 2 * NUM_GUI_SECTIONS + 1
+    print('{:>24} {:>12} {:14.1f}'.format('QGraphicsItem (RSS)', num_items, (rss_bytes() - before) / num_items))
+
+
+if __name__ == '__main__':
+    main()
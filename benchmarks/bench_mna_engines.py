@@ -0,0 +1,70 @@
+# 比较符号引擎与稀疏数值引擎随节点数的扩展性
+# 运行：python -m benchmarks.bench_mna_engines（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CircuitItem as CI  # noqa: E402
+
+SYMBOLIC_MAX_NODES = 16
+
+
+def build_rc_ladder(sections: int):
+    # 电压源 -> (串联电阻 + 并联电容) x sections，返回元件节点集合以及需要保持引用的对象
+    item_nodes = set()
+    keep = []
+
+    def connect(node1: CI.ItemNode, node2: CI.ItemNode):
+        keep.append(CI.WireItem(node1, node2))
+        item_nodes.add(node1)
+        item_nodes.add(node2)
+
+    source = CI.VoltageSourceItem(1)
+    gnd = CI.GroundItem()
+    keep += [source, gnd]
+    connect(source.nodes[1], gnd.nodes[0])
+    prev = source.nodes[0]
+    for k in range(sections):
+        # 使用互不相同的元件值，避免对称性掩盖符号求解的表达式膨胀
+        resistor = CI.ResistorItem(1 + 0.1 * k)
+        capacitor = CI.CapacitorItem(0.5 + 0.05 * k)
+        keep += [resistor, capacitor]
+        connect(prev, resistor.nodes[0])
+        connect(resistor.nodes[1], capacitor.nodes[0])
+        connect(capacitor.nodes[1], gnd.nodes[0])
+        prev = resistor.nodes[1]
+    return item_nodes, keep
+
+
+def timeit(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('{:>8} {:>14} {:>14} {:>14}'.format(
+        'nodes', 'symbolic/s', 'numeric(jω)/s', 'numeric(DC)/s'))
+    for sections in (2, 4, 8, 16, 64, 256, 1024):
+        item_nodes, keep = build_rc_ladder(sections)
+        if sections <= SYMBOLIC_MAX_NODES:
+            symbolic = '{:14.4f}'.format(
+                timeit(lambda: CI.CircuitTopology(item_nodes)))
+        else:
+            symbolic = '{:>14}'.format('-')
+        numeric_ac = timeit(lambda: CI.CircuitTopology(
+            item_nodes, engine='numeric', s_value=1j))
+        numeric_dc = timeit(lambda: CI.CircuitTopology(
+            item_nodes, engine='numeric'))
+        print('{:>8} {} {:14.4f} {:14.4f}'.format(
+            sections + 1, symbolic, numeric_ac, numeric_dc))
+        del keep
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# 比较蒙特卡洛分析在 1、2 与 CPU 核数个进程下的耗时（同一随机种子，各分块的样本相同，统计应一致）
+# 小电路按批量稠密求解，大电路逐个样本稀疏 LU，见 MonteCarlo.DENSE_BATCH_MAX_SIZE
+# 运行：python -m benchmarks.bench_monte_carlo（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+
+NUM_SAMPLES = 8192
+SEED = 0
+
+
+def build_grid(k: int) -> CS.Netlist:
+    # k x k 电阻网格，左上角接电压源、右下角接电流源，部分节点对地接电容，每行首段为电感
+    netlist = CS.Netlist(k * k)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('I', CS.GND, k * k - 1, 1e-3)
+    for i in range(k):
+        for j in range(k):
+            node = i * k + j
+            if i + 1 < k:
+                netlist.add('R', node, node + k, 1.0 + 0.1 * ((i + j) % 5))
+            if j + 1 < k:
+                netlist.add('L' if j == 0 else 'R', node, node + 1, 1.0 + 0.1 * (i * j % 3))
+            if (i + j) % 7 == 0:
+                netlist.add('C', node, CS.GND, 1e-3)
+    netlist.add('R', k * k - 1, CS.GND, 10.0)
+    return netlist
+
+
+def build_ladder(sections: int) -> CS.Netlist:
+    # 电压源驱动的电阻梯形网络，每节一个串联电阻、一个对地电阻
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 1.0)
+        netlist.add('R', k + 1, CS.GND, 100.0 + k % 7)
+    return netlist
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    worker_counts = sorted({1, 2, os.cpu_count() or 1})
+    print('CPU 核数：{}，每个电路{}个样本'.format(os.cpu_count(), NUM_SAMPLES))
+    print('{:>10} {:>8} {:>8} {:>10} {:>10} {:>12}'.format('circuit', 'order', 'workers', 'time/s', 'speedup',
+                                                         'mean diff'))
+    for name, netlist in (('ladder', build_ladder(50)), ('grid', build_grid(20))):
+        outputs = list(range(netlist.num_nodes))
+        order = CS.stamp_MNA_sparse(netlist)[0].shape[0]
+        tolerances = CS.default_tolerances(netlist, CS.Tolerance(0.05))
+        baseline = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            stats = CS.run_monte_carlo(netlist, outputs, NUM_SAMPLES, tolerances, workers=workers, seed=SEED)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline = (elapsed, stats.mean())
+            print('{:>10} {:>8} {:>8} {:10.3f} {:10.2f} {:12.2e}'.format(
+                name, order, workers, elapsed, baseline[0] / elapsed, np.abs(stats.mean() - baseline[1]).max()))
+
+
+if __name__ == '__main__':
+    main()
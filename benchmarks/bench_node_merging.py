@@ -0,0 +1,81 @@
+# 比较原递归 DFS 与并查集合并等电位元件节点的耗时
+# 运行：python -m benchmarks.bench_node_merging（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CircuitItem as CI  # noqa: E402
+
+
+class StubItem:
+    # 代替图形元件，只提供节点合并用到的接口，避免构建 10^5 个 QGraphicsItem
+    pass
+
+
+class StubNode:
+    __slots__ = ('item', 'wires')
+
+    def __init__(self, item: StubItem):
+        self.item = item
+        self.wires = []
+
+    def parentItem(self):
+        return self.item
+
+    def getConnectItemNodes(self):
+        return self.wires
+
+
+def build_wire_ladder(num_wires: int) -> set[StubNode]:
+    # 两条长导线链（梯形的两条边），每 10 段之间有一个两端元件相连
+    item = StubItem()
+    nodes = set()
+    for _ in range(2):
+        prev = StubNode(item)
+        nodes.add(prev)
+        for k in range(num_wires // 2):
+            node = StubNode(StubItem() if k % 10 == 0 else item)
+            prev.wires.append(node)
+            node.wires.append(prev)
+            nodes.add(node)
+            prev = node
+    return nodes
+
+
+def recursive_group(item_nodes: set[StubNode]) -> list[list[StubNode]]:
+    # 原 findItemNodesOfSamePotential 的实现（去掉电流表分支）
+    def find(item_node, visited):
+        if item_node in visited:
+            return []
+        visited.add(item_node)
+        result = [item_node]
+        for connect_node in item_node.getConnectItemNodes():
+            result += find(connect_node, visited)
+        return result
+
+    visited = set()
+    return [find(node, visited) for node in item_nodes if node not in visited]
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('{:>8} {:>14} {:>14} {:>8}'.format('wires', 'recursive/s', 'union-find/s', 'groups'))
+    for num_wires in (100, 1000, 10000, 100000):
+        nodes = build_wire_ladder(num_wires)
+        start = time.perf_counter()
+        try:
+            recursive_group(nodes)
+            recursive = '{:14.4f}'.format(time.perf_counter() - start)
+        except RecursionError:
+            recursive = '{:>14}'.format('RecursionError')
+        start = time.perf_counter()
+        groups = CI.CircuitTopology.groupItemNodes(nodes)
+        print('{:>8} {} {:14.4f} {:>8}'.format(num_wires, recursive, time.perf_counter() - start, len(groups)))
+
+
+if __name__ == '__main__':
+    main()
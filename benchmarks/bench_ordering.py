@@ -0,0 +1,94 @@
+# 比较不同消元顺序下 MNA 方程的填充量与求解耗时（网格电路与梯形电路，未知量按随机编号排列）
+# 运行：python -m benchmarks.bench_ordering（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import scipy.sparse.linalg as spla  # noqa: E402
+import sympy as sp  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+from CircuitSolver.NumericEngine import factor_MNA  # noqa: E402
+from CircuitSolver.Ordering import ORDERINGS, get_ordering, count_factor_nonzeros, pattern_from_rows  # noqa: E402
+from CircuitSolver.PolyEngine import stamp_MNA_poly  # noqa: E402
+
+
+def shuffled(n: int) -> np.ndarray:
+    # 模拟按元件编号排列的节点：编号与电路中的位置无关
+    return np.random.default_rng(0).permutation(n)
+
+
+def build_grid(k: int) -> CS.Netlist:
+    # k x k 电阻网格，每个节点对地接电容，左上角接电压源
+    index = shuffled(k * k)
+    netlist = CS.Netlist(k * k)
+    netlist.add('V', int(index[0]), CS.GND, 1.0)
+    for i in range(k):
+        for j in range(k):
+            node = int(index[i * k + j])
+            if i + 1 < k:
+                netlist.add('R', node, int(index[(i + 1) * k + j]), 1.0 + 0.1 * ((i + j) % 5))
+            if j + 1 < k:
+                netlist.add('R', node, int(index[i * k + j + 1]), 1.0 + 0.1 * (i * j % 3))
+            netlist.add('C', node, CS.GND, 0.1 + 0.1 * ((i + 2 * j) % 4))
+    return netlist
+
+
+def build_ladder(sections: int) -> CS.Netlist:
+    index = shuffled(sections + 1)
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', int(index[0]), CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', int(index[k]), int(index[k + 1]), 1 + 0.1 * k)
+        netlist.add('C', int(index[k + 1]), CS.GND, 0.5 + 0.05 * k)
+    return netlist
+
+
+def bench_numeric(name: str, netlist: CS.Netlist):
+    # 一次分解、100 次回代，L+U 为 SuperLU 分解的实际非零元数
+    A, b = CS.stamp_MNA_sparse(netlist, 1.0)
+    for ordering in (None, *ORDERINGS):
+        start = time.perf_counter()
+        lu = factor_MNA(A, ordering)
+        factor = time.perf_counter() - start
+        for _ in range(100):
+            lu.solve(b)
+        solve = time.perf_counter() - start - factor
+        superlu = lu if isinstance(lu, spla.SuperLU) else lu.lu
+        print('{:>14} {:>10} {:>10} {:10.4f} {:10.4f}'.format(
+            name, ordering or 'colamd', superlu.L.nnz + superlu.U.nnz, factor, solve))
+
+
+def bench_symbolic(name: str, netlist: CS.Netlist):
+    # L 为按该顺序做对称符号消元的因子非零元数
+    s = sp.symbols('s', complex=True)
+    A, _ = stamp_MNA_poly(netlist, s)
+    pattern = pattern_from_rows(A.to_sdm(), A.shape[0])
+    for ordering in ORDERINGS:
+        fill = count_factor_nonzeros(pattern, get_ordering(pattern, ordering))
+        start = time.perf_counter()
+        CS.solve_MNA_poly(netlist, s, ordering=ordering)
+        print('{:>14} {:>10} {:>10} {:10.4f}'.format(name, ordering, fill, time.perf_counter() - start))
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('数值引擎（s = 1）')
+    print('{:>14} {:>10} {:>10} {:>10} {:>10}'.format('circuit', 'ordering', 'L+U', 'factor/s', 'solves/s'))
+    for k in (30, 100):
+        bench_numeric('grid {}x{}'.format(k, k), build_grid(k))
+    for sections in (1000, 10000):
+        bench_numeric('ladder {}'.format(sections), build_ladder(sections))
+    print('符号引擎')
+    print('{:>14} {:>10} {:>10} {:>10}'.format('circuit', 'ordering', 'L', 'solve/s'))
+    for k in (4, 6):
+        bench_symbolic('grid {}x{}'.format(k, k), build_grid(k))
+    for sections in (20, 40):
+        bench_symbolic('ladder {}'.format(sections), build_ladder(sections))
+
+
+if __name__ == '__main__':
+    main()
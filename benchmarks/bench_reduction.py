@@ -0,0 +1,52 @@
+# 比较完整模型与 PRIMA 降阶模型在交流分析、瞬态仿真上的耗时与误差（多条 RLC 互连线）
+# 运行：python -m benchmarks.bench_reduction（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+
+
+def build_lines(lines: int, segments: int) -> tuple[CS.Netlist, list[int]]:
+    # 电压源经驱动电阻接到各条线的首端，每段为电阻（每 10 段一个电感）与对地电容，末端接负载；返回网表与各线末端节点
+    rng = np.random.default_rng(0)
+    netlist = CS.Netlist(1 + lines * (segments + 1))
+    netlist.add('V', 0, CS.GND, 1.0)
+    ends = []
+    for line in range(lines):
+        first = 1 + line * (segments + 1)
+        netlist.add('R', 0, first, 10.0)
+        for k in range(segments):
+            node = first + k
+            if k % 10 == 5:
+                netlist.add('L', node, node + 1, 1e-5)
+            else:
+                netlist.add('R', node, node + 1, rng.uniform(0.9, 1.1))
+            netlist.add('C', node + 1, CS.GND, 1e-6)
+        netlist.add('R', first + segments, CS.GND, 1e3)
+        ends.append(first + segments)
+    return netlist, ends
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    netlist, ends = build_lines(3, 2000)
+    frequencies = CS.frequency_grid(0.01, 100, 1000)
+    print('{:>6} {:>10} {:>12} {:>12} {:>12} {:>12} {:>12} {:>12}'.format(
+        'order', 'reduce/s', 'ac full/s', 'ac rom/s', 'ac error', 'tr full/s', 'tr rom/s', 'tr error'))
+    for order in (10, 20, 40, 80):
+        start = time.perf_counter()
+        model = CS.reduce_order(netlist, order)
+        reduce_time = time.perf_counter() - start
+        report = CS.compare_reduced(netlist, model, frequencies, t_stop=5.0, t_step=1e-3, outputs=ends)
+        print('{:>6} {:10.3f} {:12.3f} {:12.3f} {:12.2e} {:12.3f} {:12.3f} {:12.2e}'.format(
+            model.getOrder(), reduce_time, *report.ac_times, report.ac_error.max(),
+            *report.transient_times, report.transient_error.max()))
+
+
+if __name__ == '__main__':
+    main()
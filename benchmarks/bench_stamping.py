@@ -0,0 +1,119 @@
+# 比较逐元件标量写入与按印记注册表向量化组装 MNA 矩阵的耗时
+# 运行：python -m benchmarks.bench_stamping（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scipy.sparse as sps  # noqa: E402
+import sympy as sp  # noqa: E402
+import CircuitItem as CI  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+from CircuitSolver.NumericEngine import get_MNA_size, element_admittance  # noqa: E402
+from benchmarks.bench_incremental import build_rc_ladder_netlist  # noqa: E402
+from benchmarks.bench_mna_engines import build_rc_ladder  # noqa: E402
+
+def stamp_scalar(netlist: CS.Netlist, s: complex | None = None) -> sps.csc_matrix:
+    # 原实现：逐个元件把导纳、支路写入三元组列表
+    rows, cols, vals = [], [], []
+
+    def add(row: int, col: int, value):
+        rows.append(row)
+        cols.append(col)
+        vals.append(value)
+
+    for kind, n1, n2, value in netlist.elements:
+        Y = element_admittance(kind, value, s)
+        if Y is None:
+            continue
+        if n1 != CS.GND:
+            add(n1, n1, Y)
+        if n2 != CS.GND:
+            add(n2, n2, Y)
+        if n1 != CS.GND and n2 != CS.GND:
+            add(n1, n2, -Y)
+            add(n2, n1, -Y)
+    branch_index = netlist.num_nodes
+    for kind in ('V', 'L') if s is None else ('V',):
+        for n1, n2, value in netlist.getElementsOfKind(kind):
+            for node, sign in ((n1, 1), (n2, -1)):
+                if node != CS.GND:
+                    add(node, branch_index, sign)
+                    add(branch_index, node, sign)
+            branch_index += 1
+    size = get_MNA_size(netlist, s)
+    return sps.coo_matrix((vals, (rows, cols)), shape=(size, size)).tocsc()
+
+
+def get_MNA_matrix_scalar(solver: CI.CircuitTopology):
+    # 原实现：isinstance 判断元件类型，逐项累加到 sympy 矩阵
+    num_nodes, num_sources = solver.getNumOfNotGND(), solver.getVoltageSourcesNum()
+    G = sp.zeros(num_nodes, num_nodes)
+    B = sp.zeros(num_nodes, num_sources)
+    I_s = sp.zeros(num_nodes, 1)
+    E = sp.zeros(num_sources, 1)
+    for item in solver.items:
+        node1, node2 = item.getCircuitNodes() if len(item.nodes) == 2 else (None, None)
+        if isinstance(item, (CI.ResistorItem, CI.CapacitorItem, CI.InductorItem)):
+            if isinstance(item, CI.ResistorItem):
+                Y = 1 / item.resistance
+            elif isinstance(item, CI.CapacitorItem):
+                Y = solver.s * item.capacitance
+            else:
+                Y = 1 / (solver.s * item.inductance)
+            n1, n2 = solver.getNodesIndex(node1), solver.getNodesIndex(node2)
+            if not node1.isGround:
+                G[n1, n1] += Y
+            if not node2.isGround:
+                G[n2, n2] += Y
+            if not node1.isGround and not node2.isGround:
+                G[n1, n2] -= Y
+                G[n2, n1] -= Y
+        elif isinstance(item, CI.VoltageSourceItem):
+            k = solver.getVoltageSourceIndex(item)
+            if not node1.isGround:
+                B[solver.getNodesIndex(node1), k] = 1
+            if not node2.isGround:
+                B[solver.getNodesIndex(node2), k] = -1
+            E[k] = item.voltage / solver.s
+        elif isinstance(item, CI.CurrentSourceItem):
+            if not node1.isGround:
+                I_s[solver.getNodesIndex(node1)] += item.current / solver.s
+            if not node2.isGround:
+                I_s[solver.getNodesIndex(node2)] -= item.current / solver.s
+    A = sp.Matrix.vstack(sp.Matrix.hstack(G, B), sp.Matrix.hstack(B.T, sp.zeros(num_sources, num_sources)))
+    return A, sp.Matrix.vstack(I_s, E)
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('数值稀疏矩阵（s = 1j）')
+    print('{:>10} {:>12} {:>12}'.format('elements', 'scalar/ms', 'vector/ms'))
+    for sections in (500, 5000, 50000):
+        netlist = build_rc_ladder_netlist(sections)
+        A_scalar = stamp_scalar(netlist, 1j)
+        A_vector, _ = CS.stamp_MNA_sparse(netlist, 1j)
+        assert abs(A_scalar - A_vector).max() < 1e-12
+        print('{:>10} {:12.2f} {:12.2f}'.format(
+            len(netlist), timeit(stamp_scalar, netlist, 1j) * 1000, timeit(CS.stamp_MNA_sparse, netlist, 1j) * 1000))
+
+    print('符号矩阵 get_MNA_matrix')
+    print('{:>10} {:>12} {:>12}'.format('elements', 'scalar/s', 'stamps/s'))
+    for sections in (50, 200, 1000):
+        item_nodes, keep = build_rc_ladder(sections)
+        solver = CI.CircuitTopology(item_nodes, solve=False)
+        print('{:>10} {:12.3f} {:12.3f}'.format(
+            len(solver.netlist), timeit(get_MNA_matrix_scalar, solver), timeit(solver.get_MNA_matrix)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# 比较重复使用同一子电路时，展开为普通元件求解与按缓存的端口方程（Kron 约化）求解的耗时
+# 运行：python -m benchmarks.bench_subcircuit（在项目根目录下）
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sympy as sp  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+from CircuitSolver.Subcircuits import port_models  # noqa: E402
+
+
+def build_block(sections: int) -> CS.Subcircuit:
+    # 二端口 RC 梯形滤波器，端口为输入、输出节点，中间节点对地接电感
+    netlist = CS.Netlist(sections + 1)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 1 + 0.1 * k)
+        netlist.add('C', k + 1, CS.GND, 0.5 + 0.05 * k)
+    netlist.add('L', sections // 2, CS.GND, 2.0)
+    return CS.Subcircuit('ladder', netlist, [0, sections])
+
+
+def build_cascade(instances: int, sections: int) -> CS.Netlist:
+    # 电压源驱动 instances 级级联的子电路，末级接负载电阻
+    block = build_block(sections)
+    netlist = CS.Netlist(instances + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', instances, CS.GND, 3.0)
+    for i in range(instances):
+        netlist.addInstance(block, (i, i + 1))
+    return netlist
+
+
+def timeit(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    s = sp.symbols('s', complex=True)
+    print('符号引擎')
+    print('{:>10} {:>10} {:>10} {:>10} {:>10}'.format('instances', 'sections', 'flat/s', 'cold/s', 'cached/s'))
+    for instances, sections in ((4, 4), (6, 4), (4, 8)):
+        netlist = build_cascade(instances, sections)
+        flat = CS.flatten_netlist(netlist)
+        port_models.clear()
+        print('{:>10} {:>10} {:10.3f} {:10.3f} {:10.3f}'.format(
+            instances, sections, timeit(CS.solve_MNA_poly, flat, s),
+            timeit(CS.solve_MNA_poly, netlist, s), timeit(CS.solve_MNA_poly, netlist, s)))
+
+    print('数值引擎（s = 1j）')
+    print('{:>10} {:>10} {:>10} {:>10} {:>10}'.format('instances', 'sections', 'flat/ms', 'cold/ms', 'cached/ms'))
+    for instances, sections in ((100, 50), (1000, 50), (1000, 200)):
+        netlist = build_cascade(instances, sections)
+        flat = CS.flatten_netlist(netlist)
+        port_models.clear()
+        print('{:>10} {:>10} {:10.2f} {:10.2f} {:10.2f}'.format(
+            instances, sections, timeit(CS.solve_numeric, flat, 1j) * 1000,
+            timeit(CS.solve_numeric, netlist, 1j) * 1000, timeit(CS.solve_numeric, netlist, 1j) * 1000))
+
+
+if __name__ == '__main__':
+    main()
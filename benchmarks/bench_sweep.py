@@ -0,0 +1,43 @@
+# 比较逐点求解与批量参数扫描的耗时
+# 运行：python -m benchmarks.bench_sweep（在项目根目录下）
+import logging
+import time
+
+import numpy as np
+
+import CircuitSolver as CS
+from benchmarks.bench_incremental import build_rc_ladder_netlist
+
+NUM_POINTS = 500
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('{:>8} {:>10} {:>12} {:>12} {:>12}'.format(
+        'nodes', 'params', 'pointwise/s', 'sweep/s', 'max error'))
+    for sections in (100, 1000, 10000):
+        netlist = build_rc_ladder_netlist(sections)
+        for num_params in (1, 4):
+            # 扫描前 num_params 个电阻，从 1Ω 到 1kΩ
+            sweeps = {1 + 2 * k: np.geomspace(1, 1000, NUM_POINTS) for k in range(num_params)}
+
+            start = time.perf_counter()
+            pointwise = []
+            for p in range(NUM_POINTS):
+                point = netlist.copy()
+                for index, values in sweeps.items():
+                    point.setValue(index, values[p])
+                pointwise.append(CS.solve_numeric(point, 1j)[:point.num_nodes])
+            pointwise_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = CS.sweep_values(netlist, sweeps, 1j)
+            sweep_time = time.perf_counter() - start
+
+            error = np.max(np.abs(np.array(pointwise) - result.node_potentials))
+            print('{:>8} {:>10} {:12.4f} {:12.4f} {:12.2e}'.format(
+                sections + 1, num_params, pointwise_time, sweep_time, error))
+
+
+if __name__ == '__main__':
+    main()
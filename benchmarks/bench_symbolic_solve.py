@@ -0,0 +1,35 @@
+# 比较 QQ[s] 上的无分数消元与对 get_MNA_matrix 结果直接 sp.linsolve 的符号求解耗时
+# 运行：python -m benchmarks.bench_symbolic_solve（在项目根目录下）
+import logging
+
+import sympy as sp
+
+from benchmarks.bench_mna_engines import build_rc_ladder, timeit
+import CircuitItem as CI
+
+LINSOLVE_MAX_NODES = 9
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('{:>8} {:>14} {:>14}'.format('nodes', 'linsolve/s', 'poly/s'))
+    for sections in (2, 4, 8, 16, 24, 32):
+        item_nodes, keep = build_rc_ladder(sections)
+        topology = None
+
+        def solve_poly():
+            nonlocal topology
+            topology = CI.CircuitTopology(item_nodes)
+        poly = timeit(solve_poly)
+
+        if sections + 1 <= LINSOLVE_MAX_NODES:
+            A, b = topology.get_MNA_matrix()
+            linsolve = '{:14.4f}'.format(timeit(lambda: sp.linsolve((A, b))))
+        else:
+            linsolve = '{:>14}'.format('-')
+        print('{:>8} {} {:14.4f}'.format(sections + 1, linsolve, poly))
+        del keep
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# 比较固定的均匀时间网格（0 ~ 100 s，1000 点）与按极点自动选择时长、自适应加密的时间网格
+# 在不同时间常数的 RC、RLC 电路上的求值点数与波形误差（相对于密集采样的最大绝对误差）
+# 运行：python -m benchmarks.bench_time_grid（在项目根目录下）
+import os
+import sys
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import sympy as sp  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+
+REFERENCE_POINTS = 200001
+
+
+def build_rc(tau: float) -> CS.Netlist:
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, 1.0)
+    netlist.add('C', 1, CS.GND, tau)
+    return netlist
+
+
+def build_rlc(resistance: float) -> CS.Netlist:
+    # 串联 RLC，resistance 越小振荡衰减越慢
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, resistance)
+    netlist.add('L', 1, 2, 1e-3)
+    netlist.add('C', 2, CS.GND, 1e-3)
+    return netlist
+
+
+def build_two_scales() -> CS.Netlist:
+    # 时间常数相差 10^4 倍的两级 RC
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, 1.0)
+    netlist.add('C', 1, CS.GND, 1e-4)
+    netlist.add('R', 1, 2, 1e3)
+    netlist.add('C', 2, CS.GND, 1.0)
+    return netlist
+
+
+def max_error(time_domain: CS.TimeDomainResult, t: np.ndarray, y: np.ndarray) -> float:
+    # 在 [0, t_stop] 上密集采样，与网格点间线性插值（即绘图时的折线）比较
+    reference_t = np.linspace(0, t[-1], REFERENCE_POINTS)
+    return float(np.abs(np.interp(reference_t, t, y) - time_domain(reference_t)).max())
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    s, t = sp.symbols('s', complex=True), sp.symbols('t', real=True)
+    circuits = [('RC tau=1e-3', build_rc(1e-3)), ('RC tau=1', build_rc(1.0)), ('RC tau=1e3', build_rc(1e3)),
+                ('RLC R=0.1', build_rlc(0.1)), ('RC two scales', build_two_scales())]
+    print('{:>14} {:>10} {:>8} {:>12} {:>10} {:>8} {:>12}'.format(
+        'circuit', 'fixed/s', 'points', 'error', 'auto/s', 'points', 'error'))
+    for name, netlist in circuits:
+        node = netlist.num_nodes - 1
+        time_domain = CS.inverse_laplace(CS.solve_MNA_poly(netlist, s)[node], s, t)
+        fixed_t = np.linspace(0, 100, 1000)
+        t_fast, t_stop = CS.time_scales(CS.circuit_poles(netlist))
+        auto_t, auto_y = CS.adaptive_time_grid(time_domain, t_stop, t_fast=t_fast)
+        print('{:>14} {:10.4g} {:8d} {:12.2e} {:10.4g} {:8d} {:12.2e}'.format(
+            name, fixed_t[-1], len(fixed_t), max_error(time_domain, fixed_t, time_domain(fixed_t)),
+            t_stop, len(auto_t), max_error(time_domain, auto_t, auto_y)))
+
+
+if __name__ == '__main__':
+    main()
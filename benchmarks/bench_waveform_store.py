@@ -0,0 +1,64 @@
+# 比较瞬态仿真结果全部保存在内存中与分块写入磁盘（内存映射读取）时的峰值内存、耗时，以及重新打开已有结果的耗时
+# 运行：python -m benchmarks.bench_waveform_store（在项目根目录下）
+import os
+import sys
+import time
+import logging
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import CircuitSolver as CS  # noqa: E402
+
+
+def build_rc_ladder(sections: int) -> CS.Netlist:
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 1.0)
+        netlist.add('C', k + 1, CS.GND, 1e-3)
+    return netlist
+
+
+def measure(func):
+    # 返回 (结果, 耗时/s, 峰值内存/MB)，tracemalloc 统计 numpy 数组的内存，不含内存映射的页面
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main():
+    logging.getLogger().setLevel(logging.WARNING)
+    print('{:>8} {:>8} {:>10} {:>12} {:>10} {:>12} {:>10} {:>10}'.format(
+        'nodes', 'steps', 'memory/s', 'memory/MB', 'store/s', 'store/MB', 'reopen/ms', 'slice/ms'))
+    with tempfile.TemporaryDirectory() as root:
+        store = CS.WaveformStore(root)
+        for sections, steps in ((200, 20000), (1000, 20000)):
+            netlist = build_rc_ladder(sections)
+            t_stop = steps * 1e-3
+            full, memory_time, memory_peak = measure(lambda: CS.simulate_transient(netlist, t_stop, 1e-3))
+            del full
+            stored, store_time, store_peak = measure(
+                lambda: CS.simulate_transient(netlist, t_stop, 1e-3, store=store))
+            del stored
+            start = time.perf_counter()
+            reopened = CS.simulate_transient(netlist, t_stop, 1e-3, store=store)
+            reopen_time = time.perf_counter() - start
+            # 读取一个节点在后半段的波形，只映射用到的页面
+            start = time.perf_counter()
+            float(np.max(reopened.getNodeVoltage(sections)[steps // 2:]))
+            slice_time = time.perf_counter() - start
+            print('{:>8} {:>8} {:10.3f} {:12.1f} {:10.3f} {:12.1f} {:10.2f} {:10.2f}'.format(
+                sections + 1, steps, memory_time, memory_peak, store_time, store_peak,
+                reopen_time * 1000, slice_time * 1000))
+            del reopened
+
+
+if __name__ == '__main__':
+    main()
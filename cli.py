@@ -0,0 +1,200 @@
+# 无界面的批量求解入口，不导入 PyQt6
+# 运行：python cli.py circuits/ -o results/ --format json
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+ANALYSES = ('dc', 'ac', 'transient')
+FORMATS = ('json', 'csv')
+# 使用降阶模型做交流分析时，取这么多个频率点与完整模型比较，给出误差
+REDUCTION_CHECK_POINTS = 10
+
+
+def find_circuit_files(paths: list[str]) -> list[str]:
+    # 目录按文件名排序展开为其中支持的电路文件
+    from CircuitSolver.CircuitFile import LOADERS
+
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if os.path.splitext(name)[1].lower() in LOADERS)
+        else:
+            files.append(path)
+    return files
+
+
+def solve_dc(circuit, args) -> dict:
+    import CircuitSolver as CS
+
+    result = CS.dc_operating_point(circuit.netlist)
+    return {
+        'node_voltages': dict(zip(circuit.node_names, result.node_voltages.tolist())),
+        'source_currents': dict(zip(circuit.getVoltageSourceNames(), result.source_currents.tolist())),
+    }
+
+
+def solve_ac(circuit, args) -> dict:
+    import numpy as np
+    import CircuitSolver as CS
+
+    frequencies = CS.frequency_grid(args.f_start, args.f_stop, args.points)
+    extra = {}
+    if args.order:
+        model = CS.reduce_order(circuit.netlist, args.order)
+        result = model.ac_analysis(frequencies)
+        check = frequencies[np.linspace(0, len(frequencies) - 1, REDUCTION_CHECK_POINTS).astype(int)]
+        report = CS.compare_reduced(circuit.netlist, model, check)
+        # 相对误差以所有输出、所有校验频率点上完整响应的最大幅值归一化，绝对误差为相量差的模
+        extra = {'reduced_order': model.getOrder(), 'reduction_error': float(report.ac_error.max(initial=0)),
+                 'reduction_abs_error': float(report.ac_abs_error.max(initial=0))}
+    else:
+        result = CS.ac_analysis(circuit.netlist, frequencies)
+    return {
+        'frequencies': frequencies.tolist(),
+        'magnitude_db': {name: result.getMagnitude(i).tolist() for i, name in enumerate(circuit.node_names)},
+        'phase_deg': {name: result.getPhase(i).tolist() for i, name in enumerate(circuit.node_names)},
+        **extra,
+    }
+
+
+def solve_transient(circuit, args) -> dict:
+    import CircuitSolver as CS
+
+    extra = {}
+    if args.order:
+        model = CS.reduce_order(circuit.netlist, args.order)
+        result = model.simulate_transient(args.t_stop, args.t_step, args.method)
+        extra = {'reduced_order': model.getOrder()}
+    else:
+        store = CS.WaveformStore(args.store) if args.store else None
+        result = CS.simulate_transient(circuit.netlist, args.t_stop, args.t_step, args.method, store=store)
+    return {
+        'times': result.times.tolist(),
+        'node_voltages': {name: result.getNodeVoltage(i).tolist() for i, name in enumerate(circuit.node_names)},
+        **extra,
+    }
+
+
+SOLVERS = {'dc': solve_dc, 'ac': solve_ac, 'transient': solve_transient}
+
+
+def write_csv(path: str, result: dict):
+    # 直流结果每行一个量；交流、瞬态结果每行一个频率点或时刻
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if result['analysis'] == 'dc':
+            writer.writerow(['name', 'value'])
+            for group in ('node_voltages', 'source_currents'):
+                writer.writerows(result[group].items())
+        elif result['analysis'] == 'ac':
+            names = list(result['magnitude_db'])
+            writer.writerow(['frequency'] + ['{}_db'.format(name) for name in names] +
+                            ['{}_deg'.format(name) for name in names])
+            columns = [result['magnitude_db'][name] for name in names] + \
+                [result['phase_deg'][name] for name in names]
+            writer.writerows(zip(result['frequencies'], *columns))
+        else:
+            names = list(result['node_voltages'])
+            writer.writerow(['time'] + names)
+            writer.writerows(zip(result['times'], *(result['node_voltages'][name] for name in names)))
+
+
+def solve_file(path: str, args) -> tuple[str, bool, float, str, str]:
+    # 返回（电路名，是否成功，耗时，错误信息，JSON 结果行），结果写入输出目录；
+    # 未给出输出目录时结果行交给主进程打印，避免多个工作进程同时写标准输出时各行交错
+    from CircuitSolver.CircuitFile import load_circuit
+
+    start = time.perf_counter()
+    name = os.path.splitext(os.path.basename(path))[0]
+    try:
+        circuit = load_circuit(path)
+        result = {'circuit': circuit.name, 'analysis': args.analysis}
+        result.update(SOLVERS[args.analysis](circuit, args))
+    except Exception as e:
+        return name, False, time.perf_counter() - start, str(e), ''
+    elapsed = time.perf_counter() - start
+    result['time'] = elapsed
+    if args.output:
+        out_path = os.path.join(args.output, '{}.{}'.format(name, args.format))
+        if args.format == 'json':
+            with open(out_path, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False)
+        else:
+            write_csv(out_path, result)
+        return name, True, elapsed, '', ''
+    return name, True, elapsed, '', json.dumps(result, ensure_ascii=False)
+
+
+def init_worker(verbose: bool):
+    configure_logging(verbose)
+
+
+def configure_logging(verbose: bool):
+    from log_config import logger
+
+    logger.setLevel(logging.INFO if verbose else logging.WARNING)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Simple EDA 命令行批量求解')
+    parser.add_argument('paths', nargs='+', help='电路文件或包含电路文件的目录')
+    parser.add_argument('-o', '--output', help='结果输出目录，省略时结果以 JSON 打印到标准输出')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='json')
+    parser.add_argument('-a', '--analysis', choices=ANALYSES, default='dc')
+    parser.add_argument('-j', '--workers', type=int, default=None, help='进程数，默认为 CPU 核数')
+    parser.add_argument('-v', '--verbose', action='store_true', help='输出求解日志')
+    parser.add_argument('--f-start', type=float, default=1e-3, help='交流分析起始频率/Hz')
+    parser.add_argument('--f-stop', type=float, default=1e3, help='交流分析终止频率/Hz')
+    parser.add_argument('--points', type=int, default=1000, help='交流分析频率点数')
+    parser.add_argument('--t-stop', type=float, default=100.0, help='瞬态仿真时长/s')
+    parser.add_argument('--t-step', type=float, default=0.1, help='瞬态仿真步长/s')
+    parser.add_argument('--method', choices=('be', 'trap'), default='trap', help='瞬态仿真积分方法')
+    parser.add_argument('--order', type=int, default=None,
+                        help='模型降阶的阶数，给出时交流、瞬态分析在降阶模型上进行（交流分析附带与完整模型的误差）')
+    parser.add_argument('--store', default=None,
+                        help='瞬态仿真结果的保存目录，给出时结果分块写入磁盘，相同电路与设置的运行直接读取已有结果')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_logging(args.verbose)
+    files = find_circuit_files(args.paths)
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    workers = args.workers or os.cpu_count() or 1
+    workers = min(workers, len(files)) or 1
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = (solve_file(path, args) for path in files)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(args.verbose,))
+        results = executor.map(solve_file, files, [args] * len(files), chunksize=max(1, len(files) // (workers * 8)))
+
+    failed = 0
+    try:
+        for name, ok, elapsed, error, line in results:
+            if line:
+                print(line, flush=True)
+            # 逐个电路的耗时输出到标准错误，不与标准输出中的结果混在一起
+            print('{}\t{}\t{:.2f} ms{}'.format(name, 'ok' if ok else 'failed', elapsed * 1000,
+                                              '\t' + error if error else ''), file=sys.stderr)
+            failed += not ok
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    print('共{}个电路，失败{}个，总耗时{:.2f} s'.format(
+        len(files), failed, time.perf_counter() - start), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
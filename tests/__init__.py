@@ -0,0 +1,6 @@
+# 测试只输出警告与错误日志；在项目根目录下运行 python -m unittest discover -s tests -t .
+import logging
+
+from log_config import logger
+
+logger.setLevel(logging.WARNING)
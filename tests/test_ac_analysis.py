@@ -0,0 +1,71 @@
+# 交流分析：与解析的频率响应以及逐点数值求解比较，稠密 QZ 与稀疏 LU 两条路径结果一致
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def build_rc(R: float = 1e3, C: float = 1e-6) -> CS.Netlist:
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, R)
+    netlist.add('C', 1, CS.GND, C)
+    return netlist
+
+
+def build_rlc_ladder(sections: int) -> CS.Netlist:
+    netlist = CS.Netlist(2 * sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', 2 * k, 2 * k + 1, 1.0 + 0.1 * k)
+        netlist.add('L', 2 * k + 1, 2 * k + 2, 1e-3)
+        netlist.add('C', 2 * k + 2, CS.GND, 1e-6 * (1 + 0.05 * k))
+    return netlist
+
+
+class ACAnalysisTest(unittest.TestCase):
+    def test_rc_lowpass(self):
+        # H(jω) = 1 / (1 + jωRC)，转折频率处 -3 dB、-45°
+        R, C = 1e3, 1e-6
+        frequencies = CS.frequency_grid(1, 1e5, 50)
+        result = CS.ac_analysis(build_rc(R, C), frequencies)
+        expected = 1 / (1 + 2j * np.pi * frequencies * R * C)
+        np.testing.assert_allclose(result.getResponse(1), expected, rtol=1e-10)
+        corner = CS.ac_analysis(build_rc(R, C), [1 / (2 * np.pi * R * C)])
+        self.assertAlmostEqual(corner.getMagnitude(1)[0], -10 * np.log10(2), places=8)
+        self.assertAlmostEqual(corner.getPhase(1)[0], -45.0, places=8)
+
+    def test_matches_pointwise_solve(self):
+        # 交流分析中电源取原值作为相量，数值引擎在 s 处的电源为阶跃 1/s
+        netlist = build_rlc_ladder(5)
+        frequencies = CS.frequency_grid(10, 1e5, 20)
+        result = CS.ac_analysis(netlist, frequencies)
+        for k, f in enumerate(frequencies):
+            s = 2j * np.pi * f
+            expected = CS.solve_numeric(netlist, s)[:netlist.num_nodes] * s
+            np.testing.assert_allclose(result.responses[k], expected, rtol=1e-7, atol=1e-12)
+
+    def test_dense_and_sparse_paths_agree(self):
+        netlist = build_rlc_ladder(20)
+        frequencies = CS.frequency_grid(10, 1e5, 64)
+        dense = CS.ac_analysis(netlist, frequencies, dense=True)
+        sparse = CS.ac_analysis(netlist, frequencies, dense=False)
+        parallel = CS.ac_analysis(netlist, frequencies, dense=False, workers=2)
+        np.testing.assert_allclose(dense.responses, sparse.responses, rtol=1e-7, atol=1e-12)
+        np.testing.assert_allclose(parallel.responses, sparse.responses, rtol=1e-12)
+
+    def test_outputs_and_ground(self):
+        result = CS.ac_analysis(build_rc(), [100.0], outputs=[1, CS.GND])
+        self.assertEqual(result.responses.shape, (1, 2))
+        self.assertEqual(result.getResponse(CS.GND)[0], 0)
+
+    def test_frequency_grid(self):
+        grid = CS.frequency_grid(1, 1000, 4)
+        np.testing.assert_allclose(grid, [1, 10, 100, 1000])
+        with self.assertRaises(ValueError):
+            CS.frequency_grid(0, 10, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+# 电路描述文件：SPICE 子集网表的解析、写出后再读入的往返，以及电流源方向与手算工作点的比较
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+from CircuitSolver.CircuitFile import parse_spice_value
+
+DIVIDER = '''divider with a current source
+* 4V - 1k - out - 2k - gnd，电流源从地经电源流向 out，即向 out 注入 1mA
+V1 in 0 DC 4
+R1 in out 1k
+R2 out 0 2k ; 行尾注释
+I1 0 out
++ 1m
+.end
+'''
+
+FILTERS = '''two cascaded filters
+.subckt rc in out
+Rs in mid 1k
+C1 mid 0 1u
+Rload mid out 2k
+C2 out 0 0.5u
+.ends
+V1 a 0 DC 1
+X1 a b rc
+Xout b c RC
+C1 c 0 1n
+.end
+'''
+
+
+class CircuitFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        return path
+
+    def operating_point(self, circuit: CS.Circuit) -> dict[str, float]:
+        x = CS.solve_numeric(circuit.netlist)
+        return dict(zip(circuit.node_names, x[:circuit.netlist.num_nodes]))
+
+    def test_current_source_direction(self):
+        # (4 - v) / 1k + 1m = v / 2k，v = 10/3 V；电流源从 out 流入地时 v = 2 V
+        circuit = CS.load_circuit(self.write('divider.cir', DIVIDER))
+        self.assertEqual(circuit.element_names, ['V1', 'R1', 'R2', 'I1'])
+        self.assertAlmostEqual(self.operating_point(circuit)['out'], 10 / 3)
+        reversed_path = self.write('reversed.cir', DIVIDER.replace('I1 0 out', 'I1 out 0'))
+        self.assertAlmostEqual(self.operating_point(CS.load_circuit(reversed_path))['out'], 2.0)
+
+    def test_spice_round_trip(self):
+        circuit = CS.load_circuit(self.write('divider.cir', DIVIDER))
+        path = os.path.join(self.directory.name, 'copy.sp')
+        CS.save_circuit(circuit, path)
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        # 写出的电流源仍按 SPICE 的方向，其他 SPICE 工具读入后得到相同的工作点
+        self.assertIn('I1 0 out DC 0.001', lines)
+        copy = CS.load_circuit(path)
+        self.assertEqual(copy.element_names, circuit.element_names)
+        self.assertEqual(copy.netlist.elements, circuit.netlist.elements)
+        self.assertEqual(self.operating_point(copy), self.operating_point(circuit))
+
+    def test_subcircuit_round_trip(self):
+        # 子电路定义内的元件名、节点名按原样写回
+        circuit = CS.load_circuit(self.write('filters.cir', FILTERS))
+        self.assertEqual(circuit.instance_names, ['X1', 'Xout'])
+        subcircuit = circuit.netlist.instances[0][0]
+        self.assertIs(circuit.netlist.instances[1][0], subcircuit)
+        self.assertEqual(subcircuit.element_names, ['Rs', 'C1', 'Rload', 'C2'])
+        path = os.path.join(self.directory.name, 'copy.cir')
+        CS.save_circuit(circuit, path)
+        copy = CS.load_circuit(path)
+        copy_subcircuit = copy.netlist.instances[0][0]
+        self.assertEqual(copy_subcircuit.element_names, subcircuit.element_names)
+        self.assertEqual(copy_subcircuit.node_names, subcircuit.node_names)
+        self.assertEqual(copy_subcircuit.netlist.elements, subcircuit.netlist.elements)
+        self.assertEqual(copy.instance_names, circuit.instance_names)
+        # 顶层元件写在实例之前，节点的编号顺序可能改变，按节点名比较
+        for name, value in self.operating_point(circuit).items():
+            self.assertAlmostEqual(self.operating_point(copy)[name], value)
+        with self.assertRaises(CS.CircuitFileError):
+            CS.save_circuit(circuit, os.path.join(self.directory.name, 'copy.json'))
+
+    def test_json_round_trip(self):
+        circuit = CS.load_circuit(self.write('divider.cir', DIVIDER))
+        path = os.path.join(self.directory.name, 'copy.json')
+        CS.save_circuit(circuit, path)
+        copy = CS.load_circuit(path)
+        self.assertEqual(copy.node_names, circuit.node_names)
+        self.assertEqual(copy.netlist.elements, circuit.netlist.elements)
+
+    def test_spice_values(self):
+        for token, value in (('10k', 1e4), ('2.2MEG', 2.2e6), ('4.7uF', 4.7e-6), ('1e-3', 1e-3),
+                             ('.5m', 5e-4), ('10kOhm', 1e4), ('3mil', 3 * 25.4e-6), ('-2', -2.0)):
+            self.assertTrue(np.isclose(parse_spice_value(token), value), token)
+        with self.assertRaises(ValueError):
+            parse_spice_value('k10')
+
+    def test_errors(self):
+        for text in ('t\nR1 a\n', 't\nQ1 a b c 1\n', 't\nR1 a 0 abc\n', 't\nV1 a 0 DC\n',
+                     't\nX1 a b missing\n', 't\n.subckt s a\nR1 a 0 1\n', 't\n.subckt s a 0\n.ends\n'):
+            with self.assertRaises(CS.CircuitFileError):
+                CS.load_circuit(self.write('bad.cir', text))
+        with self.assertRaises(CS.CircuitFileError):
+            CS.load_circuit(self.write('bad.txt', DIVIDER))
+
+
+if __name__ == '__main__':
+    unittest.main()
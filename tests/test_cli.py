@@ -0,0 +1,64 @@
+# 命令行批量求解：标准输出每行一个完整的 JSON 结果，输出目录中的结果文件，失败时的返回值
+import contextlib
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import cli
+
+
+def write_divider(directory: str, name: str, value: float):
+    path = os.path.join(directory, name + '.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'elements': [{'name': 'V1', 'type': 'V', 'nodes': ['in', '0'], 'value': value},
+                                {'name': 'R1', 'type': 'R', 'nodes': ['in', 'out'], 'value': 1000},
+                                {'name': 'R2', 'type': 'R', 'nodes': ['out', 'gnd'], 'value': 1000}]}, f)
+    return path
+
+
+def run_cli(argv: list[str]) -> tuple[int, str]:
+    stdout, stderr = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        code = cli.main(argv)
+    return code, stdout.getvalue()
+
+
+class CliTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        for k in range(4):
+            write_divider(self.directory.name, 'divider{}'.format(k), 2.0 * (k + 1))
+
+    def test_json_lines_on_stdout(self):
+        for workers in ('1', '2'):
+            code, output = run_cli([self.directory.name, '-j', workers])
+            self.assertEqual(code, 0)
+            results = {result['circuit']: result for result in map(json.loads, output.splitlines())}
+            self.assertEqual(len(results), 4)
+            for k in range(4):
+                voltages = results['divider{}'.format(k)]['node_voltages']
+                self.assertAlmostEqual(voltages['out'], k + 1.0)
+
+    def test_csv_output_directory(self):
+        with tempfile.TemporaryDirectory() as output:
+            code, stdout = run_cli([self.directory.name, '-o', output, '-f', 'csv', '-j', '1'])
+            self.assertEqual(code, 0)
+            self.assertEqual(stdout, '')
+            with open(os.path.join(output, 'divider0.csv'), encoding='utf-8') as f:
+                rows = {name: value for name, value in csv.reader(f)}
+            self.assertAlmostEqual(float(rows['out']), 1.0)
+
+    def test_failed_circuit(self):
+        with open(os.path.join(self.directory.name, 'broken.json'), 'w', encoding='utf-8') as f:
+            f.write('{"elements": [{"type": "R"}]}')
+        code, output = run_cli([self.directory.name, '-j', '1'])
+        self.assertEqual(code, 1)
+        self.assertEqual(len(output.splitlines()), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
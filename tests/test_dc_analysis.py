@@ -0,0 +1,66 @@
+# 直流工作点：电容开路、电感短路，与手算结果以及 s→0 的数值解一致，元件电流按印记计算
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def conductance_admittance(values, s):
+    return values
+
+
+def build_bridge() -> CS.Netlist:
+    # 10V 经 1k 接到节点 1，节点 1 经 2k 接地，经 1mH 电感接节点 2，节点 2 经 3k 接地并有 1mA 注入，
+    # 节点 2 与 3 之间的电容直流开路
+    netlist = CS.Netlist(4)
+    netlist.add('V', 0, CS.GND, 10.0)
+    netlist.add('R', 0, 1, 1e3)
+    netlist.add('R', 1, CS.GND, 2e3)
+    netlist.add('L', 1, 2, 1e-3)
+    netlist.add('R', 2, CS.GND, 3e3)
+    netlist.add('I', 2, CS.GND, 1e-3)
+    netlist.add('C', 2, 3, 1e-6)
+    netlist.add('R', 3, CS.GND, 1e3)
+    return netlist
+
+
+class DCOperatingPointTest(unittest.TestCase):
+    def test_hand_computed(self):
+        # 节点 1、2 短接：(10 - v) / 1k + 1m = v / 2k + v / 3k，v = 11 / (1 + 1/2 + 1/3) = 6V
+        result = CS.dc_operating_point(build_bridge())
+        self.assertAlmostEqual(result.getNodeVoltage(1), 6.0)
+        self.assertAlmostEqual(result.getNodeVoltage(2), 6.0)
+        self.assertAlmostEqual(result.getNodeVoltage(3), 0.0)
+        self.assertEqual(result.getNodeVoltage(CS.GND), 0.0)
+        self.assertAlmostEqual(result.getVoltage(0, 1), 4.0)
+        # 电压源电流从 n1 经电源流向 n2（流入正极为正）
+        np.testing.assert_allclose(result.source_currents, [-4e-3])
+
+    def test_element_currents(self):
+        result = CS.dc_operating_point(build_bridge())
+        expected = [-4e-3, 4e-3, 3e-3, 1e-3, 2e-3, -1e-3, 0.0, 0.0]
+        for index, current in enumerate(expected):
+            self.assertAlmostEqual(result.getElementCurrent(index), current, places=12)
+
+    def test_registered_kind_current(self):
+        # 注册的电导元件按其直流导纳计算电流
+        CS.register_stamp(CS.Stamp('G', admittance=conductance_admittance))
+        netlist = CS.Netlist(2)
+        netlist.add('V', 0, CS.GND, 6.0)
+        netlist.add('G', 0, 1, 2e-3)
+        netlist.add('R', 1, CS.GND, 1e3)
+        result = CS.dc_operating_point(netlist)
+        self.assertAlmostEqual(result.getNodeVoltage(1), 4.0)
+        self.assertAlmostEqual(result.getElementCurrent(1), 4e-3, places=12)
+
+    def test_matches_numeric(self):
+        netlist = build_bridge()
+        for ordering in (None, 'natural', 'rcm', 'mindegree'):
+            result = CS.dc_operating_point(netlist, ordering)
+            np.testing.assert_allclose(result.node_voltages, CS.solve_numeric(netlist)[:netlist.num_nodes],
+                                       rtol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# 并查集：合并后的分组与直接按边搜索连通分量的结果一致
+import random
+import unittest
+
+import CircuitSolver as CS
+
+
+def components_by_search(n: int, edges: list[tuple[int, int]]) -> list[list[int]]:
+    adjacency = [[] for _ in range(n)]
+    for a, b in edges:
+        adjacency[a].append(b)
+        adjacency[b].append(a)
+    seen, groups = set(), []
+    for start in range(n):
+        if start in seen:
+            continue
+        seen.add(start)
+        group, stack = [], [start]
+        while stack:
+            v = stack.pop()
+            group.append(v)
+            for u in adjacency[v]:
+                if u not in seen:
+                    seen.add(u)
+                    stack.append(u)
+        groups.append(sorted(group))
+    return groups
+
+
+class DisjointSetTest(unittest.TestCase):
+    def test_random_unions(self):
+        rng = random.Random(0)
+        n = 500
+        edges = [(rng.randrange(n), rng.randrange(n)) for _ in range(350)]
+        ds = CS.DisjointSet(n)
+        for a, b in edges:
+            ds.union(a, b)
+        self.assertEqual(ds.groups(), components_by_search(n, edges))
+        for a, b in edges:
+            self.assertEqual(ds.find(a), ds.find(b))
+
+    def test_long_chain_without_recursion(self):
+        # 10^5 段串联导线，不会超出递归深度
+        n = 100000
+        ds = CS.DisjointSet(n)
+        for k in range(n - 1):
+            ds.union(k + 1, k)
+        self.assertEqual(len(ds.groups()), 1)
+        self.assertEqual(ds.size[ds.find(0)], n)
+
+    def test_add(self):
+        ds = CS.DisjointSet()
+        a, b, c = ds.add(), ds.add(), ds.add()
+        ds.union(a, c)
+        self.assertEqual(len(ds), 3)
+        self.assertEqual(ds.groups(), [[a, c], [b]])
+
+
+if __name__ == '__main__':
+    unittest.main()
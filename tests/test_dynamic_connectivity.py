@@ -0,0 +1,63 @@
+# 动态连通性：随机加边、删边（含重边与删点）后，分量与每次重新搜索的结果一致
+import random
+import unittest
+
+import CircuitSolver as CS
+
+
+def components_by_search(edges: list[tuple[int, int]], vertices: set) -> set[frozenset]:
+    adjacency = {v: set() for v in vertices}
+    for a, b in edges:
+        adjacency[a].add(b)
+        adjacency[b].add(a)
+    seen, groups = set(), set()
+    for start in vertices:
+        if start in seen:
+            continue
+        seen.add(start)
+        group, stack = {start}, [start]
+        while stack:
+            for u in adjacency[stack.pop()]:
+                if u not in seen:
+                    seen.add(u)
+                    group.add(u)
+                    stack.append(u)
+        groups.add(frozenset(group))
+    return groups
+
+
+class DynamicConnectivityTest(unittest.TestCase):
+    def test_random_edits(self):
+        rng = random.Random(1)
+        graph = CS.DynamicConnectivity()
+        vertices = set(range(40))
+        for v in vertices:
+            graph.add_vertex(v)
+        edges = []
+        for step in range(2000):
+            if edges and rng.random() < 0.45:
+                a, b = edges.pop(rng.randrange(len(edges)))
+                graph.remove_edge(a, b)
+            else:
+                # 允许重边：删去其中一条后两端仍然相连
+                a, b = rng.sample(sorted(vertices), 2)
+                edges.append((a, b))
+                graph.add_edge(a, b)
+            if step % 50 == 0:
+                expected = components_by_search(edges, vertices)
+                self.assertEqual({frozenset(c) for c in graph.getComponents()}, expected)
+                self.assertEqual(len(graph), len(expected))
+
+    def test_remove_vertex(self):
+        graph = CS.DynamicConnectivity()
+        graph.add_edge('a', 'b')
+        graph.add_edge('b', 'c')
+        graph.add_edge('b', 'c')
+        graph.remove_vertex('b')
+        self.assertNotIn('b', graph)
+        self.assertFalse(graph.connected('a', 'c'))
+        self.assertEqual(graph.getComponent('c'), {'c'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# 修改元件值后的增量求解应与重新完整求解一致：
+# 数值引擎的低秩修正，以及符号引擎只修改电源时重建右端项、重放消元记录的求解
+import pickle
+import unittest
+
+import numpy as np
+import sympy as sp
+
+import CircuitSolver as CS
+
+s = sp.Symbol('s')
+
+
+def build_ladder(sections: int = 4) -> CS.Netlist:
+    # RC 梯形网络，末端接电感到地，两端各有一个电源
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 1.0 + 0.5 * k)
+        netlist.add('C', k + 1, CS.GND, 0.2 + 0.1 * k)
+    netlist.add('L', sections, CS.GND, 0.5)
+    netlist.add('I', sections, CS.GND, 0.25)
+    return netlist
+
+
+def assert_same_functions(test: unittest.TestCase, actual: list, expected: list):
+    test.assertEqual(len(actual), len(expected))
+    for a, b in zip(actual, expected):
+        test.assertEqual(sp.cancel(a - b), 0)
+
+
+class IncrementalSolverTest(unittest.TestCase):
+    def check_updates(self, s_value, max_rank: int = 16):
+        netlist = build_ladder()
+        solver = CS.IncrementalSolver(netlist, s_value, max_rank=max_rank)
+        updates = [(1, 3.0), (2, 0.7), (3, 2.5), (9, 1.5), (0, 2.0), (10, -0.5), (1, 0.4)]
+        for index, value in updates:
+            x = solver.update_value(index, value)
+            np.testing.assert_allclose(x, CS.solve_numeric(netlist, s_value), rtol=1e-10, atol=1e-12)
+
+    def test_dc(self):
+        self.check_updates(None)
+
+    def test_complex_s(self):
+        self.check_updates(0.5 + 1.5j)
+
+    def test_refactor_after_max_rank(self):
+        self.check_updates(None, max_rank=2)
+
+
+class PolyFactorizationTest(unittest.TestCase):
+    def test_source_change_matches_fresh_solve(self):
+        netlist = build_ladder()
+        solution, factorization = CS.factor_MNA_poly(netlist, s)
+        assert_same_functions(self, solution, CS.solve_MNA_poly(netlist, s))
+        netlist.setValue(0, 2.5)
+        netlist.setValue(len(netlist) - 1, -1.25)
+        assert_same_functions(self, factorization.solve(netlist, s), CS.solve_MNA_poly(netlist, s))
+
+    def test_factorization_survives_pickling(self):
+        # 消元记录从后台求解进程送回界面进程
+        netlist = build_ladder(3)
+        _, factorization = CS.factor_MNA_poly(netlist, s)
+        factorization = pickle.loads(pickle.dumps(factorization))
+        netlist.setValue(0, 0.3)
+        assert_same_functions(self, factorization.solve(netlist, s), CS.solve_MNA_poly(netlist, s))
+
+
+if __name__ == '__main__':
+    unittest.main()
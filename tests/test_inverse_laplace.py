@@ -0,0 +1,75 @@
+# 留数法逆拉氏变换与已知变换对比较：单极点、重极点、共轭复极点与阶跃
+import unittest
+
+import numpy as np
+import sympy as sp
+
+import CircuitSolver as CS
+
+s, t = sp.symbols('s t')
+T = np.linspace(0, 5, 101)
+
+
+class InverseLaplaceTest(unittest.TestCase):
+    def assertTransform(self, expr, expected):
+        result = CS.inverse_laplace(expr, s, t)
+        self.assertTrue(result.isRational())
+        np.testing.assert_allclose(result(T), expected(T), rtol=1e-8, atol=1e-10)
+        # 闭式表达式与求值函数一致
+        closed = sp.lambdify(t, result.expr, 'numpy')
+        np.testing.assert_allclose(np.real(closed(T[1:])), expected(T[1:]), rtol=1e-8, atol=1e-10)
+
+    def test_step(self):
+        self.assertTransform(3 / s, lambda t: np.full_like(t, 3.0))
+
+    def test_simple_poles(self):
+        self.assertTransform(1 / ((s + 1) * (s + 3)), lambda t: (np.exp(-t) - np.exp(-3 * t)) / 2)
+
+    def test_repeated_pole(self):
+        # 1/(s+2)^3 -> t^2 e^{-2t} / 2
+        self.assertTransform(1 / (s + 2) ** 3, lambda t: t ** 2 * np.exp(-2 * t) / 2)
+
+    def test_repeated_pole_at_origin(self):
+        # 1/(s^2 (s+1)) -> t - 1 + e^{-t}
+        self.assertTransform(1 / (s ** 2 * (s + 1)), lambda t: t - 1 + np.exp(-t))
+
+    def test_conjugate_poles(self):
+        # 3/((s+1)^2 + 9) -> e^{-t} sin 3t，(s+1)/((s+1)^2 + 9) -> e^{-t} cos 3t
+        self.assertTransform(3 / ((s + 1) ** 2 + 9), lambda t: np.exp(-t) * np.sin(3 * t))
+        self.assertTransform((s + 1) / ((s + 1) ** 2 + 9), lambda t: np.exp(-t) * np.cos(3 * t))
+
+    def test_repeated_conjugate_poles(self):
+        # 2s/(s^2+1)^2 -> t sin t
+        self.assertTransform(2 * s / (s ** 2 + 1) ** 2, lambda t: t * np.sin(t))
+
+    def test_rc_step_response(self):
+        # 1/(s (1 + sRC)) -> 1 - e^{-t/RC}
+        RC = sp.Rational(1, 2)
+        self.assertTransform(1 / (s * (1 + s * RC)), lambda t: 1 - np.exp(-2 * t))
+
+    def test_direct_term_is_ignored(self):
+        # (s+2)/(s+1) = 1 + 1/(s+1)：冲激项在绘图时按 0 处理
+        result = CS.inverse_laplace((s + 2) / (s + 1), s, t)
+        np.testing.assert_allclose(result(T), np.exp(-T), rtol=1e-10)
+        self.assertTrue(result.expr.has(sp.DiracDelta))
+
+    def test_zero(self):
+        result = CS.inverse_laplace(sp.Integer(0), s, t)
+        np.testing.assert_array_equal(result(T), np.zeros_like(T))
+
+    def test_values_before_zero(self):
+        result = CS.inverse_laplace(1 / (s + 1), s, t)
+        np.testing.assert_array_equal(result(np.array([-1.0, -0.1])), [0.0, 0.0])
+
+    def test_many_matches_serial(self):
+        # 进程池并行变换的结果与逐个变换相同，按输入顺序返回，重复的表达式只计算一次
+        exprs = [1 / (s + k) for k in range(1, 5)] + [1 / (s + 1), 1 / (s ** 2 + 4)]
+        results = CS.inverse_laplace_many(exprs, s, t, workers=2)
+        self.assertEqual(len(results), len(exprs))
+        for expr, result in zip(exprs, results):
+            np.testing.assert_allclose(result(T), CS.inverse_laplace(expr, s, t)(T), rtol=1e-12)
+        self.assertIs(results[0], results[4])
+
+
+if __name__ == '__main__':
+    unittest.main()
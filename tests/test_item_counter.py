@@ -0,0 +1,41 @@
+# 图元编号：总是分配最小的未使用编号，释放未分配或已释放的编号不影响之后的分配
+import random
+import unittest
+
+from CircuitItem.BaseCircuitItem import ItemCounter
+
+
+class ItemCounterTest(unittest.TestCase):
+    def test_smallest_free_id(self):
+        counter = ItemCounter()
+        self.assertEqual([counter.genItemID() for _ in range(5)], [1, 2, 3, 4, 5])
+        counter.delItemID(4)
+        counter.delItemID(2)
+        self.assertEqual([counter.genItemID() for _ in range(3)], [2, 4, 6])
+
+    def test_ignores_invalid_ids(self):
+        counter = ItemCounter()
+        counter.genItemID()
+        counter.delItemID(0)
+        counter.delItemID(7)
+        counter.delItemID(1)
+        counter.delItemID(1)
+        self.assertEqual([counter.genItemID() for _ in range(2)], [1, 2])
+
+    def test_matches_linear_scan(self):
+        counter = ItemCounter()
+        used = set()
+        rng = random.Random(0)
+        for _ in range(5000):
+            if used and rng.random() < 0.4:
+                item_id = rng.choice(sorted(used))
+                used.remove(item_id)
+                counter.delItemID(item_id)
+            else:
+                expected = next(i for i in range(1, len(used) + 2) if i not in used)
+                self.assertEqual(counter.genItemID(), expected)
+                used.add(expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# 蒙特卡洛容差分析：样本与逐个代入数值求解一致，统计可复现，后台任务能收到全部样本
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import CircuitSolver as CS
+import CircuitSolver.MonteCarlo as MonteCarlo
+
+# 等待后台任务的最长时间/s
+JOB_TIMEOUT = 60
+
+
+def build_divider() -> CS.Netlist:
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 10.0)
+    netlist.add('R', 0, 1, 1000.0)
+    netlist.add('R', 1, CS.GND, 1000.0)
+    netlist.add('R', 1, 2, 500.0)
+    netlist.add('R', 2, CS.GND, 2000.0)
+    return netlist
+
+
+class MonteCarloTest(unittest.TestCase):
+    def test_zero_tolerance_gives_nominal(self):
+        netlist = build_divider()
+        tolerances = CS.default_tolerances(netlist, CS.Tolerance(0.0))
+        stats = CS.run_monte_carlo(netlist, [1, 2], 100, tolerances, workers=1, seed=1)
+        self.assertEqual(len(stats), 100)
+        nominal = CS.solve_numeric(netlist)[[1, 2]]
+        np.testing.assert_allclose(stats.samples, np.tile(nominal, (100, 1)), rtol=1e-12)
+
+    def test_samples_within_tolerance_bounds(self):
+        # 两个 1k 电阻分压，均匀分布 ±10% 时分压点的电位在 10 * 0.9 / 2 与 10 * 1.1 / 2 之间
+        netlist = CS.Netlist(2)
+        netlist.add('V', 0, CS.GND, 10.0)
+        netlist.add('R', 0, 1, 1000.0)
+        netlist.add('R', 1, CS.GND, 1000.0)
+        tolerances = CS.default_tolerances(netlist, CS.Tolerance(0.1))
+        self.assertEqual(list(tolerances), [1, 2])
+        stats = CS.run_monte_carlo(netlist, [1], 2000, tolerances, workers=1, seed=2)
+        samples = stats.samples[:, 0]
+        self.assertGreaterEqual(samples.min(), 4.5)
+        self.assertLessEqual(samples.max(), 5.5)
+        self.assertAlmostEqual(stats.mean()[0], 5.0, delta=0.05)
+        self.assertEqual(stats.yield_ratio(np.array([4.5]), np.array([5.5])), 1.0)
+
+    def test_seed_is_reproducible_across_workers(self):
+        # 每块的随机种子由 seed 派生，与进程数无关；多进程时各块按完成顺序到达
+        netlist = build_divider()
+        serial = CS.run_monte_carlo(netlist, [1, 2], 1000, workers=1, chunk_size=128, seed=3)
+        again = CS.run_monte_carlo(netlist, [1, 2], 1000, workers=1, chunk_size=128, seed=3)
+        parallel = CS.run_monte_carlo(netlist, [1, 2], 1000, workers=2, chunk_size=128, seed=3)
+        np.testing.assert_array_equal(serial.samples, again.samples)
+        np.testing.assert_allclose(np.sort(parallel.samples, axis=0), np.sort(serial.samples, axis=0))
+
+    def test_sparse_path_matches_dense(self):
+        netlist = build_divider()
+        dense = CS.run_monte_carlo(netlist, [1, 2], 300, workers=1, seed=4)
+        with mock.patch.object(MonteCarlo, 'DENSE_BATCH_MAX_SIZE', 0):
+            sparse = CS.run_monte_carlo(netlist, [1, 2], 300, workers=1, seed=4)
+        np.testing.assert_allclose(sparse.samples, dense.samples, rtol=1e-12)
+
+    def test_background_job_streams_samples(self):
+        job = CS.MonteCarloJob(build_divider(), [1, 2], 1000)
+        job.start()
+        stats = CS.MonteCarloStats(2)
+        deadline = time.monotonic() + JOB_TIMEOUT
+        messages = []
+        while not job.finished and time.monotonic() < deadline:
+            for message in job.poll():
+                messages.append(message[0])
+                if message[0] == 'samples':
+                    stats.add(message[1])
+            time.sleep(0.05)
+        job.process.join()
+        self.assertEqual(messages[-1], 'result')
+        self.assertEqual(len(stats), 1000)
+
+    def test_background_job_cancel(self):
+        job = CS.MonteCarloJob(build_divider(), [1, 2], 10 ** 8)
+        job.start()
+        job.cancel()
+        self.assertTrue(job.finished)
+        self.assertFalse(job.process.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+# 紧凑数组存储的网表：元组视图、numpy 视图、复制与修改
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def build_netlist() -> CS.Netlist:
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 5.0)
+    netlist.add('R', 0, 1, 1e3)
+    netlist.add('C', 1, 2, 1e-6)
+    netlist.add('L', 2, CS.GND, 1e-3)
+    netlist.add('I', CS.GND, 2, 0.01)
+    return netlist
+
+
+class NetlistTest(unittest.TestCase):
+    def test_element_view(self):
+        netlist = build_netlist()
+        self.assertEqual(len(netlist), 5)
+        self.assertEqual(netlist.elements[2], ('C', 1, 2, 1e-6))
+        self.assertEqual(list(netlist.elements)[-1], ('I', CS.GND, 2, 0.01))
+        self.assertEqual(netlist.getElementsOfKind('R'), [(0, 1, 1e3)])
+        self.assertEqual((netlist.getVoltageSourcesNum(), netlist.getInductorsNum()), (1, 1))
+        self.assertEqual(netlist.getMemorySize(), 5 * 17)
+
+    def test_arrays_share_memory(self):
+        netlist = build_netlist()
+        kinds, n1, n2, values = netlist.getArrays()
+        np.testing.assert_array_equal(n2, [CS.GND, 1, 2, CS.GND, 2])
+        netlist.setValue(1, 2e3)
+        self.assertEqual(values[1], 2e3)
+        np.testing.assert_array_equal(netlist.getIndexOfKind('L'), [3])
+
+    def test_copy_is_independent(self):
+        netlist = build_netlist()
+        copy = netlist.copy()
+        copy.setValue(0, 1.0)
+        copy.add('R', 1, CS.GND, 10.0)
+        self.assertEqual(netlist.elements[0][3], 5.0)
+        self.assertEqual((len(netlist), len(copy)), (5, 6))
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            build_netlist().add('Q', 0, 1, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
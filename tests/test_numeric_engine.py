@@ -0,0 +1,61 @@
+# 稀疏数值引擎：直流与给定复频率处的解与手算结果比较
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def build_divider() -> CS.Netlist:
+    # 4V 电压源 - 1k - 节点 1 - 2k - 地，电流源向节点 1 注入 1mA
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 4.0)
+    netlist.add('R', 0, 1, 1000.0)
+    netlist.add('R', 1, CS.GND, 2000.0)
+    netlist.add('I', 1, CS.GND, 1e-3)
+    return netlist
+
+
+def build_rc(R: float = 2.0, C: float = 0.5) -> CS.Netlist:
+    # 1V 阶跃电压源 - R - 节点 1 - C - 地
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, R)
+    netlist.add('C', 1, CS.GND, C)
+    return netlist
+
+
+class NumericEngineTest(unittest.TestCase):
+    def test_dc_divider(self):
+        # (4 - v) / 1k + 1m = v / 2k，v = 10/3 V；电压源支路电流为 -(4 - v) / 1k
+        x = CS.solve_numeric(build_divider())
+        np.testing.assert_allclose(x, [4.0, 10 / 3, -(4 - 10 / 3) / 1000], rtol=1e-12)
+
+    def test_rc_at_complex_s(self):
+        # 阶跃电源在 s 处为 1/s，分压得 v = 1 / (s (1 + sRC))
+        R, C = 2.0, 0.5
+        for s in (1j, 0.3 + 2j, -0.5 + 0.1j):
+            x = CS.solve_numeric(build_rc(R, C), s)
+            self.assertAlmostEqual(x[1], 1 / (s * (1 + s * R * C)), places=12)
+
+    def test_inductor_at_dc_is_short(self):
+        # 直流时电感为 0V 支路，支路电流即流过电感的电流
+        netlist = CS.Netlist(2)
+        netlist.add('V', 0, CS.GND, 3.0)
+        netlist.add('L', 0, 1, 1e-3)
+        netlist.add('R', 1, CS.GND, 1.5)
+        x = CS.solve_numeric(netlist)
+        self.assertEqual(len(x), 4)
+        np.testing.assert_allclose(x[:2], [3.0, 3.0])
+        self.assertAlmostEqual(abs(x[3]), 2.0)
+
+    def test_floating_node_is_singular(self):
+        netlist = build_divider()
+        netlist.num_nodes += 1
+        netlist.add('C', 2, CS.GND, 1.0)
+        with self.assertRaises(CS.SingularCircuitError):
+            CS.solve_numeric(netlist)
+
+
+if __name__ == '__main__':
+    unittest.main()
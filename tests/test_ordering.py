@@ -0,0 +1,51 @@
+# 填充缩减排序：得到合法的排列，最小度排序不比自然顺序产生更多填充，指定排序不改变解
+import unittest
+
+import numpy as np
+import scipy.sparse as sps
+import scipy.sparse.linalg as spla
+
+import CircuitSolver as CS
+from CircuitSolver.NumericEngine import stamp_MNA_sparse
+from CircuitSolver.Ordering import ORDERINGS, get_ordering, count_factor_nonzeros
+
+
+def build_star(leaves: int = 30) -> CS.Netlist:
+    # 星形网络：中心节点编号为 0，按自然顺序先消去中心会使所有叶节点两两相连
+    netlist = CS.Netlist(leaves + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(1, leaves + 1):
+        netlist.add('R', 0, k, float(k))
+        netlist.add('R', k, CS.GND, 2.0)
+    return netlist
+
+
+class OrderingTest(unittest.TestCase):
+    def test_orderings_are_permutations(self):
+        A, _ = stamp_MNA_sparse(build_star())
+        for method in ORDERINGS:
+            order = get_ordering(A, method)
+            np.testing.assert_array_equal(np.sort(order), np.arange(A.shape[0]))
+
+    def test_mindegree_reduces_fill(self):
+        A, _ = stamp_MNA_sparse(build_star())
+        natural = count_factor_nonzeros(A, get_ordering(A, 'natural'))
+        mindegree = count_factor_nonzeros(A, get_ordering(A, 'mindegree'))
+        self.assertLess(mindegree, natural)
+        # 星形（树）按最小度排序没有填充：因子的非零元数等于对角元加边数
+        self.assertEqual(mindegree, A.shape[0] + (sps.triu(A, 1) != 0).sum())
+
+    def test_ordering_does_not_change_solution(self):
+        A, b = stamp_MNA_sparse(build_star())
+        expected = spla.spsolve(A.tocsc(), b)
+        for method in ORDERINGS:
+            np.testing.assert_allclose(CS.solve_MNA_sparse(A, b, method), expected, rtol=1e-12)
+
+    def test_unknown_method(self):
+        A, _ = stamp_MNA_sparse(build_star(3))
+        with self.assertRaises(ValueError):
+            get_ordering(A, 'amd')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# 多项式引擎：QQ[s] 上的有理函数解在若干复频率处应与稀疏数值引擎一致
+import unittest
+
+import numpy as np
+import sympy as sp
+
+import CircuitSolver as CS
+
+S_VALUES = (0.7j, 1.5 + 2j, -0.3 + 0.9j, 4.0)
+
+
+def build_rlc() -> CS.Netlist:
+    # 含电压源、电流源、电感与电容的桥式电路，元件值互不相同
+    netlist = CS.Netlist(4)
+    netlist.add('V', 0, CS.GND, 2.0)
+    netlist.add('R', 0, 1, 1.5)
+    netlist.add('L', 1, 2, 0.4)
+    netlist.add('C', 2, CS.GND, 0.25)
+    netlist.add('R', 1, 3, 3.0)
+    netlist.add('C', 3, 2, 0.1)
+    netlist.add('R', 3, CS.GND, 2.2)
+    netlist.add('I', 3, CS.GND, 0.5)
+    return netlist
+
+
+class PolyEngineTest(unittest.TestCase):
+    def assertAgrees(self, netlist: CS.Netlist):
+        # 数值引擎在 s 处以导纳 1/(sL) 写入电感，只比较节点电位与电压源电流
+        s = sp.Symbol('s')
+        solution = CS.solve_MNA_poly(netlist, s)
+        count = netlist.num_nodes + netlist.getVoltageSourcesNum()
+        for s_value in S_VALUES:
+            expected = CS.solve_numeric(netlist, s_value)[:count]
+            actual = np.array([complex(expr.subs(s, s_value)) for expr in solution[:count]])
+            np.testing.assert_allclose(actual, expected, rtol=1e-10, atol=1e-12)
+
+    def test_agrees_with_numeric_engine(self):
+        self.assertAgrees(build_rlc())
+
+    def test_solution_is_rational_in_s(self):
+        s = sp.Symbol('s')
+        for expr in CS.solve_MNA_poly(build_rlc(), s):
+            num, den = sp.fraction(sp.together(expr))
+            self.assertTrue(num.is_polynomial(s) and den.is_polynomial(s))
+
+    def test_decimal_values_are_exact(self):
+        # 0.1 按十进制转换为 1/10，不引入二进制舍入误差
+        netlist = CS.Netlist(2)
+        netlist.add('V', 0, CS.GND, 1.0)
+        netlist.add('R', 0, 1, 0.1)
+        netlist.add('R', 1, CS.GND, 0.3)
+        s = sp.Symbol('s')
+        self.assertEqual(sp.simplify(CS.solve_MNA_poly(netlist, s)[1] - sp.Rational(3, 4) / s), 0)
+
+    def test_singular_circuit(self):
+        netlist = CS.Netlist(2)
+        netlist.add('V', 0, CS.GND, 1.0)
+        netlist.add('C', 1, CS.GND, 1.0)
+        netlist.add('R', 1, CS.GND, 1.0)
+        netlist.num_nodes = 3
+        with self.assertRaises(CS.SingularCircuitError):
+            CS.solve_MNA_poly(netlist, sp.Symbol('s'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# 模型降阶：低阶模型在低频与瞬态下逼近完整模型，阶数等于原阶数时精确，相对误差按全局幅值归一化
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+from CircuitSolver.Reduction import relative_error
+
+
+def build_rc_line(sections: int = 60) -> CS.Netlist:
+    netlist = CS.Netlist(sections + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(sections):
+        netlist.add('R', k, k + 1, 10.0)
+        netlist.add('C', k + 1, CS.GND, 1e-6)
+    return netlist
+
+
+class ReductionTest(unittest.TestCase):
+    def test_low_order_accuracy(self):
+        netlist = build_rc_line()
+        model = CS.reduce_order(netlist, 10)
+        self.assertEqual(model.getOrder(), 10)
+        # 展开点 s0 = 0，在线路的带宽（约 10 Hz）以下匹配得很好
+        frequencies = CS.frequency_grid(0.1, 100, 20)
+        report = CS.compare_reduced(netlist, model, frequencies, t_stop=0.1, t_step=1e-3, outputs=[30, 60])
+        self.assertLess(report.ac_error.max(), 1e-8)
+        self.assertLess(report.transient_error.max(), 1e-2)
+        self.assertIn('模型降阶', str(report))
+
+    def test_full_order_is_exact(self):
+        netlist = build_rc_line(8)
+        model = CS.reduce_order(netlist, 100)
+        frequencies = CS.frequency_grid(1, 1e6, 30)
+        full = CS.ac_analysis(netlist, frequencies)
+        np.testing.assert_allclose(model.ac_analysis(frequencies).responses, full.responses, atol=1e-10)
+
+    def test_transient_starts_from_initial_state(self):
+        netlist = build_rc_line(8)
+        reduced = CS.reduce_order(netlist, 4).simulate_transient(1e-4, 1e-6)
+        full = CS.simulate_transient(netlist, 1e-4, 1e-6)
+        np.testing.assert_allclose(reduced.node_voltages[0], full.node_voltages[0], atol=1e-12)
+
+    def test_relative_error_uses_global_scale(self):
+        # 第二个输出接近零，误差仍按所有输出的最大幅值归一化
+        full = np.array([[1.0, 1e-12], [0.5, 2e-12]])
+        reduced = full + np.array([[1e-3, 1e-6], [0, 0]])
+        np.testing.assert_allclose(relative_error(full, reduced), [1e-3, 1e-6])
+
+    def test_invalid_order(self):
+        with self.assertRaises(ValueError):
+            CS.reduce_order(build_rc_line(4), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+# 符号求解任务：s 域解与时域结果、只修改电源时复用消元记录，后台任务的进度、结果与取消
+import time
+import unittest
+
+import numpy as np
+import sympy as sp
+
+import CircuitSolver as CS
+
+s, t = sp.symbols('s t')
+# 等待后台任务的最长时间/s
+JOB_TIMEOUT = 120
+
+
+def build_rc() -> CS.Netlist:
+    # 1V 阶跃经 1Ω 给 1F 电容充电：v1(t) = 1 - e^-t
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, 1.0)
+    netlist.add('C', 1, CS.GND, 1.0)
+    return netlist
+
+
+class SolveSymbolicTest(unittest.TestCase):
+    def test_step_response(self):
+        solution, results = CS.solve_symbolic(build_rc(), s, t)
+        self.assertEqual(sp.cancel(solution[1] - 1 / (s * (s + 1))), 0)
+        times = np.linspace(0, 5, 11)
+        np.testing.assert_allclose(results[1](times), 1 - np.exp(-times), atol=1e-12)
+
+    def test_progress_covers_stages(self):
+        stages = []
+        CS.solve_symbolic(build_rc(), s, t, lambda stage, fraction: stages.append(stage))
+        self.assertEqual(list(dict.fromkeys(stages)), ['stamping', 'solve', 'inverse'])
+
+    def test_factorization_reused_for_sources(self):
+        netlist = build_rc()
+        _, _, factorization = CS.solve_symbolic_factored(netlist, s, t)
+        netlist.setValue(0, 3.0)
+        solution, results, reused = CS.solve_symbolic_factored(netlist, s, t, factorization)
+        self.assertIs(reused, factorization)
+        self.assertEqual(sp.cancel(solution[1] - 3 / (s * (s + 1))), 0)
+        np.testing.assert_allclose(results[1](np.array([1.0])), 3 * (1 - np.exp(-1)), atol=1e-12)
+
+
+class SolveJobTest(unittest.TestCase):
+    def run_job(self, job: CS.SolveJob) -> list[tuple]:
+        job.start()
+        deadline = time.monotonic() + JOB_TIMEOUT
+        messages = []
+        while not job.finished and time.monotonic() < deadline:
+            messages.extend(job.poll())
+            time.sleep(0.05)
+        job.process.join()
+        return messages
+
+    def test_result_and_progress(self):
+        messages = self.run_job(CS.SolveJob(build_rc(), s, t))
+        kinds = [message[0] for message in messages]
+        self.assertIn('progress', kinds)
+        self.assertEqual(kinds[-1], 'result')
+        _, solution, results, factorization = messages[-1]
+        self.assertEqual(sp.cancel(solution[1] - 1 / (s * (s + 1))), 0)
+        self.assertIsInstance(factorization, CS.PolyFactorization)
+
+    def test_error_message(self):
+        # 悬空节点使 MNA 方程奇异，任务发送错误消息而不是意外退出
+        netlist = build_rc()
+        netlist.num_nodes = 3
+        messages = self.run_job(CS.SolveJob(netlist, s, t))
+        self.assertEqual(messages[-1][0], 'error')
+        self.assertNotIn('意外退出', messages[-1][1])
+
+    def test_cancel(self):
+        job = CS.SolveJob(build_rc(), s, t)
+        job.start()
+        job.cancel()
+        self.assertTrue(job.finished)
+        self.assertFalse(job.process.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
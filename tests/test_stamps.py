@@ -0,0 +1,94 @@
+# 注册的元件类型：电导 G 与等效电阻网络的直流、交流、符号求解结果一致，
+# 注册的支路元件（电流表 A，0V 支路）排在电感之后时 G + sC 形式中电感仍写在正确的行上
+import unittest
+
+import numpy as np
+import sympy as sp
+
+import CircuitSolver as CS
+from CircuitSolver.ACAnalysis import stamp_MNA_pencil
+from CircuitSolver.Netlist import KIND_CODES
+from CircuitSolver.Stamps import get_branch_elements
+
+s = sp.Symbol('s')
+
+
+def conductance_admittance(values, s):
+    return values
+
+
+def always(s) -> bool:
+    return True
+
+
+CS.register_stamp(CS.Stamp('G', admittance=conductance_admittance))
+CS.register_stamp(CS.Stamp('A', branch=always))
+
+
+def build_ladder(kind: str) -> CS.Netlist:
+    # 串联支路为电阻（kind 为 'R'）或与之等效的电导（kind 为 'G'），阻值取 2 的幂使倒数是精确的
+    netlist = CS.Netlist(4)
+    netlist.add('V', 0, CS.GND, 1.0)
+    for k in range(3):
+        resistance = 2.0 ** (k - 1)
+        netlist.add(kind, k, k + 1, resistance if kind == 'R' else 1 / resistance)
+        netlist.add('C', k + 1, CS.GND, 0.5)
+    netlist.add('I', CS.GND, 3, 0.25)
+    return netlist
+
+
+def build_rl_with_ammeter() -> CS.Netlist:
+    # 电阻接到电容与电感并联的节点，电流表串在电感支路中
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, 2.0)
+    netlist.add('A', 1, 2, 0.0)
+    netlist.add('L', 2, CS.GND, 0.5)
+    netlist.add('C', 1, CS.GND, 1e-3)
+    return netlist
+
+
+class RegisteredStampTest(unittest.TestCase):
+    def test_register_kind(self):
+        self.assertIn('G', KIND_CODES)
+        netlist = build_ladder('G')
+        self.assertEqual(netlist.elements[1], ('G', 0, 1, 2.0))
+        self.assertEqual(len(netlist.getIndexOfKind('G')), 3)
+
+    def test_conductance_matches_resistors(self):
+        resistors, conductances = build_ladder('R'), build_ladder('G')
+        for s_value in (None, 0.5j, 1 + 2j):
+            np.testing.assert_allclose(CS.solve_numeric(conductances, s_value),
+                                       CS.solve_numeric(resistors, s_value), rtol=1e-12)
+        frequencies = CS.frequency_grid(1e-2, 1e2, 20)
+        np.testing.assert_allclose(CS.ac_analysis(conductances, frequencies).responses,
+                                   CS.ac_analysis(resistors, frequencies).responses, rtol=1e-12)
+
+    def test_conductance_poly(self):
+        for a, b in zip(CS.solve_MNA_poly(build_ladder('G'), s), CS.solve_MNA_poly(build_ladder('R'), s)):
+            self.assertEqual(sp.cancel(a - b), 0)
+
+
+class BranchOrderTest(unittest.TestCase):
+    def test_inductor_row_in_pencil(self):
+        netlist = build_rl_with_ammeter()
+        kinds = np.frombuffer(netlist.kinds, dtype=np.int8)
+        branches = get_branch_elements(netlist)
+        # 支路未知量按注册顺序为 V、L（直流时）、A
+        self.assertEqual(kinds[branches].tolist(), [KIND_CODES['V'], KIND_CODES['L'], KIND_CODES['A']])
+        _, C, _ = stamp_MNA_pencil(netlist)
+        row = netlist.num_nodes + 1
+        self.assertEqual(C[row, row], -0.5)
+        self.assertEqual(C[row + 1, row + 1], 0)
+
+    def test_ac_matches_pointwise_solve(self):
+        netlist = build_rl_with_ammeter()
+        frequencies = np.array([0.1, 1.0, 10.0])
+        result = CS.ac_analysis(netlist, frequencies)
+        for j, f in enumerate(frequencies):
+            x = CS.solve_numeric(netlist, 2j * np.pi * f) * 2j * np.pi * f
+            np.testing.assert_allclose(result.responses[j], x[:netlist.num_nodes], rtol=1e-9, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+# 子电路实例按端口方程求解，结果应与把实例展开为普通元件后求解一致
+import unittest
+
+import numpy as np
+import sympy as sp
+
+import CircuitSolver as CS
+from CircuitSolver.Subcircuits import PortAdmittanceError, PortModelCache
+
+
+def build_block() -> CS.Subcircuit:
+    # 二端口 RC 梯形网络，中间节点对地接电感，内部电流源使端口方程含等效注入电流 J
+    netlist = CS.Netlist(4)
+    for k in range(3):
+        netlist.add('R', k, k + 1, 1.0 + 0.5 * k)
+        netlist.add('C', k + 1, CS.GND, 0.5 + 0.25 * k)
+    netlist.add('L', 1, CS.GND, 2.0)
+    netlist.add('I', 2, CS.GND, 0.5)
+    return CS.Subcircuit('block', netlist, [0, 3])
+
+
+def build_cascade(block: CS.Subcircuit, instances: int = 3) -> CS.Netlist:
+    netlist = CS.Netlist(instances + 1)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', instances, CS.GND, 3.0)
+    for i in range(instances):
+        netlist.addInstance(block, (i, i + 1))
+    return netlist
+
+
+class SubcircuitTest(unittest.TestCase):
+    def assertMatchesFlat(self, netlist: CS.Netlist, s=None):
+        flat = CS.flatten_netlist(netlist)
+        n = netlist.num_nodes
+        np.testing.assert_allclose(CS.solve_numeric(netlist, s)[:n], CS.solve_numeric(flat, s)[:n],
+                                   rtol=1e-10, atol=1e-12)
+
+    def test_numeric_matches_flattened(self):
+        netlist = build_cascade(build_block())
+        for s in (None, 0.5j, 1.0 + 2.0j):
+            self.assertMatchesFlat(netlist, s)
+
+    def test_poly_matches_flattened(self):
+        s = sp.Symbol('s')
+        netlist = build_cascade(build_block(), 2)
+        flat = CS.flatten_netlist(netlist)
+        n = netlist.num_nodes
+        for a, b in zip(CS.solve_MNA_poly(netlist, s)[:n], CS.solve_MNA_poly(flat, s)[:n]):
+            self.assertEqual(sp.cancel(a - b), 0)
+
+    def test_nested_subcircuit(self):
+        # 外层子电路由两个内层实例串接而成，端口为两端
+        block = build_block()
+        inner = CS.Netlist(3)
+        inner.addInstance(block, (0, 1))
+        inner.addInstance(block, (1, 2))
+        outer = CS.Subcircuit('pair', inner, [0, 2])
+        netlist = build_cascade(outer, 2)
+        self.assertEqual(CS.flatten_netlist(netlist).num_nodes, 3 + 2 * 5)
+        self.assertMatchesFlat(netlist)
+        self.assertMatchesFlat(netlist, 2j)
+
+    def test_transient_uses_flattened_netlist(self):
+        netlist = build_cascade(build_block())
+        result = CS.simulate_transient(netlist, 1.0, 0.01)
+        flat = CS.simulate_transient(CS.flatten_netlist(netlist), 1.0, 0.01)
+        np.testing.assert_allclose(result.node_voltages[:, :netlist.num_nodes],
+                                   flat.node_voltages[:, :netlist.num_nodes])
+
+    def test_port_models_are_cached(self):
+        cache = PortModelCache()
+        block = build_block()
+        first = cache.get(block, 1j)
+        self.assertIs(cache.get(block, 1j), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        # 修改定义内的元件值后得到新的约化结果
+        block.netlist.setValue(0, 4.0)
+        self.assertIsNot(cache.get(block, 1j), first)
+
+    def test_floating_internal_node(self):
+        netlist = CS.Netlist(3)
+        netlist.add('R', 0, 1, 1.0)
+        netlist.add('C', 2, CS.GND, 1.0)
+        with self.assertRaises(PortAdmittanceError):
+            PortModelCache().get(CS.Subcircuit('floating', netlist, [0, 1]))
+
+    def test_invalid_ports(self):
+        with self.assertRaises(ValueError):
+            CS.Subcircuit('bad', CS.Netlist(2), [0, 0])
+        with self.assertRaises(ValueError):
+            CS.Netlist(2).addInstance(build_block(), (0,))
+
+
+if __name__ == '__main__':
+    unittest.main()
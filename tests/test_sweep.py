@@ -0,0 +1,49 @@
+# 批量参数扫描的每个点应与代入该点数值后完整求解一致
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def build_network() -> CS.Netlist:
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 5.0)
+    netlist.add('R', 0, 1, 1.0)
+    netlist.add('R', 1, CS.GND, 2.0)
+    netlist.add('R', 1, 2, 3.0)
+    netlist.add('C', 2, CS.GND, 0.5)
+    netlist.add('I', 2, CS.GND, 0.1)
+    return netlist
+
+
+class SweepTest(unittest.TestCase):
+    def check_sweep(self, sweeps: dict[int, np.ndarray], s=None):
+        netlist = build_network()
+        result = CS.sweep_values(netlist, sweeps, s)
+        num_points = len(next(iter(sweeps.values())))
+        self.assertEqual(len(result), num_points)
+        for p in range(num_points):
+            point = netlist.copy()
+            for index, values in sweeps.items():
+                point.setValue(index, values[p])
+            x = CS.solve_numeric(point, s)
+            np.testing.assert_allclose(result.node_potentials[p], x[:point.num_nodes], rtol=1e-10)
+            np.testing.assert_allclose(result.source_currents[p], x[point.num_nodes:], rtol=1e-10)
+
+    def test_resistor(self):
+        self.check_sweep({2: np.geomspace(0.1, 10, 7)})
+
+    def test_resistor_and_sources_together(self):
+        self.check_sweep({1: np.linspace(0.5, 2, 5), 0: np.linspace(1, 5, 5), 5: np.linspace(-1, 1, 5)})
+
+    def test_capacitor_at_complex_s(self):
+        self.check_sweep({4: np.linspace(0.1, 1, 4), 3: np.linspace(1, 4, 4)}, 0.5 + 1j)
+
+    def test_mismatched_lengths(self):
+        with self.assertRaises(ValueError):
+            CS.sweep_values(build_network(), {1: [1.0, 2.0], 2: [1.0]})
+
+
+if __name__ == '__main__':
+    unittest.main()
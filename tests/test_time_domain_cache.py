@@ -0,0 +1,47 @@
+# 时域结果缓存：命中、LRU 淘汰与批量取出
+import unittest
+
+import sympy as sp
+
+import CircuitSolver as CS
+
+s, t = sp.symbols('s t')
+
+
+class TimeDomainCacheTest(unittest.TestCase):
+    def test_hit_returns_same_result(self):
+        cache = CS.TimeDomainCache()
+        first = cache.get(1 / (s + 1), s, t)
+        self.assertIs(cache.get(1 / (s + 1), s, t), first)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = CS.TimeDomainCache(maxsize=2)
+        cache.get(1 / (s + 1), s, t)
+        cache.get(1 / (s + 2), s, t)
+        # 访问第一个使其成为最近使用，之后加入第三个时淘汰第二个
+        cache.get(1 / (s + 1), s, t)
+        cache.get(1 / (s + 3), s, t)
+        self.assertEqual(len(cache), 2)
+        cache.get(1 / (s + 1), s, t)
+        self.assertEqual(cache.hits, 2)
+        cache.get(1 / (s + 2), s, t)
+        self.assertEqual(cache.misses, 4)
+
+    def test_get_many(self):
+        cache = CS.TimeDomainCache()
+        cached = cache.get(1 / (s + 1), s, t)
+        results = cache.getMany([1 / (s + 1), 1 / (s + 2), 1 / (s + 2)], s, t, workers=1)
+        self.assertIs(results[0], cached)
+        self.assertIs(results[1], results[2])
+        self.assertEqual(len(cache), 2)
+
+    def test_clear(self):
+        cache = CS.TimeDomainCache()
+        cache.get(1 / (s + 1), s, t)
+        cache.clear()
+        self.assertEqual((len(cache), cache.hits, cache.misses), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# 自动时间网格：电路极点与解析值一致，由极点得到时间尺度，自适应网格在快速变化处加密
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+from CircuitSolver.TimeGrid import SETTLING_TAUS, OSCILLATION_PERIODS
+
+
+def build_rlc(R: float, L: float, C: float) -> CS.Netlist:
+    # 串联 RLC：极点为 L C s^2 + R C s + 1 = 0 的根
+    netlist = CS.Netlist(3)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, R)
+    netlist.add('L', 1, 2, L)
+    netlist.add('C', 2, CS.GND, C)
+    return netlist
+
+
+class CircuitPolesTest(unittest.TestCase):
+    def test_rc_pole(self):
+        netlist = CS.Netlist(2)
+        netlist.add('V', 0, CS.GND, 1.0)
+        netlist.add('R', 0, 1, 1e3)
+        netlist.add('C', 1, CS.GND, 1e-6)
+        np.testing.assert_allclose(CS.circuit_poles(netlist), [-1e3], rtol=1e-10)
+
+    def test_rlc_poles(self):
+        R, L, C = 10.0, 1e-3, 1e-6
+        poles = CS.circuit_poles(build_rlc(R, L, C))
+        expected = np.roots([L * C, R * C, 1])
+        np.testing.assert_allclose(np.sort_complex(poles), np.sort_complex(expected), rtol=1e-9)
+
+    def test_time_scales(self):
+        # 衰减极点取 SETTLING_TAUS 倍时间常数，纯虚极点取 OSCILLATION_PERIODS 个周期，s = 0 的极点略去
+        t_fast, span = CS.time_scales(np.array([-1.0, -100.0, 0.0]))
+        self.assertAlmostEqual(t_fast, 0.01)
+        self.assertAlmostEqual(span, SETTLING_TAUS)
+        _, span = CS.time_scales(np.array([2j, -2j]))
+        self.assertAlmostEqual(span, OSCILLATION_PERIODS * np.pi)
+        self.assertIsNone(CS.time_scales(np.array([0.0])))
+        self.assertIsNone(CS.time_scales(None))
+
+
+class AdaptiveTimeGridTest(unittest.TestCase):
+    def test_refines_fast_transient(self):
+        # 起始处快速衰减、之后缓慢变化的波形，起始段的点更密
+        def func(t):
+            return np.exp(-1000 * t) + 0.01 * t
+
+        t, y = CS.adaptive_time_grid(func, 1.0, budget=400, t_fast=1e-3)
+        self.assertLessEqual(len(t), 400)
+        self.assertTrue(np.all(np.diff(t) > 0))
+        np.testing.assert_allclose(y, func(t))
+        self.assertGreater(np.sum(t < 0.01), np.sum(t > 0.5))
+        # 在网格上线性插值的误差不超过幅度的 1%
+        dense = np.linspace(0, 1, 20001)
+        self.assertLess(np.abs(np.interp(dense, t, y) - func(dense)).max(), 1e-2)
+
+    def test_auto_time_step(self):
+        self.assertAlmostEqual(CS.auto_time_step(1.0, 0.1), 0.01)
+        self.assertAlmostEqual(CS.auto_time_step(1.0, 1e-9, budget=100), 0.01)
+        self.assertAlmostEqual(CS.auto_time_step(1.0, None, budget=100), 0.01)
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            CS.adaptive_time_grid(np.sin, 0.0)
+        with self.assertRaises(ValueError):
+            CS.adaptive_time_grid(np.sin, 1.0, budget=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
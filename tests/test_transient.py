@@ -0,0 +1,63 @@
+# 伴随模型瞬态仿真与一阶电路的解析解比较
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def build_rc(R: float = 2.0, C: float = 0.5) -> CS.Netlist:
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, R)
+    netlist.add('C', 1, CS.GND, C)
+    return netlist
+
+
+def build_rl(R: float = 2.0, L: float = 0.5) -> CS.Netlist:
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, R)
+    netlist.add('L', 1, CS.GND, L)
+    return netlist
+
+
+class TransientTest(unittest.TestCase):
+    def test_rc_step_response(self):
+        # v_C = 1 - e^{-t/RC}，RC = 1
+        result = CS.simulate_transient(build_rc(), 5.0, 1e-3, 'trap')
+        expected = 1 - np.exp(-result.times)
+        np.testing.assert_allclose(result.getNodeVoltage(1), expected, atol=1e-6)
+        np.testing.assert_allclose(result.getNodeVoltage(0), 1.0)
+
+    def test_rl_step_response(self):
+        # i_L = (1 - e^{-tR/L}) / R，电感电流以网表中的元件序号取出
+        R, L = 2.0, 0.5
+        result = CS.simulate_transient(build_rl(R, L), 2.0, 1e-3, 'trap')
+        expected = (1 - np.exp(-result.times * R / L)) / R
+        np.testing.assert_allclose(result.element_currents[2], expected, atol=1e-6)
+
+    def test_backward_euler_converges(self):
+        # 后向欧拉为一阶方法：步长减半，误差约减半
+        errors = []
+        for t_step in (0.02, 0.01):
+            result = CS.simulate_transient(build_rc(), 3.0, t_step, 'be')
+            errors.append(np.abs(result.getNodeVoltage(1) - (1 - np.exp(-result.times))).max())
+        self.assertLess(errors[0], 0.02)
+        self.assertAlmostEqual(errors[0] / errors[1], 2.0, delta=0.2)
+
+    def test_time_grid(self):
+        result = CS.simulate_transient(build_rc(), 1.0, 0.1)
+        np.testing.assert_allclose(result.times, np.linspace(0, 1.0, 11))
+        self.assertEqual(result.node_voltages.shape, (11, 2))
+        self.assertEqual(result.source_currents.shape, (11, 1))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            CS.simulate_transient(build_rc(), 1.0, 0.1, 'rk4')
+        with self.assertRaises(ValueError):
+            CS.simulate_transient(build_rc(), 1.0, -0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# 波形存储：写入磁盘的瞬态结果与内存中的一致，相同的运行直接读取，超过大小上限时删除最久未使用的运行
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+import CircuitSolver as CS
+
+
+def build_rc(R: float = 1e3) -> CS.Netlist:
+    netlist = CS.Netlist(2)
+    netlist.add('V', 0, CS.GND, 1.0)
+    netlist.add('R', 0, 1, R)
+    netlist.add('C', 1, CS.GND, 1e-6)
+    return netlist
+
+
+class WaveformStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, 'waveforms')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_stored_matches_memory(self):
+        store = CS.WaveformStore(self.root, max_bytes=None)
+        memory = CS.simulate_transient(build_rc(), 5e-3, 1e-6)
+        stored = CS.simulate_transient(build_rc(), 5e-3, 1e-6, store=store)
+        np.testing.assert_array_equal(stored.times, memory.times)
+        np.testing.assert_array_equal(stored.node_voltages[:, 1], memory.node_voltages[:, 1])
+        np.testing.assert_array_equal(np.asarray(stored.source_currents), np.asarray(memory.source_currents))
+        self.assertEqual(len(store.getRuns()), 1)
+
+    def test_same_run_is_loaded(self):
+        store = CS.WaveformStore(self.root, max_bytes=None)
+        first = CS.simulate_transient(build_rc(), 1e-3, 1e-6, store=store)
+        second = CS.simulate_transient(build_rc(), 1e-3, 1e-6, store=store)
+        self.assertIsInstance(second.times, np.memmap)
+        np.testing.assert_array_equal(first.node_voltages[:, 1], second.node_voltages[:, 1])
+        CS.simulate_transient(build_rc(), 1e-3, 1e-6, 'be', store=store)
+        CS.simulate_transient(build_rc(2e3), 1e-3, 1e-6, store=store)
+        self.assertEqual(len(store.getRuns()), 3)
+
+    def test_evicts_least_recently_used(self):
+        store = CS.WaveformStore(self.root, max_bytes=None)
+        for R in (1e3, 2e3, 3e3):
+            CS.simulate_transient(build_rc(R), 1e-3, 1e-6, store=store)
+            time.sleep(0.05)
+        runs = store.getRuns()
+        oldest = runs[0][2]
+        # 读取最早的运行使其成为最近使用的，之后写入新运行时淘汰的是第二个
+        os.utime(os.path.join(store.getPath(oldest), 'index.json'))
+        store.max_bytes = sum(size for _, size, _ in runs)
+        CS.simulate_transient(build_rc(4e3), 1e-3, 1e-6, store=store)
+        keys = [key for _, _, key in store.getRuns()]
+        self.assertEqual(len(keys), 3)
+        self.assertIn(oldest, keys)
+        self.assertNotIn(runs[1][2], keys)
+
+    def test_incomplete_run_ignored(self):
+        store = CS.WaveformStore(self.root, max_bytes=None)
+        writer = store.create('partial', ['t'], 4)
+        writer.write(0, np.zeros((4, 1)))
+        self.assertIsNone(store.load('partial'))
+        writer.close({})
+        index, columns = store.load('partial')
+        self.assertEqual(index['rows'], 4)
+        np.testing.assert_array_equal(columns['t'], np.zeros(4))
+
+
+if __name__ == '__main__':
+    unittest.main()